@@ -1,22 +1,76 @@
 # ===== インポート =====
 # --- 標準ライブラリ ---
+import argparse
 import sys
+from pathlib import Path
 
 # --- 外部ライブラリ ---
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QApplication, QSplashScreen
+from PySide6.QtGui import QFont, QPixmap, QColor
+from PySide6.QtCore import Qt
 import qdarkstyle
 
 # --- 自作モジュール ---
-from .gui.main_window import MainWindow
+from . import profiling
+from .gui.style_constants import BACKGROUND_COLOR, TEXT_COLOR
 # ====
 
 
+def parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """アプリ固有の引数を解析し、残りを Qt 用に返す。"""
+    parser = argparse.ArgumentParser(prog="estivision", add_help=True)
+    parser.add_argument("--cameras", type=int, default=2, help="カメラスロット数")
+    parser.add_argument(
+        "--scheduler", choices=("round_robin", "priority"), default=None,
+        help="全カメラの推論を 1 つのスケジューラで共有する",
+    )
+    parser.add_argument(
+        "--calib-board", choices=("chessboard", "charuco"), default="chessboard",
+        help="キャリブレーションに使うボード（charuco は一部だけ写ったフレームも使える）",
+    )
+    parser.add_argument(
+        "--no-keypoint-shm", dest="keypoint_shm", action="store_false",
+        help="最新キーポイントを共有メモリ（estivision.pose.keypoint_shm）へ書き出さない",
+    )
+    parser.add_argument(
+        "--log-poses", nargs="?", const="", default=None, metavar="DIR",
+        help="推論した骨格を DIR（省略時 data/logs）/cam<番号>/<起動時刻> へ記録する",
+    )
+    parser.add_argument(
+        "--ort-threads", type=int, default=None, metavar="N",
+        help="推論スレッド 1 本あたりの ONNX Runtime スレッド数（省略時は残りの CPU を等分）",
+    )
+    parser.add_argument("--cv-threads", type=int, default=1, metavar="N", help="OpenCV のスレッド数（プロセス共通）")
+    parser.add_argument(
+        "--reserve-cpus", type=int, default=2, metavar="N",
+        help="推論に使わず GUI・取得スレッド・VRChat 用に残す CPU 数",
+    )
+    parser.add_argument(
+        "--pin-cpus", action="store_true",
+        help="推論スレッドごとに割り当てた CPU へアフィニティを固定する（Linux のみ）",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const="", default=None, metavar="DIR",
+        help=f"全スレッドのプロファイルを取り、終了時に DIR（省略時 {profiling.DEFAULT_OUTPUT_DIR}）へ書き出す"
+             f"（環境変数 {profiling.ENV_VAR} でも可）",
+    )
+    args, qt_argv = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + qt_argv
+
+
 def main() -> None:
     """アプリケーションを初期化し、メインウィンドウを起動する。"""
+    args, qt_argv = parse_args(sys.argv)
+
+    # --- プロファイル（CLI 指定が環境変数より優先） ---
+    if args.profile is not None:
+        profiling.enable(args.profile or None)
+    else:
+        profiling.enable_from_env()
+
     # ===== QApplication の初期化 =====
-    # --- コマンドライン引数を渡して QApplication インスタンスを生成 ---
-    app: QApplication = QApplication(sys.argv)
+    # --- Qt 用のコマンドライン引数を渡して QApplication インスタンスを生成 ---
+    app: QApplication = QApplication(qt_argv)
 
     # --- QDarkStyle のスタイルシートを適用 ---
     style: str = qdarkstyle.load_stylesheet()
@@ -27,12 +81,34 @@ def main() -> None:
     app.setFont(font)
     # ====
 
+    # ===== 起動中表示 =====
+    # --- cv2 / numpy などの重いモジュールを読み込む前に最初の描画を済ませる ---
+    pixmap = QPixmap(360, 120)
+    pixmap.fill(QColor(BACKGROUND_COLOR))
+    splash = QSplashScreen(pixmap)
+    splash.showMessage("ESTiVision 起動中…", Qt.AlignCenter, QColor(TEXT_COLOR))
+    splash.show()
+    app.processEvents()
+    # ====
+
     # ===== メインウィンドウの生成・表示 =====
-    # --- MainWindow クラスをインスタンス化 ---
-    window: MainWindow = MainWindow()
+    # --- MainWindow は重い依存を持つため、ここで遅延 import する ---
+    from .gui.main_window import MainWindow
+    from .pipeline.camera_pipeline import DATA_ROOT
+    from .thread_budget import ThreadBudget
+    budget = ThreadBudget(
+        1 if args.scheduler else args.cameras, reserve=args.reserve_cpus, ort_threads=args.ort_threads,
+        cv_threads=args.cv_threads, pin=args.pin_cpus,
+    )
+    window = MainWindow(
+        num_cameras=args.cameras, scheduler_policy=args.scheduler, calib_board=args.calib_board,
+        publish_keypoints=args.keypoint_shm, thread_budget=budget,
+        pose_log_root=None if args.log_poses is None else Path(args.log_poses or DATA_ROOT / "logs"),
+    )
 
     # --- ウィンドウを画面に表示 ---
     window.show()
+    splash.finish(window)
     # ====
 
     # ===== イベントループ開始 =====
@@ -1,81 +1,197 @@
 # ===== インポート =====
 # --- 標準ライブラリ ---
 from __future__ import annotations
+import threading
+import time
 
 # --- 外部ライブラリ ---
-import cv2
 from PySide6.QtCore import QThread, Signal
 from PySide6.QtGui import QImage
+
+# --- 自作モジュール ---
+from ..profiling       import name_thread, timed
+from .capture_backends import CaptureBackend, create_backend
+from .capture_mode     import CaptureMode, negotiation_report
+from .frame_converter  import FrameConverter
+# ====
+
+# ===== 定数定義 =====
+RECONNECT_BACKOFF: tuple[float, float] = (0.05, 1.0)   # 再接続の初回待ち／上限 [s]
 # ====
 
 
 class CameraStream(QThread):
-    """単一 VideoCapture から読み込んだフレームを複数処理系へ配信するハブスレッド。"""
+    """単一キャプチャバックエンドから読み込んだフレームを複数処理系へ配信するハブスレッド。"""
 
     # ===== GUI プレビュー／処理用シグナル =====
     image_ready: Signal = Signal(QImage)
-    frame_ready: Signal = Signal(object)  # ndarray (BGR)
+    frame_ready: Signal = Signal(object, float, int)  # ndarray (BGR), 取得時刻 [s], フレーム連番
     error: Signal = Signal(str)
+    mode_negotiated: Signal = Signal(object)          # dict: requested / actual / matched
+    disconnected: Signal = Signal()                   # 取得失敗（再接続を試行中）
+    reconnected: Signal = Signal(float)               # 再接続完了（途切れていた秒数）
     # ====
 
-    def __init__(self, device_id: int, fps: int = 15) -> None:
-        """device_id で指定されたカメラを fps でストリーミングする。"""
+    def __init__(
+        self,
+        device_id: int | str = 0,
+        fps: int = 15,
+        *,
+        backend: CaptureBackend | None = None,
+        backend_name: str | None = None,
+        fourcc: str | None = "MJPG",
+        buffer_size: int = 1,
+        capture_mode: CaptureMode | None = None,
+        preview_size: int | None = None,
+        reconnect: bool | None = None,
+    ) -> None:
+        """device_id で指定されたカメラを fps でストリーミングする。capture_mode 指定時はそのモードを要求する。"""
         super().__init__()
 
         # --- 引数保持 ---
-        self._device_id: int = device_id
+        self._device_id: int | str = device_id
         self._fps: int = fps
+        self._backend: CaptureBackend = backend or create_backend(backend_name, device_id)
+        self._fourcc: str | None = fourcc
+        self._buffer_size: int = buffer_size
+        self._capture_mode: CaptureMode | None = capture_mode
+        self._converter: FrameConverter = FrameConverter(max_size=preview_size)
+        # --- 途切れたらバックオフしながら同じモードで開き直す（既定は実デバイスのみ。動画の終端などでは終える） ---
+        self._reconnect: bool = self._backend.live if reconnect is None else reconnect
+        self._wake: threading.Event = threading.Event()   # 再接続待ちを即座に打ち切る
+        self._suspended: bool = False   # デバイスが見つからない間は開き直さない（set_device で解除）
         self._running: bool = False
 
+    @property
+    def device_id(self) -> int | str:
+        """取得中のデバイス番号（またはパス）。"""
+        return self._device_id
+
     # ===== スレッド本体 =====
     def run(self) -> None:  # noqa: D401
-        """VideoCapture を開き、フレーム取得ループを回す。"""
-        cap = cv2.VideoCapture(self._device_id, cv2.CAP_DSHOW)
-        if not cap.isOpened():
+        """バックエンドを開き、フレーム取得ループを回す。"""
+        cap = self._backend
+        name_thread(f"CameraStream-{self._device_id}")
+        if not cap.open():
             cap.release()
             self.error.emit("カメラを開けませんでした。")
             return
 
-        # --- カメラのデフォルト解像度 ---
-        default_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        default_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-        # --- 長辺 320px に固定 ---
-        if default_w >= default_h:
-            scale = 320 / default_w if default_w else 1
-            target_w, target_h = 320, int(default_h * scale)
-        else:
-            scale = 320 / default_h if default_h else 1
-            target_h, target_w = 320, int(default_w * scale)
-
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH,  target_w)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, target_h)
-        cap.set(cv2.CAP_PROP_FPS,          self._fps)
+        # --- モード未指定ならデフォルト解像度から長辺 320px を要求 ---
+        mode = self._capture_mode
+        if mode is None:
+            default_w, default_h = cap.frame_size()
+            if default_w >= default_h:
+                scale = 320 / default_w if default_w else 1
+                target_w, target_h = 320, int(default_h * scale)
+            else:
+                scale = 320 / default_h if default_h else 1
+                target_h, target_w = 320, int(default_w * scale)
+            mode = CaptureMode(target_w, target_h, self._fps, self._fourcc or "")
+
+        self._configure(cap, mode)
+        self._report_mode(cap, mode)
 
         self._running = True
+        seq = 0
+        period = 1.0 / self._fps
+        next_t = time.perf_counter()
 
         # --- 取得ループ ---
-        while self._running:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # --- GUI 用 QImage 生成 ---
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, _ = rgb.shape
-            qimg = QImage(rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888)
+        while self._running and not self.isInterruptionRequested():
+            # --- grab 直後の時刻を取得時刻とし、デコードは retrieve で行う ---
+            with timed("cap.grab"):
+                grabbed = not self._suspended and cap.grab()
+            if grabbed:
+                timestamp = time.time()
+                with timed("cap.retrieve"):
+                    grabbed, frame = cap.retrieve()
+            if not grabbed:
+                # --- 抜けたら同じモードで開き直す（下流のワーカ・セッションはそのまま） ---
+                if not self._reconnect or not self._reopen(cap, mode):
+                    break
+                next_t = time.perf_counter()
+                continue
+
+            # --- GUI 用 QImage 生成（使い回しバッファ、必要ならプレビューサイズへ縮小） ---
+            qimg = self._converter.convert(frame)
 
             # --- シグナル配信 ---
             self.image_ready.emit(qimg)
-            self.frame_ready.emit(frame)
+            self.frame_ready.emit(frame, timestamp, seq)
+            seq += 1
 
-            # --- FPS 制御 ---
-            self.msleep(int(1000 / self._fps))
+            # --- FPS 制御（処理時間を差し引いた残りだけ待つ） ---
+            next_t += period
+            wait = next_t - time.perf_counter()
+            if wait > 0:
+                self.msleep(int(wait * 1000))
+            else:
+                next_t = time.perf_counter()
 
         cap.release()
 
+    # ===== 取得元の設定／再接続 =====
+    def _configure(self, cap: CaptureBackend, mode: CaptureMode) -> None:
+        """mode を要求する。バッファ 1 枚で、ドライバ内に古いフレームを溜めない。"""
+        cap.configure(
+            width=mode.width,
+            height=mode.height,
+            fps=self._fps,
+            fourcc=mode.pixel_format or self._fourcc,
+            buffer_size=self._buffer_size,
+        )
+
+    def _report_mode(self, cap: CaptureBackend, mode: CaptureMode) -> None:
+        """ドライバが実際に受け入れたモードを確認して通知する。"""
+        width, height = cap.frame_size()
+        self.mode_negotiated.emit(negotiation_report(
+            mode._replace(fps=self._fps), width, height, cap.fps(), cap.fourcc(),
+        ))
+
+    def _reopen(self, cap: CaptureBackend, mode: CaptureMode) -> bool:
+        """開き直せるまで指数バックオフで待つ。停止要求なら False。"""
+        lost_at = time.perf_counter()
+        self.disconnected.emit()
+        cap.release()
+        delay, max_delay = RECONNECT_BACKOFF
+        while self._running and not self.isInterruptionRequested():
+            if not self._suspended and cap.open():
+                self._configure(cap, mode)
+                self._report_mode(cap, mode)   # 挿し直したデバイスが同じモードを受け入れるとは限らない
+                self.reconnected.emit(time.perf_counter() - lost_at)
+                return True
+            cap.release()
+            # --- set_device / retry_now で起こされたら待ちを短縮して即再試行（休止中は起こされるまで待つ） ---
+            if self._wake.wait(None if self._suspended else delay):
+                self._wake.clear()
+                delay = RECONNECT_BACKOFF[0]
+            else:
+                delay = min(delay * 2, max_delay)
+        return False
+
+    def set_device(self, device_id: int | str) -> None:
+        """抜き差しで番号が変わったデバイスへ開き先を切り替え、直ちに再接続を試みさせる。"""
+        self._device_id = device_id
+        self._backend.set_source(device_id)
+        self._suspended = False
+        self.retry_now()
+
+    def suspend(self) -> None:
+        """デバイスが見えなくなったときに取得を止めて手放し、set_device まで開き直さない。"""
+        # --- 古い番号は別の物理カメラに割り当てられうるため、その番号で開き直し続けない ---
+        self._suspended = True
+        self._wake.set()
+
+    def retry_now(self) -> None:
+        """再接続待ちのバックオフを打ち切る（接続中なら何もしない）。"""
+        self._wake.set()
+
     # ===== 停止要求 =====
-    def stop(self) -> None:
-        """取得ループを終了させる。"""
+    def stop(self, *, wait: bool = True) -> None:
+        """取得ループを終了させる。wait=False なら要求だけ出して戻り、完了は finished で通知される。"""
         self._running = False
-        self.wait()
+        self.requestInterruption()
+        self._wake.set()
+        if wait:
+            self.wait()
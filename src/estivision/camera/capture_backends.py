@@ -0,0 +1,417 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from __future__ import annotations
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+# --- 外部ライブラリ ---
+import cv2
+import numpy as np
+
+# --- 自作モジュール ---
+from .capture_mode import is_fourcc
+# ====
+
+
+class CaptureBackend(ABC):
+    """フレーム取得元（カメラ・動画・合成映像）を共通化する基底クラス。"""
+
+    name: str = "base"
+    live: bool = False    # 抜き差しで途切れうる実デバイスか（途切れたら開き直す対象）
+
+    @abstractmethod
+    def open(self) -> bool:
+        """取得元を開き、成功したら True を返す。"""
+
+    @abstractmethod
+    def is_opened(self) -> bool:
+        """取得元が開いているかを返す。"""
+
+    def configure(
+        self,
+        *,
+        width: int | None = None,
+        height: int | None = None,
+        fps: float | None = None,
+        fourcc: str | None = None,
+        buffer_size: int | None = None,
+    ) -> None:
+        """解像度・FPS・FOURCC・ドライバ側バッファ数を要求する（未対応項目は無視）。"""
+
+    @abstractmethod
+    def frame_size(self) -> Tuple[int, int]:
+        """現在の (幅, 高さ) を返す。"""
+
+    def fps(self) -> float:
+        """現在の FPS を返す（不明なら 0）。"""
+        return 0.0
+
+    def fourcc(self) -> str:
+        """実際に使われている画素形式（FOURCC）を返す（不明なら空文字）。"""
+        return ""
+
+    @abstractmethod
+    def grab(self) -> bool:
+        """次のフレームを確保だけする（デコードは retrieve で行う）。"""
+
+    @abstractmethod
+    def retrieve(self) -> Tuple[bool, np.ndarray | None]:
+        """grab 済みフレームをデコードして BGR 画像を返す。"""
+
+    def read(self) -> Tuple[bool, np.ndarray | None]:
+        """grab と retrieve をまとめて行う。"""
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self) -> None:
+        """取得元を解放する。"""
+
+    def set_source(self, source: int | str) -> None:
+        """取得元を差し替える（次回 open から有効）。差し替えられない取得元では何もしない。"""
+
+
+class OpenCVBackend(CaptureBackend):
+    """cv2.VideoCapture を API 指定付きで包むバックエンド。"""
+
+    name = "opencv"
+    live = True
+    api_preference: int = cv2.CAP_ANY
+
+    def __init__(self, source: int | str) -> None:
+        """source（デバイス番号またはパス）を保持する。"""
+        self._source: int | str = source
+        self._cap: cv2.VideoCapture | None = None
+
+    def open(self) -> bool:
+        """VideoCapture を開く。"""
+        self._cap = cv2.VideoCapture(self._source, self.api_preference)
+        if not self._cap.isOpened():
+            self._cap.release()
+            self._cap = None
+            return False
+        return True
+
+    def set_source(self, source: int | str) -> None:
+        """抜き差しでデバイス番号が変わったときに開き先を更新する。"""
+        self._source = source
+
+    def is_opened(self) -> bool:
+        """VideoCapture が開いているかを返す。"""
+        return self._cap is not None and self._cap.isOpened()
+
+    def configure(
+        self,
+        *,
+        width: int | None = None,
+        height: int | None = None,
+        fps: float | None = None,
+        fourcc: str | None = None,
+        buffer_size: int | None = None,
+    ) -> None:
+        """FOURCC → 解像度 → FPS → バッファ数の順に設定する（ドライバの都合上この順が安全）。"""
+        if self._cap is None:
+            return
+        if fourcc and is_fourcc(fourcc):
+            self._cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width:
+            self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self._cap.set(cv2.CAP_PROP_FPS, fps)
+        if buffer_size:
+            # --- 未対応ドライバでは False が返るだけなので無視 ---
+            self._cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+    def frame_size(self) -> Tuple[int, int]:
+        """VideoCapture が報告する解像度を返す。"""
+        if self._cap is None:
+            return 0, 0
+        return (
+            int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+
+    def fps(self) -> float:
+        """VideoCapture が報告する FPS を返す。"""
+        return float(self._cap.get(cv2.CAP_PROP_FPS)) if self._cap is not None else 0.0
+
+    def fourcc(self) -> str:
+        """実際に使われている FOURCC を文字列で返す。"""
+        if self._cap is None:
+            return ""
+        code = int(self._cap.get(cv2.CAP_PROP_FOURCC))
+        return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+    def grab(self) -> bool:
+        """VideoCapture.grab() を呼ぶ。"""
+        return self._cap is not None and self._cap.grab()
+
+    def retrieve(self) -> Tuple[bool, np.ndarray | None]:
+        """VideoCapture.retrieve() を呼ぶ。"""
+        if self._cap is None:
+            return False, None
+        return self._cap.retrieve()
+
+    def release(self) -> None:
+        """VideoCapture を解放する。"""
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class DirectShowBackend(OpenCVBackend):
+    """Windows の DirectShow 経由でカメラを開くバックエンド。"""
+
+    name = "dshow"
+    api_preference = cv2.CAP_DSHOW
+
+
+class V4L2Backend(OpenCVBackend):
+    """Linux の V4L2 経由でカメラを開くバックエンド。"""
+
+    name = "v4l2"
+    api_preference = cv2.CAP_V4L2
+
+
+class FileBackend(OpenCVBackend):
+    """動画ファイルをカメラの代わりに再生するバックエンド。"""
+
+    name = "file"
+    live = False
+
+    def __init__(self, path: str | Path, *, loop: bool = True) -> None:
+        """path の動画を開く。loop=True なら末尾で先頭に戻る。"""
+        super().__init__(str(path))
+        self._loop: bool = loop
+
+    def configure(self, **kwargs: object) -> None:
+        """動画ファイルは解像度等を変更できないため何もしない。"""
+
+    def grab(self) -> bool:
+        """末尾に達したら必要に応じて巻き戻して grab する。"""
+        if self._cap is None:
+            return False
+        if self._cap.grab():
+            return True
+        if not self._loop:
+            return False
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self._cap.grab()
+
+
+class SyntheticBackend(CaptureBackend):
+    """実カメラなしでテスト用のフレームを生成するバックエンド。"""
+
+    name = "synthetic"
+    PATTERNS: Tuple[str, ...] = ("bar", "figure", "chessboard")
+
+    def __init__(
+        self,
+        width: int = 640,
+        height: int = 480,
+        fps: float = 30.0,
+        *,
+        pattern: str = "bar",
+        embed_timestamp: bool = True,
+    ) -> None:
+        """生成する解像度・FPS・絵柄と、タイムスタンプ埋め込み有無を指定する。"""
+        if pattern not in self.PATTERNS:
+            raise ValueError(f"pattern must be one of {self.PATTERNS}")
+        self._width: int = width
+        self._height: int = height
+        self._fps: float = fps
+        self._pattern: str = pattern
+        self._embed_timestamp: bool = embed_timestamp
+        self._opened: bool = False
+        self._index: int = 0
+        self._next_t: float = 0.0
+        self._grab_time: float = 0.0
+        self._background: np.ndarray | None = None
+
+    def open(self) -> bool:
+        """背景を事前描画する。"""
+        self._background = self._render_background()
+        self._index = 0
+        self._next_t = time.perf_counter()
+        self._opened = True
+        return True
+
+    def is_opened(self) -> bool:
+        """open 済みかを返す。"""
+        return self._opened
+
+    def configure(
+        self,
+        *,
+        width: int | None = None,
+        height: int | None = None,
+        fps: float | None = None,
+        fourcc: str | None = None,
+        buffer_size: int | None = None,
+    ) -> None:
+        """解像度・FPS を変更する。"""
+        self._width = width or self._width
+        self._height = height or self._height
+        self._fps = fps or self._fps
+        if self._opened:
+            self._background = self._render_background()
+
+    def frame_size(self) -> Tuple[int, int]:
+        """生成解像度を返す。"""
+        return self._width, self._height
+
+    def fps(self) -> float:
+        """生成 FPS を返す。"""
+        return self._fps
+
+    def grab(self) -> bool:
+        """実カメラ同様に次のフレーム時刻まで待ち、その時刻を露光時刻とする。"""
+        if not self._opened:
+            return False
+        now = time.perf_counter()
+        if self._next_t > now:
+            time.sleep(self._next_t - now)
+        self._next_t = max(self._next_t, now) + 1.0 / self._fps if self._fps > 0 else now
+        self._grab_time = time.time()
+        self._index += 1
+        return True
+
+    def retrieve(self) -> Tuple[bool, np.ndarray | None]:
+        """背景に動く絵柄を重ね、必要なら露光時刻を画素に埋め込んで返す。"""
+        if self._background is None:
+            return False, None
+        frame = self._background.copy()
+        phase = self._index / max(self._fps, 1.0)
+
+        # --- 絵柄描画 ---
+        if self._pattern == "bar":
+            x = (self._index * 8) % self._width
+            frame[:, x : x + 16] = 255
+        elif self._pattern == "figure":
+            self._draw_figure(frame, phase)
+        else:
+            dx = int(0.05 * self._width * np.sin(2 * np.pi * 0.2 * phase))
+            frame = np.roll(frame, dx, axis=1)
+
+        if self._embed_timestamp:
+            write_embedded_timestamp(frame, self._grab_time)
+        return True, frame
+
+    def release(self) -> None:
+        """生成を停止する。"""
+        self._opened = False
+        self._background = None
+
+    # ===== 描画ヘルパ =====
+    def _render_background(self) -> np.ndarray:
+        """絵柄に応じた静的背景を描画する。"""
+        w, h = self._width, self._height
+        if self._pattern != "chessboard":
+            return np.full((h, w, 3), 64, np.uint8)
+
+        # --- FrameCalibrator 既定の 9×6 内側コーナー（10×7 マス）を中央に配置 ---
+        sq = max(4, min(w // 14, h // 10))
+        board = ((np.arange(7 * sq)[:, None] // sq + np.arange(10 * sq)[None, :] // sq) % 2) * 255
+        frame = np.full((h, w, 3), 255, np.uint8)
+        oy, ox = (h - 7 * sq) // 2, (w - 10 * sq) // 2
+        frame[oy : oy + 7 * sq, ox : ox + 10 * sq] = board[..., None].astype(np.uint8)
+        return frame
+
+    def _draw_figure(self, frame: np.ndarray, phase: float) -> None:
+        """左右に揺れながら手足を振る棒人間を描く。"""
+        h, w = frame.shape[:2]
+        unit = h / 10.0
+        cx = w / 2 + 0.25 * w * np.sin(2 * np.pi * 0.25 * phase)
+        swing = 0.6 * np.sin(2 * np.pi * 1.0 * phase)
+
+        def pt(x: float, y: float) -> Tuple[int, int]:
+            """中心基準の相対座標を画素座標へ変換する。"""
+            return int(cx + x * unit), int(y * unit)
+
+        color = (230, 230, 230)
+        thick = max(2, int(unit / 4))
+        neck, hip = pt(0, 3.0), pt(0, 6.0)
+        cv2.circle(frame, pt(0, 2.2), int(0.7 * unit), color, -1)
+        cv2.line(frame, neck, hip, color, thick)
+        for side in (-1, 1):
+            cv2.line(frame, neck, pt(side * 1.6, 3.8 + side * swing), color, thick)
+            cv2.line(frame, pt(side * 1.6, 3.8 + side * swing), pt(side * 2.2, 5.0 + side * swing), color, thick)
+            cv2.line(frame, hip, pt(side * 0.8 - side * swing * 0.5, 7.8), color, thick)
+            cv2.line(frame, pt(side * 0.8 - side * swing * 0.5, 7.8), pt(side * 0.9 - side * swing, 9.6), color, thick)
+
+
+# ===== 埋め込みタイムスタンプ =====
+_STAMP_BITS: int = 64
+_STAMP_BLOCK: int = 4  # 1 bit あたりの正方ブロック幅 [px]
+
+
+def write_embedded_timestamp(frame: np.ndarray, timestamp: float) -> None:
+    """float64 の時刻を左上の白黒ブロック列として frame に書き込む。"""
+    if frame.shape[1] < _STAMP_BITS * _STAMP_BLOCK or frame.shape[0] < _STAMP_BLOCK:
+        return
+    bits = np.unpackbits(np.array([timestamp], "<f8").view(np.uint8), bitorder="little")
+    row = np.repeat(bits * 255, _STAMP_BLOCK).astype(np.uint8)
+    frame[:_STAMP_BLOCK, : _STAMP_BITS * _STAMP_BLOCK] = row[None, :, None]
+
+
+def read_embedded_timestamp(frame: np.ndarray) -> float | None:
+    """write_embedded_timestamp で埋め込んだ時刻を読み出す（無ければ None）。"""
+    if frame.shape[1] < _STAMP_BITS * _STAMP_BLOCK or frame.shape[0] < _STAMP_BLOCK:
+        return None
+    centers = np.arange(_STAMP_BITS) * _STAMP_BLOCK + _STAMP_BLOCK // 2
+    strip = frame[_STAMP_BLOCK // 2, centers]
+    level = strip if strip.ndim == 1 else strip[:, 0]
+    bits = (level > 127).astype(np.uint8)
+    timestamp = float(np.packbits(bits, bitorder="little").view("<f8")[0])
+    return timestamp if np.isfinite(timestamp) and timestamp > 0 else None
+
+
+# ===== 生成ヘルパ =====
+_BACKENDS: dict[str, type[CaptureBackend]] = {
+    "dshow": DirectShowBackend,
+    "v4l2": V4L2Backend,
+    "opencv": OpenCVBackend,
+    "file": FileBackend,
+    "synthetic": SyntheticBackend,
+}
+
+
+def default_backend_name() -> str:
+    """実行 OS に適したカメラ用バックエンド名を返す。"""
+    if sys.platform.startswith("win"):
+        return "dshow"
+    if sys.platform.startswith("linux"):
+        return "v4l2"
+    return "opencv"
+
+
+def create_backend(name: str | None, source: int | str = 0, **kwargs: object) -> CaptureBackend:
+    """名前からバックエンドを生成する。None なら OS 既定のカメラバックエンド。"""
+    name = name or default_backend_name()
+    if name not in _BACKENDS:
+        raise ValueError(f"backend must be one of {tuple(_BACKENDS)}")
+    if name == "synthetic":
+        return SyntheticBackend(**kwargs)  # type: ignore[arg-type]
+    return _BACKENDS[name](source, **kwargs)  # type: ignore[call-arg]
+
+
+# ===== 複数カメラの同時取得 =====
+def latch_frames(backends: Sequence[CaptureBackend]) -> List[Tuple[bool, np.ndarray | None, float]]:
+    """全バックエンドを先に grab してから retrieve し、複数カメラの取得時刻を近づける。"""
+    # --- grab は軽量なので連続して呼び、デコードは後でまとめて行う ---
+    grabbed: List[Tuple[bool, float]] = []
+    for backend in backends:
+        ok = backend.grab()
+        grabbed.append((ok, time.time()))
+    results: List[Tuple[bool, np.ndarray | None, float]] = []
+    for backend, (ok, timestamp) in zip(backends, grabbed):
+        frame = None
+        if ok:
+            ok, frame = backend.retrieve()
+        results.append((ok, frame, timestamp))
+    return results
@@ -0,0 +1,96 @@
+# ===== インポート =====
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Sequence
+
+if TYPE_CHECKING:  # QtMultimedia は環境によって読み込めないため型ヒントだけに使う
+    from PySide6.QtMultimedia import QCameraDevice
+# ====
+
+# ===== 定数定義 =====
+# --- 同じ画素数ならデコードの軽い形式を優先（小さいほど優先） ---
+_FORMAT_COST: Dict[str, float] = {
+    "NV12": 1.0,
+    "YUYV": 1.0,
+    "UYVY": 1.0,
+    "NV21": 1.0,
+    "I420": 1.0,
+    "YV12": 1.0,
+    "MJPG": 1.5,   # JPEG デコードが必要だが帯域が小さく高フレームレートを出しやすい
+}
+_DEFAULT_FORMAT_COST: float = 2.0
+
+# --- Qt の画素形式名 → FOURCC（表に無い形式は OpenCV へ要求できないためモード一覧から外す） ---
+_QT_FOURCC: Dict[str, str] = {
+    "Jpeg": "MJPG",
+    "YUYV": "YUYV",
+    "UYVY": "UYVY",
+    "NV12": "NV12",
+    "NV21": "NV21",
+    "YUV420P": "I420",
+    "YV12": "YV12",
+    "Y8": "GREY",
+    "Y16": "Y16 ",
+    "P010": "P010",
+}
+# ====
+
+
+class CaptureMode(NamedTuple):
+    """カメラの取得モード（解像度・フレームレート・画素形式）。"""
+
+    width: int
+    height: int
+    fps: float
+    pixel_format: str = ""
+
+
+def _pixel_format_name(pixel_format: object) -> str:
+    """QVideoFrameFormat.PixelFormat を FOURCC へ変換する（対応する FOURCC が無ければ空文字）。"""
+    name = getattr(pixel_format, "name", str(pixel_format)).replace("Format_", "")
+    return _QT_FOURCC.get(name, "")
+
+
+def is_fourcc(pixel_format: str) -> bool:
+    """pixel_format が OpenCV へ渡せる 4 文字の FOURCC かを返す。"""
+    return len(pixel_format) == 4 and pixel_format.isascii()
+
+
+def device_capture_modes(device: "QCameraDevice") -> List[CaptureMode]:
+    """QCameraDevice.videoFormats() から対応モード一覧を作る（フレームレートは上限値）。"""
+    modes: List[CaptureMode] = []
+    for fmt in device.videoFormats():
+        pixel_format = _pixel_format_name(fmt.pixelFormat())
+        if not pixel_format:
+            continue
+        size = fmt.resolution()
+        modes.append(CaptureMode(size.width(), size.height(), float(fmt.maxFrameRate()), pixel_format))
+    return modes
+
+
+def select_capture_mode(modes: Sequence[CaptureMode], min_side: int, fps: float) -> CaptureMode | None:
+    """モデル入力の一辺 min_side と fps を満たす中で、最も処理の軽いモードを選ぶ。"""
+    # --- 画素形式が FOURCC で表せないモードは要求できないので除く（空は形式指定なし） ---
+    modes = [m for m in modes if not m.pixel_format or is_fourcc(m.pixel_format)]
+    if not modes:
+        return None
+
+    def cost(mode: CaptureMode) -> tuple[float, float]:
+        """画素数に形式ごとの負荷を掛けた値と fps を、比較用のキーとして返す。"""
+        return (mode.width * mode.height * _FORMAT_COST.get(mode.pixel_format, _DEFAULT_FORMAT_COST), mode.fps)
+
+    covering = [m for m in modes if min(m.width, m.height) >= min_side and m.fps >= fps]
+    if covering:
+        return min(covering, key=cost)
+
+    # --- 条件を満たすモードが無ければ、fps を守れる中で最大の解像度、それも無ければ最大解像度 ---
+    fast = [m for m in modes if m.fps >= fps]
+    return max(fast or list(modes), key=lambda m: (min(m.width, m.height), m.fps))
+
+
+def negotiation_report(requested: CaptureMode, width: int, height: int, fps: float, pixel_format: str) -> Dict[str, object]:
+    """要求モードと実際に得られたモードを比べた結果を返す。"""
+    actual = CaptureMode(width, height, fps, pixel_format)
+    matched = (width, height) == (requested.width, requested.height) \
+        and (not fps or abs(fps - requested.fps) < 1.0) \
+        and (not pixel_format.strip("\x00") or not requested.pixel_format or pixel_format == requested.pixel_format)
+    return {"requested": requested, "actual": actual, "matched": matched}
@@ -5,14 +5,60 @@ import queue
 from pathlib import Path
 
 # --- 外部ライブラリ ---
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import cv2
 import numpy as np
 from PySide6.QtCore import QObject, QThread, Signal
 from PySide6.QtGui import QImage
+
+# --- 自作モジュール ---
+from ..profiling import name_thread, timed
+from .frame_converter import FrameConverter
+# ====
+
+# ===== 定数定義 =====
+CORNER_FLAGS: int = cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_NORMALIZE_IMAGE
+SUBPIX_CRITERIA: Tuple[int, int, float] = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+
+# --- ChArUco ボード（tools/charuco_generator.py と共通の既定値） ---
+BOARD_TYPES: Tuple[str, ...] = ("chessboard", "charuco")
+CHARUCO_SQUARES: Tuple[int, int] = (7, 10)     # マス数（横, 縦）
+CHARUCO_MARKER_RATIO: float = 0.75             # マーカー一辺 / マス一辺
+CHARUCO_DICTIONARY: str = "DICT_4X4_50"
+CHARUCO_MIN_CORNERS: int = 6                   # 一部だけ写ったビューを採用する最小コーナー数
 # ====
 
 
+def create_object_points(pattern_size: Tuple[int, int], square_size: float) -> np.ndarray:
+    """チェスボード上の 3D 座標 (Z=0) を生成。"""
+    objp = np.zeros((pattern_size[0] * pattern_size[1], 3), np.float32)
+    objp[:, :2] = np.mgrid[0:pattern_size[0], 0:pattern_size[1]].T.reshape(-1, 2)
+    objp *= square_size
+    return objp
+
+
+def spans_board_plane(object_points: np.ndarray) -> bool:
+    """ボード上の点が 1 直線（1 行・1 列・斜めの並び）に収まらず面として広がっているかを返す。"""
+    pts = object_points.reshape(-1, 3)[:, :2].astype(np.float64)
+    if len(pts) < 3:
+        return False
+    # --- 中心化した座標の第 2 特異値がほぼ 0 なら共線（calibrateCamera の初期推定が破綻する） ---
+    s = np.linalg.svd(pts - pts.mean(axis=0), compute_uv=False)
+    return bool(s[1] > 1e-3 * s[0])
+
+
+def create_charuco_board(
+    squares: Tuple[int, int] = CHARUCO_SQUARES,
+    square_size: float = 20.0,
+    *,
+    marker_ratio: float = CHARUCO_MARKER_RATIO,
+    dictionary: str = CHARUCO_DICTIONARY,
+) -> "cv2.aruco.CharucoBoard":
+    """ChArUco ボード定義を生成する（生成ツールと検出で同じ定義を使う）。"""
+    aruco_dict = cv2.aruco.getPredefinedDictionary(getattr(cv2.aruco, dictionary))
+    return cv2.aruco.CharucoBoard(squares, square_size, square_size * marker_ratio, aruco_dict)
+
+
 class FrameCalibrator(QThread):
     """CameraStream から供給されるフレームを用いてキャリブレーションを実行するワーカ。"""
 
@@ -22,6 +68,7 @@ class FrameCalibrator(QThread):
     failed: Signal = Signal(str)         # 失敗メッセージ
     preview: Signal = Signal(QImage)     # 処理中プレビュー
     capture_done: Signal = Signal()      # 解析用画像収集完了
+    stopped: Signal = Signal()           # run 終了（QThread.finished は結果シグナル名と衝突するため別名）
     # =====
 
     def __init__(
@@ -30,8 +77,10 @@ class FrameCalibrator(QThread):
         pattern_size: Tuple[int, int] = (9, 6),
         square_size: float = 20.0,
         samples: int = 20,
+        board: str = "chessboard",
         device_id: int = 0,
         save_path: Path | None = None,
+        preview_size: int | None = None,
         parent: QObject | None = None
     ) -> None:
         """コンストラクタ。"""
@@ -40,11 +89,19 @@ class FrameCalibrator(QThread):
         self._pattern_size = pattern_size
         self._square_size = square_size
         self._samples = samples
+        self._device_id = device_id
+        if board not in BOARD_TYPES:
+            raise ValueError(f"board must be one of {BOARD_TYPES}")
+        # --- ChArUco はボードの一部しか写っていないビューも使える ---
+        self._charuco: Optional[cv2.aruco.CharucoDetector] = (
+            cv2.aruco.CharucoDetector(create_charuco_board(square_size=square_size)) if board == "charuco" else None
+        )
         Path("data/parameters").mkdir(exist_ok=True)
         self._save_path = save_path or Path(f"data/parameters/calib_cam{device_id}.npz")
         # --- フレームバッファ ---
-        self._queue: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=100)
+        self._queue: "queue.Queue[np.ndarray | None]" = queue.Queue(maxsize=100)
         self._running: bool = False
+        self._converter = FrameConverter(max_size=preview_size)
         # ====
 
     # ===== CameraStream から受信する slot =====
@@ -60,41 +117,45 @@ class FrameCalibrator(QThread):
 
     # ===== スレッド本体 =====
     def run(self) -> None:  # noqa: D401
+        """_calibrate を実行し、どの経路で抜けても stopped を通知する。"""
+        try:
+            self._calibrate()
+        finally:
+            self.stopped.emit()
+
+    def _calibrate(self) -> None:
         """フレームを解析して規定枚数そろったら calibrateCamera を実行。"""
         self._running = True
+        name_thread(f"FrameCalibrator-{self._device_id}")
 
-        objp = self._create_object_points()
         obj_pts: List[np.ndarray] = []
         img_pts: List[np.ndarray] = []
 
         collected = 0
-        while self._running and collected < self._samples:
+        while self._running and not self.isInterruptionRequested() and collected < self._samples:
             try:
                 frame = self._queue.get(timeout=1.0)
             except queue.Empty:
                 continue
+            if frame is None:   # stop による起床
+                continue
 
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            found, corners = cv2.findChessboardCorners(
-                gray, self._pattern_size,
-                cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_NORMALIZE_IMAGE
-            )
-            disp = frame.copy()
-            if found:
-                cv2.drawChessboardCorners(disp, self._pattern_size, corners, found)
-            if found:
-                # --- サブピクセル精緻化 ---
-                criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
-                sub = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
-
-                img_pts.append(sub)
+            detection = self._detect(gray)
+            disp = frame
+            if detection is not None:
+                objp, corners, ids = detection
+                disp = frame.copy()
+                if ids is None:
+                    cv2.drawChessboardCorners(disp, self._pattern_size, corners, True)
+                else:
+                    cv2.aruco.drawDetectedCornersCharuco(disp, corners.reshape(-1, 1, 2), ids)
+
+                img_pts.append(corners)
                 obj_pts.append(objp)
                 collected += 1
                 self.progress.emit(int(collected / self._samples * 100))
-            rgb = cv2.cvtColor(disp, cv2.COLOR_BGR2RGB)
-            h, w, _ = rgb.shape
-            qimg = QImage(rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888)
-            self.preview.emit(qimg)
+            self.preview.emit(self._converter.convert(disp))
 
         if collected < self._samples:
             # ウィンドウクローズによる停止など、割り込み要求が入った場合は
@@ -110,9 +171,14 @@ class FrameCalibrator(QThread):
         if self.isInterruptionRequested():
             return
 
-        ret, mtx, dist, rvecs, tvecs = cv2.calibrateCamera(
-            obj_pts, img_pts, gray.shape[::-1], None, None
-        )
+        # --- 退化したビューの組み合わせでは例外になるため、スレッド内で握りつぶさず失敗として通知する ---
+        try:
+            ret, mtx, dist, rvecs, tvecs = cv2.calibrateCamera(
+                obj_pts, img_pts, gray.shape[::-1], None, None
+            )
+        except cv2.error as exc:
+            self.failed.emit(f"キャリブレーションに失敗しました: {exc.err}")
+            return
 
         if self.isInterruptionRequested():
             return
@@ -131,16 +197,34 @@ class FrameCalibrator(QThread):
         })
 
     # ===== 停止要求 =====
-    def stop(self) -> None:
-        """ワーカを停止する。"""
+    def stop(self, *, wait: bool = True) -> None:
+        """ワーカを停止する。wait=False なら要求だけ出して戻り、完了は stopped で通知される。"""
         self._running = False
         self.requestInterruption()
-        self.wait()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if wait:
+            self.wait()
 
     # ===== 内部ヘルパ =====
-    def _create_object_points(self) -> np.ndarray:
-        """チェスボード上の 3D 座標 (Z=0) を生成。"""
-        objp = np.zeros((self._pattern_size[0] * self._pattern_size[1], 3), np.float32)
-        objp[:, :2] = np.mgrid[0:self._pattern_size[0], 0:self._pattern_size[1]].T.reshape(-1, 2)
-        objp *= self._square_size
-        return objp
+    def _detect(self, gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray | None] | None:
+        """ボードを検出し (3D 座標, 画像座標, ChArUco ID) を返す。採用できなければ None。"""
+        if self._charuco is None:
+            with timed("findChessboardCorners"):
+                found, corners = cv2.findChessboardCorners(gray, self._pattern_size, CORNER_FLAGS)
+            if not found:
+                return None
+            # --- サブピクセル精緻化 ---
+            sub = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), SUBPIX_CRITERIA)
+            return create_object_points(self._pattern_size, self._square_size), sub, None
+
+        with timed("detectBoard"):
+            corners, ids, _, _ = self._charuco.detectBoard(gray)
+        if ids is None or len(ids) < CHARUCO_MIN_CORNERS:
+            return None
+        objp, imgp = self._charuco.getBoard().matchImagePoints(corners, ids)
+        if not spans_board_plane(objp):
+            return None
+        return objp, imgp, ids
@@ -0,0 +1,78 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from __future__ import annotations
+import sys
+from typing import Dict, List
+
+# --- 外部ライブラリ ---
+import cv2
+import numpy as np
+from PySide6.QtGui import QImage
+# ====
+
+# ===== 定数定義 =====
+# --- プールの配列を参照しているのがプール自身（＋getrefcount の引数）だけなら未使用 ---
+_FREE_REFCOUNT: int = 2
+# ====
+
+
+class FrameConverter:
+    """BGR フレームを再利用バッファ上の QImage へ変換するクラス（1 インスタンスは 1 スレッドで使う）。"""
+
+    def __init__(self, *, pool_size: int = 4, max_size: int | None = None) -> None:
+        """バッファ数と、縮小する場合の長辺上限（None で縮小しない）を設定する。"""
+        self._pool_size: int = pool_size
+        self._max_size: int | None = max_size
+        self._pool: List[np.ndarray] = []
+        # --- 統計 ---
+        self.reused: int = 0
+        self.allocated: int = 0
+        self.overflow: int = 0
+
+    # ===== 変換 =====
+    def convert(self, frame_bgr: np.ndarray) -> QImage:
+        """frame_bgr を（必要なら縮小して）プールのバッファへ書き込み、それを参照する QImage を返す。"""
+        # --- PySide6 の QImage はデータ共有が続く限り元配列への参照を保持するため、GUI 側が画像を手放すまでバッファは再利用されない ---
+        h, w = frame_bgr.shape[:2]
+        out_w, out_h = self._output_size(w, h)
+        buf = self._acquire(out_h, out_w)
+
+        # --- 縮小と書き込みを 1 回で行う（BGR888 なので色変換は不要） ---
+        if (out_w, out_h) == (w, h):
+            np.copyto(buf, frame_bgr)
+        else:
+            cv2.resize(frame_bgr, (out_w, out_h), dst=buf, interpolation=cv2.INTER_AREA)
+        return QImage(buf, out_w, out_h, 3 * out_w, QImage.Format.Format_BGR888)
+
+    def stats(self) -> Dict[str, int]:
+        """バッファの再利用回数・新規確保回数・プール外確保回数を返す。"""
+        return {"reused": self.reused, "allocated": self.allocated, "overflow": self.overflow}
+
+    # ===== 内部処理 =====
+    def _output_size(self, w: int, h: int) -> tuple[int, int]:
+        """長辺上限に収まる出力サイズを返す。"""
+        if self._max_size is None or max(w, h) <= self._max_size:
+            return w, h
+        scale = self._max_size / max(w, h)
+        return max(1, round(w * scale)), max(1, round(h * scale))
+
+    def _acquire(self, h: int, w: int) -> np.ndarray:
+        """GUI から解放済みで同じ形状のバッファを返す。無ければ確保する。"""
+        shape = (h, w, 3)
+        for i in range(len(self._pool)):
+            if sys.getrefcount(self._pool[i]) > _FREE_REFCOUNT:
+                continue
+            if self._pool[i].shape == shape:
+                self.reused += 1
+                return self._pool[i]
+            self._pool[i] = np.empty(shape, np.uint8)   # 解像度変更時は空きバッファを作り直す
+            self.allocated += 1
+            return self._pool[i]
+
+        buf = np.empty(shape, np.uint8)
+        if len(self._pool) < self._pool_size:
+            self._pool.append(buf)
+            self.allocated += 1
+        else:
+            self.overflow += 1   # GUI が画像を溜め込んでいる場合はプール外で確保（QImage が保持する）
+        return buf
@@ -0,0 +1,154 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from typing import List
+
+# --- 外部ライブラリ ---
+from PySide6.QtWidgets import (
+    QWidget, QLabel, QLayout, QVBoxLayout, QGroupBox, QPushButton, QProgressBar
+)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap, QImage
+
+# --- 自作モジュール ---
+from .style_constants import (
+    BACKGROUND_COLOR,
+    TEXT_COLOR,
+    SUCCESS_COLOR,
+    WARNING_COLOR
+)
+from .safe_widgets import SafeComboBox
+# ====
+
+# ===== 定数定義 =====
+PREVIEW_SIZE: int = 480
+# ====
+
+
+class CameraPanel(QGroupBox):
+    """カメラ 1 台分の選択コンボ・プレビュー・キャリブレーション UI。"""
+
+    def __init__(self, cam_id: int, parent: QWidget | None = None) -> None:
+        """cam_id 用のウィジェット群を生成する。"""
+        super().__init__(f"Camera {cam_id}", parent)
+        self.cam_id: int = cam_id
+        self.calibrated: bool = False
+
+        self.combo = SafeComboBox()
+        self.combo.addItem("未選択")
+        self.combo.setFixedWidth(PREVIEW_SIZE)
+
+        self.label = QLabel()
+        self.label.setAlignment(Qt.AlignCenter)
+        self.label.setFixedSize(PREVIEW_SIZE, PREVIEW_SIZE)
+        self.label.setStyleSheet(f"""
+            background-color: {BACKGROUND_COLOR};
+            color: {TEXT_COLOR};
+            border-radius: 8px;
+        """)
+
+        self.calib_btn = QPushButton("キャリブレーション開始")
+        self.calib_btn.setEnabled(False)
+
+        self.status = QLabel()
+        self.status.setAlignment(Qt.AlignCenter)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(0)
+        self.progress.setFixedWidth(PREVIEW_SIZE)
+        self.progress.setVisible(False)
+
+        vbox = QVBoxLayout()
+        vbox.addWidget(self.combo)
+        vbox.addWidget(self.label)
+        vbox.addWidget(self.calib_btn)
+        vbox.addWidget(self.status)
+        vbox.addWidget(self.progress)
+        vbox.setSizeConstraint(QLayout.SetFixedSize)
+        vbox.setContentsMargins(16, 16, 16, 8)
+        self.setLayout(vbox)
+
+        self.reset()
+
+    # ===== プレビュー =====
+    def update_preview(self, qimg: QImage) -> None:
+        """受信した QImage を QLabel に描画する。"""
+        self.label.setPixmap(
+            QPixmap.fromImage(qimg).scaled(
+                PREVIEW_SIZE,
+                PREVIEW_SIZE,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        )
+
+    # ===== 状態表示 =====
+    def reset(self) -> None:
+        """未接続・未キャリブレーション表示に戻す。"""
+        self.label.clear()
+        self.label.setText(f"Camera {self.cam_id} 未接続")
+        self.progress.setVisible(False)
+        self.progress.setValue(0)
+        self.calib_btn.setEnabled(False)
+        self.set_uncalibrated()
+        self.status.setVisible(True)
+
+    def set_uncalibrated(self) -> None:
+        """未キャリブレーション表示にする。"""
+        self.calibrated = False
+        self.status.setStyleSheet(f"color: {WARNING_COLOR};")
+        self.status.setTextFormat(Qt.PlainText)
+        self.status.setText("未キャリブレーション")
+
+    def set_calibrated(self, error: float | None, threshold: float = 1.0) -> None:
+        """キャリブレーション完了時または再選択時のステータスラベル表示を共通化する。"""
+        self.calibrated = True
+        self.status.setStyleSheet("")  # 色指定リセット（qdarkstyleデフォルトに）
+        if error is not None and not (isinstance(error, float) and (error != error)):  # NaN防止
+            if error > threshold:
+                error_color = WARNING_COLOR
+            else:
+                error_color = SUCCESS_COLOR
+            msg = (
+                "キャリブレーション完了<br>"
+                "再投影誤差："
+                f"<span style='color:{error_color}; font-weight:bold'>{error:.2f}px</span>"
+            )
+            self.status.setTextFormat(Qt.RichText)
+            self.status.setText(msg)
+        else:
+            self.status.setTextFormat(Qt.PlainText)
+            self.status.setText("キャリブレーション完了")
+
+    def show_progress(self) -> None:
+        """ステータスを隠して進捗バーを表示する。"""
+        self.status.setVisible(False)
+        self.progress.setValue(0)
+        self.progress.setVisible(True)
+
+    def hide_progress(self) -> None:
+        """進捗バーを隠してステータスを表示する。"""
+        self.progress.setVisible(False)
+        self.status.setVisible(True)
+
+    # ===== コンボ =====
+    def set_device_names(self, names: List[str]) -> None:
+        """シグナルを止めてデバイス名一覧を入れ替える。"""
+        self.combo.blockSignals(True)
+        self.combo.clear()
+        self.combo.addItem("未選択")
+        for n in names:
+            self.combo.addItem(n)
+        self.combo.blockSignals(False)
+
+    def set_index_silently(self, index: int) -> None:
+        """シグナルを発火させずに選択を変更する。"""
+        self.combo.blockSignals(True)
+        self.combo.setCurrentIndex(index)
+        self.combo.blockSignals(False)
+
+    def set_disabled_indices(self, disabled: set[int]) -> None:
+        """他スロットで使用中の item を選択不可にする。"""
+        model = self.combo.model()
+        for idx in range(self.combo.count()):
+            model.item(idx).setEnabled(idx == 0 or idx not in disabled)
@@ -1,56 +1,75 @@
 # ===== インポート =====
 # --- 標準ライブラリ ---
-from typing import Tuple, List, Callable, Any
+import math
 from pathlib import Path
+from typing import List
 
 # --- 外部ライブラリ ---
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QLabel, QLayout, QVBoxLayout,
-    QHBoxLayout, QGroupBox, QComboBox, QScrollArea,
-    QMessageBox, QPushButton, QProgressBar
+    QMainWindow, QWidget, QLayout, QVBoxLayout,
+    QGridLayout, QGroupBox, QScrollArea, QMessageBox
 )
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QImage, QCloseEvent
+from PySide6.QtGui import QCloseEvent, QKeySequence, QShortcut
 
 # --- 自作モジュール ---
-from .style_constants import (
-    BACKGROUND_COLOR,
-    TEXT_COLOR,
-    WARNING_COLOR
-)
+from .. import profiling
 from ..camera.camera_manager import QtCameraManager
-from ..camera.camera_stream import CameraStream
-from ..camera.frame_calibrator import FrameCalibrator
-from ..pose.pose_worker import PoseWorker
-from .safe_widgets import SafeComboBox
+from ..camera.capture_mode import device_capture_modes
+from ..pipeline.camera_pipeline import CameraPipelineSet, load_reprojection_error
+from ..pose.inference_scheduler import InferenceScheduler
+from ..pose.keypoint_shm import KeypointPublisher
+from ..pose.model_preloader import ModelPreloader
+from ..thread_budget import ThreadBudget
+from .camera_panel import CameraPanel
 # ====
 
 
-def safe_disconnect(signal: object, slot: Callable[..., Any]) -> None:
-    """エラーを無視して `signal` から `slot` を切断する。"""
-    try:
-        signal.disconnect(slot)
-    except Exception:
-        pass
-
 class MainWindow(QMainWindow):
     """アプリケーションのメインウィンドウ。"""
 
     # ===== コンストラクタ =====
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        num_cameras: int = 2,
+        scheduler_policy: str | None = None,
+        calib_board: str = "chessboard",
+        publish_keypoints: bool = True,
+        thread_budget: ThreadBudget | None = None,
+        pose_log_root: Path | None = None,
+    ) -> None:
         """UI を構築し、カメラマネージャを初期化する。"""
         super().__init__()
 
         # --- ウィンドウタイトル ---
         self.setWindowTitle("ESTiVision")
 
-        # --- カメラ別ウィジェット／スレッド管理辞書 ---
-        #     {cam_id: {...}}
-        self.camera_widgets: dict[int, dict[str, object]] = {}
-        self.streams: dict[int, CameraStream | None] = {1: None, 2: None}
-        self.calib_workers: dict[int, FrameCalibrator | None] = {1: None, 2: None}
-        self.preview_slots: dict[int, Callable[[QImage], None]] = {}
-        self.pose_workers: dict[int, PoseWorker | None] = {1: None, 2: None}
+        # --- CPU の割り振り（推論スレッドはスケジューラなら 1 本、なければカメラ台数分） ---
+        self._thread_budget: ThreadBudget = thread_budget or ThreadBudget(1 if scheduler_policy else num_cameras)
+        self._thread_budget.apply_process()
+
+        # --- 共有推論スケジューラ（未指定ならカメラごとに PoseWorker） ---
+        scheduler: InferenceScheduler | None = None
+        if scheduler_policy:
+            scheduler = InferenceScheduler(policy=scheduler_policy, allocation=self._thread_budget.allocation(0))
+            scheduler.failed.connect(self._on_pose_failed)
+            scheduler.start()
+
+        # --- 最新キーポイントを他プロセスへ公開する共有メモリ（使えない環境では書き出さない） ---
+        publisher: KeypointPublisher | None = None
+        self._shm_error: str | None = None   # 書き出せない理由（別インスタンスが使用中など）
+        if publish_keypoints:
+            try:
+                publisher = KeypointPublisher(num_cameras)
+            except OSError as exc:
+                self._shm_error = str(exc)
+
+        # --- カメラ別処理系／UI パネル（cam_id: 1..num_cameras） ---
+        self.pipelines: CameraPipelineSet = CameraPipelineSet(
+            num_cameras, calib_board=calib_board, scheduler=scheduler, publisher=publisher,
+            budget=self._thread_budget, log_root=pose_log_root, parent=self,
+        )
+        self.panels: dict[int, CameraPanel] = {}
 
         # --- UI 構築 ---
         self._setup_ui()
@@ -59,6 +78,18 @@ class MainWindow(QMainWindow):
         self.qt_cam_mgr: QtCameraManager = QtCameraManager()
         self.qt_cam_mgr.cameras_changed.connect(self._on_cameras_changed)
 
+        # --- 推論セッションを裏で読み込み、初回推論の遅延を隠す ---
+        self.statusBar().showMessage("推論モデル読み込み中…")
+        # --- 最初の推論スレッドと同じ割り当てで読み込み、そのセッションを引き継がせる ---
+        self._preloader: ModelPreloader = ModelPreloader(allocation=self._thread_budget.allocation(0), parent=self)
+        self._preloader.loaded.connect(self._on_model_loaded)
+        self._preloader.failed.connect(self._on_model_load_failed)
+        self._preloader.start()
+
+        # --- プロファイル有効時は Ctrl+Shift+P で途中経過を書き出す ---
+        if profiling.enabled():
+            QShortcut(QKeySequence("Ctrl+Shift+P"), self, activated=self._dump_profile)
+
         # --- ウィンドウ幅をフィット ---
         self.adjustSize()
         self.setFixedWidth(self.width())
@@ -87,21 +118,34 @@ class MainWindow(QMainWindow):
 
     # ===== セクション生成 =====
     def _create_cameras_section(self) -> QGroupBox:
-        """カメラ 1・2 のプレビューグループを並べる。"""
-        layout = QHBoxLayout()
-        for cam_id in (1, 2):
-            grp, combo, label, calib_btn, status_lbl, progress = (
-                self._create_camera_group(cam_id)
+        """カメラ台数に応じたグリッドでプレビューパネルを並べる。"""
+        layout = QGridLayout()
+        columns = max(2, math.ceil(math.sqrt(len(self.pipelines))))
+        for i, pipeline in enumerate(self.pipelines):
+            cam_id = pipeline.cam_id
+            panel = CameraPanel(cam_id)
+            panel.combo.currentIndexChanged.connect(
+                lambda idx, cid=cam_id: self._on_camera_selected(cid, idx)
+            )
+            panel.calib_btn.clicked.connect(
+                lambda _, cid=cam_id: self._on_calibration_start(cid)
             )
-            self.camera_widgets[cam_id] = {
-                "combo": combo,
-                "label": label,
-                "calib_btn": calib_btn,
-                "status": status_lbl,
-                "progress": progress,
-            }
-            self.preview_slots[cam_id] = self._make_qimage_updater(label)
-            layout.addWidget(grp)
+
+            # --- 処理系 → パネルの接続（スロット毎に独立で、台数が増えても交差しない） ---
+            pipeline.preview.connect(panel.update_preview)
+            pipeline.stream_error.connect(lambda msg, cid=cam_id: self._on_stream_error(cid, msg))
+            pipeline.mode_negotiated.connect(lambda rep, cid=cam_id: self._on_mode_negotiated(cid, rep))
+            pipeline.disconnected.connect(lambda cid=cam_id: self._on_stream_disconnected(cid))
+            pipeline.reconnected.connect(lambda sec, cid=cam_id: self._on_stream_reconnected(cid, sec))
+            pipeline.pose_ready.connect(lambda cid=cam_id: self._on_pose_ready(cid))
+            pipeline.pose_failed.connect(self._on_pose_failed)
+            pipeline.presence_changed.connect(lambda present, cid=cam_id: self._on_presence_changed(cid, present))
+            pipeline.calib_progress.connect(panel.progress.setValue)
+            pipeline.calib_finished.connect(lambda res, cid=cam_id: self._on_calibration_finished(cid, res))
+            pipeline.calib_failed.connect(lambda msg, cid=cam_id: self._on_calibration_failed(cid, msg))
+
+            self.panels[cam_id] = panel
+            layout.addWidget(panel, i // columns, i % columns)
 
         layout.setSizeConstraint(QLayout.SetFixedSize)
         layout.setSpacing(16)
@@ -111,129 +155,27 @@ class MainWindow(QMainWindow):
         group.setLayout(layout)
         return group
 
-    def _create_camera_group(
-        self,
-        cam_id: int
-    ) -> Tuple[QGroupBox, QComboBox, QLabel, QPushButton, QLabel, QProgressBar]:
-        """cam_id 用の UI グループ生成。"""
-        combo = SafeComboBox()
-        combo.addItem("未選択")
-        combo.setFixedWidth(480)
-        combo.currentIndexChanged.connect(
-            lambda idx, cid=cam_id: self._on_camera_selected(cid, idx)
-        )
-
-        label = QLabel(f"Camera {cam_id} 未接続")
-        label.setAlignment(Qt.AlignCenter)
-        label.setFixedSize(480, 480)
-        label.setStyleSheet(f"""
-            background-color: {BACKGROUND_COLOR};
-            color: {TEXT_COLOR};
-            border-radius: 8px;
-        """)
-
-        calib_btn = QPushButton("キャリブレーション開始")
-        calib_btn.setEnabled(False)
-        calib_btn.clicked.connect(
-            lambda _, cid=cam_id: self._on_calibration_start(cid)
-        )
-
-        status_lbl = QLabel("未キャリブレーション")
-        status_lbl.setAlignment(Qt.AlignCenter)
-        status_lbl.setStyleSheet(f"color: {WARNING_COLOR};")
-
-        progress = QProgressBar()
-        progress.setRange(0, 100)
-        progress.setValue(0)
-        progress.setFixedWidth(480)
-        progress.setVisible(False)
-
-        vbox = QVBoxLayout()
-        vbox.addWidget(combo)
-        vbox.addWidget(label)
-        vbox.addWidget(calib_btn)
-        vbox.addWidget(status_lbl)
-        vbox.addWidget(progress)
-        vbox.setSizeConstraint(QLayout.SetFixedSize)
-        vbox.setContentsMargins(16, 16, 16, 8)
-
-        group = QGroupBox(f"Camera {cam_id}")
-        group.setLayout(vbox)
-        return group, combo, label, calib_btn, status_lbl, progress
-
-    def _make_qimage_updater(self, label: QLabel) -> Callable[[QImage], None]:
-        """QImage をラベルへ描画するコールバックを生成。"""
-        def _update(qimg: QImage) -> None:
-            """受信した QImage を QLabel に描画する。"""
-            label.setPixmap(
-                QPixmap.fromImage(qimg).scaled(
-                    480,
-                    480,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-            )
-        return _update
-
     # ===== カメラリスト更新 =====
     def _on_cameras_changed(self, names: List[str]) -> None:
-        """デバイス接続変化時にコンボを更新。"""
-        for cam_id in (1, 2):
-            combo: QComboBox = self.camera_widgets[cam_id]["combo"]  # type: ignore[index]
-            combo.blockSignals(True)
-            combo.clear()
-            combo.addItem("未選択")
-            for n in names:
-                combo.addItem(n)
-            combo.blockSignals(False)
+        """デバイス接続変化時にコンボを更新し、使用中カメラを固有 ID で追従する。"""
+        for panel in self.panels.values():
+            panel.set_device_names(names)
+
+        # --- 抜き差しで番号が変わっても同じデバイスを選択したままにする（取得は自動で再接続） ---
+        locations = self.pipelines.match_devices(self.qt_cam_mgr.device_ids())
+        for cam_id, index in locations.items():
+            self.panels[cam_id].set_index_silently(0 if index is None else index + 1)
         self._update_combo_enabled_states()
 
     # ===== コンボ選択 =====
     def _on_camera_selected(self, cam_id: int, index: int) -> None:
         """カメラ選択／解除時の処理。"""
-        widgets = self.camera_widgets[cam_id]
-        combo: QComboBox = widgets["combo"]  # type: ignore[index]
-        label: QLabel = widgets["label"]  # type: ignore[index]
-        calib_btn: QPushButton = widgets["calib_btn"]  # type: ignore[index]
-        status_lbl: QLabel = widgets["status"]  # type: ignore[index]
-        progress: QProgressBar = widgets["progress"]  # type: ignore[index]
-        other_combo: QComboBox = self.camera_widgets[2 if cam_id == 1 else 1]["combo"]  # type: ignore[index]
-        update_slot = self.preview_slots[cam_id]
-        stream: CameraStream | None = self.streams[cam_id]
-        worker: FrameCalibrator | None = self.calib_workers[cam_id]
-
-        # --- 既存ストリーム停止 ---
-        if stream:
-            safe_disconnect(stream.image_ready, update_slot)
-            stream.stop()
-            self.streams[cam_id] = None
-        
-        # --- PoseWorker 停止 ---
-        pworker = self.pose_workers[cam_id]
-        if pworker:
-            safe_disconnect(pworker.image_ready, update_slot)
-            if stream:
-                safe_disconnect(stream.frame_ready, pworker.enqueue_frame)
-            pworker.stop()
-            self.pose_workers[cam_id] = None
-
-        # --- キャリブレーションワーカ停止 ---
-        if worker:
-            if stream:
-                safe_disconnect(stream.frame_ready, worker.enqueue_frame)
-            safe_disconnect(worker.preview, update_slot)
-            worker.stop()
-            self.calib_workers[cam_id] = None
-        label.clear()
-        label.setText(f"Camera {cam_id} 未接続")
-        progress.setVisible(False)
-        progress.setValue(0)
-
-        # --- ボタン／ステータス初期化 ---
-        calib_btn.setEnabled(False)
-        status_lbl.setText("未キャリブレーション")
-        status_lbl.setStyleSheet(f"color: {WARNING_COLOR};")
-        status_lbl.setVisible(True)
+        panel = self.panels[cam_id]
+        pipeline = self.pipelines[cam_id]
+
+        # --- 既存スレッド停止・表示初期化 ---
+        pipeline.close()
+        panel.reset()
 
         # --- 未選択 ---
         if index == 0:
@@ -242,50 +184,34 @@ class MainWindow(QMainWindow):
 
         device_id = index - 1
         # --- キャリブレーション済みかチェック ---
-        npz_path = Path(f"data/parameters/calib_cam{device_id}.npz")
-        if npz_path.exists():
-            try:
-                import numpy as np
-                npz = np.load(npz_path)
-                error = float(npz.get("reprojection_error", np.nan))
-            except Exception:
-                error = None
-            self._set_calib_status_label(status_lbl, error)
-        else:
-            status_lbl.setStyleSheet(f"color: {WARNING_COLOR};")
-            status_lbl.setTextFormat(Qt.PlainText)
-            status_lbl.setText("未キャリブレーション")
+        calibrated, error = load_reprojection_error(device_id)
+        if calibrated:
+            panel.set_calibrated(error)
 
         # --- 重複選択チェック ---
-        if other_combo.currentIndex() == index:
+        owner = self.pipelines.owner_of(device_id)
+        if owner is not None and owner != cam_id:
             QMessageBox.warning(
                 self, "カメラ重複",
                 "そのカメラは既に別スロットで使用中です。"
             )
-            combo.blockSignals(True)
-            combo.setCurrentIndex(0)
-            combo.blockSignals(False)
+            panel.set_index_silently(0)
+            panel.set_uncalibrated()
             self._update_combo_enabled_states()
             return
 
-        # --- 新ストリーム開始 ---
-        stream = CameraStream(device_id)
-        stream.image_ready.connect(update_slot)
-        stream.error.connect(lambda msg, cid=cam_id: self._on_stream_error(cid, msg))
-        stream.start()
-        self.streams[cam_id] = stream
+        # --- 新ストリーム開始（対応モードからモデル入力に見合う取得モードを選ぶ） ---
+        devices = self.qt_cam_mgr.devices()
+        modes = device_capture_modes(devices[device_id]) if device_id < len(devices) else None
+        keys = self.qt_cam_mgr.device_ids()
+        pipeline.open(device_id, modes, keys[device_id] if device_id < len(keys) else None)
 
         # --- ボタン有効化 ---
-        calib_btn.setEnabled(True)
+        panel.calib_btn.setEnabled(True)
 
         # --- PoseWorker 起動 ---
-        #     キャリブレーション済みかどうかは status_lbl のテキストで判定
-        if "キャリブレーション完了" in status_lbl.text():
-            pworker = PoseWorker()
-            pworker.image_ready.connect(update_slot)
-            stream.frame_ready.connect(pworker.enqueue_frame)
-            pworker.start()
-            self.pose_workers[cam_id] = pworker
+        if panel.calibrated:
+            pipeline.start_pose()
 
         self._update_combo_enabled_states()
         self._refresh_calib_ui(cam_id)
@@ -293,167 +219,107 @@ class MainWindow(QMainWindow):
     # ===== キャリブレーション開始 =====
     def _on_calibration_start(self, cam_id: int) -> None:
         """キャリブレーションボタン押下時。"""
-        widgets = self.camera_widgets[cam_id]
-        combo: QComboBox = widgets["combo"]  # type: ignore[index]
-        calib_btn: QPushButton = widgets["calib_btn"]  # type: ignore[index]
-        status_lbl: QLabel = widgets["status"]  # type: ignore[index]
-        progress: QProgressBar = widgets["progress"]  # type: ignore[index]
-
-        stream = self.streams[cam_id]
-        worker = self.calib_workers[cam_id]
-        update_slot = self.preview_slots[cam_id]
-
-        if combo.currentIndex() == 0:
+        panel = self.panels[cam_id]
+        if panel.combo.currentIndex() == 0:
             return
 
-        if worker:
+        if not self.pipelines[cam_id].start_calibration():
             return
 
-        calib_btn.setEnabled(False)
-        status_lbl.setVisible(False)
-        progress.setValue(0)
-        progress.setVisible(True)
-
-        device_id = combo.currentIndex() - 1
-        calib_worker = FrameCalibrator(device_id=device_id)
-        self.calib_workers[cam_id] = calib_worker
-
-        if stream:
-            stream.frame_ready.connect(calib_worker.enqueue_frame)
-            safe_disconnect(stream.image_ready, update_slot)
-
-        calib_worker.preview.connect(update_slot)
-
-        calib_worker.progress.connect(progress.setValue)
-        calib_worker.capture_done.connect(lambda cid=cam_id: self._on_capture_done(cid))
-        calib_worker.finished.connect(lambda res, cid=cam_id: self._on_calibration_finished(cid, res))
-        calib_worker.failed.connect(lambda msg, cid=cam_id: self._on_calibration_failed(cid, msg))
-
-        calib_worker.start()
-
-    def _on_capture_done(self, cam_id: int) -> None:
-        """撮影終了時にプレビュー接続を戻す。"""
-        stream = self.streams[cam_id]
-        worker = self.calib_workers[cam_id]
-        update_slot = self.preview_slots[cam_id]
-        if stream and worker:
-            stream.frame_ready.disconnect(worker.enqueue_frame)
-            safe_disconnect(worker.preview, update_slot)
-            stream.image_ready.connect(update_slot)
+        panel.calib_btn.setEnabled(False)
+        panel.show_progress()
 
     def _on_calibration_finished(self, cam_id: int, result: dict[str, object]) -> None:
         """キャリブレーション完了時。"""
-        widgets = self.camera_widgets[cam_id]
-        status_lbl: QLabel = widgets["status"]  # type: ignore[index]
-        calib_btn: QPushButton = widgets["calib_btn"]  # type: ignore[index]
-        progress: QProgressBar = widgets["progress"]  # type: ignore[index]
-
-        progress.setVisible(False)
-        status_lbl.setVisible(True)
+        panel = self.panels[cam_id]
+        panel.hide_progress()
         error = result.get("reprojection_error", None)
-        self._set_calib_status_label(status_lbl, error)
-
-        calib_btn.setEnabled(True)
+        panel.set_calibrated(error)  # type: ignore[arg-type]
+        panel.calib_btn.setEnabled(True)
 
-        worker = self.calib_workers[cam_id]
-        if worker:
-            worker.wait()
-        self.calib_workers[cam_id] = None
-
-        if "キャリブレーション完了" in status_lbl.text():
-            stream = self.streams[cam_id]
-            if stream and self.pose_workers[cam_id] is None:
-                pworker = PoseWorker(providers=["CPUExecutionProvider"])
-                pworker.image_ready.connect(self.preview_slots[cam_id])
-                stream.frame_ready.connect(pworker.enqueue_frame)
-                pworker.start()
-                self.pose_workers[cam_id] = pworker
+        self.pipelines[cam_id].start_pose(providers=["CPUExecutionProvider"])
 
     def _on_calibration_failed(self, cam_id: int, message: str) -> None:
         """キャリブレーション失敗時。"""
-        widgets = self.camera_widgets[cam_id]
-        status_lbl: QLabel = widgets["status"]  # type: ignore[index]
-        calib_btn: QPushButton = widgets["calib_btn"]  # type: ignore[index]
-        progress: QProgressBar = widgets["progress"]  # type: ignore[index]
-
+        panel = self.panels[cam_id]
         QMessageBox.critical(self, "キャリブレーション失敗", message)
-        progress.setVisible(False)
-        status_lbl.setVisible(True)
-        status_lbl.setText("未キャリブレーション")
-        status_lbl.setStyleSheet(f"color: {WARNING_COLOR};")
-        calib_btn.setEnabled(True)
-
-        worker = self.calib_workers[cam_id]
-        if worker:
-            worker.wait()
-        self.calib_workers[cam_id] = None
+        panel.hide_progress()
+        panel.set_uncalibrated()
+        panel.calib_btn.setEnabled(True)
 
     def _on_stream_error(self, cam_id: int, message: str) -> None:
         """CameraStream からのエラー受信時。"""
         QMessageBox.critical(self, "カメラ接続失敗", message)
-        combo: QComboBox = self.camera_widgets[cam_id]["combo"]  # type: ignore[index]
-        combo.blockSignals(True)
-        combo.setCurrentIndex(0)
-        combo.blockSignals(False)
+        self.panels[cam_id].set_index_silently(0)
         self._on_camera_selected(cam_id, 0)
 
+    def _on_stream_disconnected(self, cam_id: int) -> None:
+        """取得が途切れたとき（ワーカ・キャリブレーションは維持したまま再接続を待つ）。"""
+        self.statusBar().showMessage(f"Camera {cam_id}: 切断を検知しました。再接続中…")
+
+    def _on_stream_reconnected(self, cam_id: int, seconds: float) -> None:
+        """自動再接続の完了時。"""
+        self.statusBar().showMessage(f"Camera {cam_id}: 再接続しました（{seconds:.2f} 秒）", 5000)
+
+    def _on_mode_negotiated(self, cam_id: int, report: dict[str, object]) -> None:
+        """ドライバが受け入れた取得モードをステータスバーに表示する。"""
+        actual = report["actual"]
+        text = f"Camera {cam_id}: {actual.width}x{actual.height} {actual.pixel_format.strip()} {actual.fps:.0f}fps"  # type: ignore[attr-defined]
+        if not report["matched"]:
+            req = report["requested"]
+            text += f"（要求 {req.width}x{req.height} {req.pixel_format} と不一致）"  # type: ignore[attr-defined]
+        self.statusBar().showMessage(text, 5000)
+
+    # ===== 推論モデル =====
+    def _on_model_loaded(self, seconds: float) -> None:
+        """モデルの事前読み込み完了時。"""
+        message = f"推論モデル準備完了（{seconds:.1f} 秒）｜{self._thread_budget.describe()}"
+        if self._shm_error:
+            message += f"｜キーポイントの共有メモリ出力なし: {self._shm_error}"
+        self.statusBar().showMessage(message, 8000)
+
+    def _on_model_load_failed(self, message: str) -> None:
+        """モデルの事前読み込み失敗時（推論開始時に改めて通知される）。"""
+        self.statusBar().showMessage(f"推論モデルを読み込めませんでした: {message}")
+
+    def _on_pose_ready(self, cam_id: int) -> None:
+        """姿勢推定の開始時（新規スレッドのセッション準備完了、または待機スレッドの付け替え）。"""
+        self.statusBar().showMessage(f"Camera {cam_id}: 姿勢推定を開始しました", 3000)
+
+    def _on_presence_changed(self, cam_id: int, present: bool) -> None:
+        """人物不在による推論の間引き開始／通常の推論への復帰時。"""
+        if present:
+            self.statusBar().showMessage(f"Camera {cam_id}: 人物を検出、通常の推論に戻りました", 3000)
+        else:
+            self.statusBar().showMessage(f"Camera {cam_id}: 人物がいないため推論を間引いています", 3000)
+
+    def _on_pose_failed(self, message: str) -> None:
+        """姿勢推定の開始失敗時。"""
+        QMessageBox.critical(self, "姿勢推定の開始失敗", message)
+
+    def _dump_profile(self) -> None:
+        """プロファイルレポートを書き出す。"""
+        path = profiling.dump()
+        self.statusBar().showMessage(f"プロファイルを書き出しました: {path}", 5000)
+
     # ===== UI ヘルパ =====
     def _update_combo_enabled_states(self) -> None:
         """同じカメラの重複選択を防ぐため item の Enabled を切り替える。"""
-        combo1: QComboBox = self.camera_widgets[1]["combo"]  # type: ignore[index]
-        combo2: QComboBox = self.camera_widgets[2]["combo"]  # type: ignore[index]
-        sel1 = combo1.currentIndex()
-        sel2 = combo2.currentIndex()
-
-        for idx in range(combo1.count()):
-            itm1 = combo1.model().item(idx)
-            itm2 = combo2.model().item(idx)
-            itm1.setEnabled(idx == 0 or idx != sel2)
-            itm2.setEnabled(idx == 0 or idx != sel1)
+        selected = {cid: p.combo.currentIndex() for cid, p in self.panels.items()}
+        for cam_id, panel in self.panels.items():
+            used = {idx for cid, idx in selected.items() if cid != cam_id and idx != 0}
+            panel.set_disabled_indices(used)
 
     def _refresh_calib_ui(self, cam_id: int) -> None:
         """combo とワーカ状態からキャリブレーションボタンの Enabled を更新。"""
-        widgets = self.camera_widgets[cam_id]
-        combo: QComboBox = widgets["combo"]  # type: ignore[index]
-        calib_btn: QPushButton = widgets["calib_btn"]  # type: ignore[index]
-        worker = self.calib_workers[cam_id]
-
-        calib_btn.setEnabled(combo.currentIndex() != 0 and worker is None)
-    
-    def _set_calib_status_label(self, status_lbl: QLabel, error: float | None, threshold: float = 1.0) -> None:
-        """キャリブレーション完了時または再選択時のステータスラベル表示を共通化する。"""
-        status_lbl.setStyleSheet("")  # 色指定リセット（qdarkstyleデフォルトに）
-        from .style_constants import SUCCESS_COLOR, WARNING_COLOR
-        if error is not None and not (isinstance(error, float) and (error != error)):  # NaN防止
-            if error > threshold:
-                error_color = WARNING_COLOR
-            else:
-                error_color = SUCCESS_COLOR
-            msg = (
-                "キャリブレーション完了<br>"
-                "再投影誤差："
-                f"<span style='color:{error_color}; font-weight:bold'>{error:.2f}px</span>"
-            )
-            status_lbl.setTextFormat(Qt.RichText)
-            status_lbl.setText(msg)
-        else:
-            status_lbl.setTextFormat(Qt.PlainText)
-            status_lbl.setText("キャリブレーション完了")
+        panel = self.panels[cam_id]
+        panel.calib_btn.setEnabled(
+            panel.combo.currentIndex() != 0 and not self.pipelines[cam_id].calibrating
+        )
 
     # ===== ウィンドウクローズ =====
     def closeEvent(self, event: QCloseEvent) -> None:
         """すべてのスレッドを安全に停止。"""
-        for stream in self.streams.values():
-            if stream:
-                stream.stop()
-        
-        for pworker in self.pose_workers.values():
-            if pworker:
-                pworker.stop()
-
-        for worker in self.calib_workers.values():
-            if worker:
-                worker.requestInterruption()
-                worker.stop()
-
+        self.pipelines.close_all()
+        self._preloader.wait()
         super().closeEvent(event)
@@ -0,0 +1,3 @@
+"""pipeline サブパッケージの公開 API。"""
+from .camera_pipeline import CameraPipeline, CameraPipelineSet  # re-export
+__all__ = ["CameraPipeline", "CameraPipelineSet"]
@@ -0,0 +1,433 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from __future__ import annotations
+import time
+from pathlib import Path
+from typing import Callable, Any, Dict, Iterator, List, Optional, Sequence
+
+# --- 外部ライブラリ ---
+from PySide6.QtCore import QObject, QThread, Signal
+from PySide6.QtGui import QImage
+
+# --- 自作モジュール ---
+from ..camera.camera_stream import CameraStream
+from ..camera.capture_mode import CaptureMode, select_capture_mode
+from ..camera.frame_calibrator import FrameCalibrator
+from ..pose.inference_scheduler import InferenceChannel, InferenceScheduler
+from ..pose.keypoint_shm import KeypointPublisher
+from ..pose.pose_estimator import model_input_size
+from ..pose.pose_worker import PoseWorker
+from ..thread_budget import ThreadBudget, WorkerAllocation
+# ====
+
+# ===== 定数定義 =====
+DATA_ROOT: Path = Path(__file__).resolve().parents[3] / "data"   # 実行時のカレントディレクトリに依らないデータ置き場
+# ====
+
+
+def safe_disconnect(signal: object, slot: Callable[..., Any]) -> None:
+    """エラーを無視して `signal` から `slot` を切断する。"""
+    try:
+        signal.disconnect(slot)  # type: ignore[attr-defined]
+    except Exception:
+        pass
+
+
+def calibration_file(device_id: int) -> Path:
+    """device_id のキャリブレーション結果ファイルパスを返す。"""
+    return Path(f"data/parameters/calib_cam{device_id}.npz")
+
+
+def load_reprojection_error(device_id: int) -> tuple[bool, float | None]:
+    """(キャリブレーション済みか, 再投影誤差) を返す。誤差が読めなければ None。"""
+    npz_path = calibration_file(device_id)
+    if not npz_path.exists():
+        return False, None
+    try:
+        import numpy as np
+        npz = np.load(npz_path)
+        error = float(npz.get("reprojection_error", np.nan))
+    except Exception:
+        error = None
+    return True, error
+
+
+class CameraPipeline(QObject):
+    """カメラ 1 台分の取得・キャリブレーション・姿勢推定スレッドをまとめた処理単位。"""
+
+    # ===== 外部通知シグナル =====
+    preview: Signal = Signal(QImage)          # 表示用画像
+    stream_error: Signal = Signal(str)        # カメラ取得エラー
+    mode_negotiated: Signal = Signal(object)  # dict: 要求／実際の取得モード
+    disconnected: Signal = Signal()           # 取得が途切れた（自動で再接続中）
+    reconnected: Signal = Signal(float)       # 再接続完了（途切れていた秒数）
+    pose_ready: Signal = Signal()             # 姿勢推定の開始（セッション準備完了）
+    pose_failed: Signal = Signal(str)         # 推論モデル読み込み失敗
+    presence_changed: Signal = Signal(bool)   # False: 人物不在で推論を間引き中, True: 通常の推論
+    calib_progress: Signal = Signal(int)      # 0–100 %
+    calib_captured: Signal = Signal()         # 解析用画像収集完了
+    calib_finished: Signal = Signal(object)   # dict 結果
+    calib_failed: Signal = Signal(str)        # 失敗メッセージ
+    # ====
+
+    def __init__(
+        self,
+        cam_id: int,
+        *,
+        fps: int = 15,
+        model_type: str = "lightning",
+        preview_size: int | None = 480,
+        calib_board: str = "chessboard",
+        scheduler: InferenceScheduler | None = None,
+        publisher: KeypointPublisher | None = None,
+        allocation: WorkerAllocation | None = None,
+        log_root: Path | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """cam_id 番スロットの処理単位を生成する（スレッドは open まで作らない）。log_root 指定時のみ軌跡を記録する。"""
+        super().__init__(parent)
+        self.cam_id: int = cam_id
+        self._fps: int = fps
+        self._model_type: str = model_type
+        self._preview_size: int | None = preview_size   # プレビュー QImage の長辺上限
+        self._calib_board: str = calib_board             # "chessboard" / "charuco"
+        self._scheduler: InferenceScheduler | None = scheduler
+        self._publisher: KeypointPublisher | None = publisher   # 共有メモリのスロット cam_id-1 に書く
+        self._allocation: WorkerAllocation | None = allocation  # 専用 PoseWorker のスレッド数・CPU
+        self._log_root: Path | None = log_root   # 軌跡ログの保存先（None なら記録しない）
+        self._device_id: int | None = None
+        self._device_key: str | None = None   # QCameraDevice.id()（抜き差しで番号が変わっても不変）
+        self._stream: CameraStream | None = None
+        # --- 同じデバイスの旧取得スレッドの終了を待って開始する取得スレッド ---
+        self._deferred_stream: CameraStream | None = None
+        self._pose_worker: PoseWorker | InferenceChannel | None = None
+        self._calib_worker: FrameCalibrator | None = None
+        # --- カメラ切替で止めずに待機させておく PoseWorker（セッションごと使い回す） ---
+        self._idle_pose_worker: PoseWorker | None = None
+        # --- 停止要求済みで終了通知待ちのスレッド（参照を切ると実行中に破棄されるため保持） ---
+        self._retiring: List[QThread] = []
+
+    # ===== 状態参照 =====
+    @property
+    def device_id(self) -> int | None:
+        """使用中のデバイス番号（未使用・休止中なら None）。"""
+        return self._device_id
+
+    @property
+    def device_key(self) -> str | None:
+        """使用中デバイスの固有 ID（不明なら None）。"""
+        return self._device_key
+
+    @property
+    def stream(self) -> CameraStream | None:
+        """取得スレッド。"""
+        return self._stream
+
+    @property
+    def pose_worker(self) -> PoseWorker | InferenceChannel | None:
+        """姿勢推定スレッド（共有スケジューラ使用時はその窓口）。"""
+        return self._pose_worker
+
+    @property
+    def calibrating(self) -> bool:
+        """キャリブレーション中かを返す。"""
+        return self._calib_worker is not None
+
+    # ===== 開始／停止 =====
+    def open(
+        self,
+        device_id: int,
+        modes: Sequence[CaptureMode] | None = None,
+        device_key: str | None = None,
+    ) -> None:
+        """device_id のカメラで取得を開始する。対応モード一覧があればモデル入力に見合う最小のモードを選ぶ。"""
+        # --- device_key を渡すと、抜き差し後に relocate で同じデバイスを追従できる ---
+        self.close()
+        mode = select_capture_mode(modes, model_input_size(self._model_type), self._fps) if modes else None
+        stream = CameraStream(device_id, self._fps, capture_mode=mode, preview_size=self._preview_size)
+        stream.image_ready.connect(self.preview)
+        stream.error.connect(self.stream_error)
+        stream.mode_negotiated.connect(self.mode_negotiated)
+        stream.disconnected.connect(self.disconnected)
+        stream.reconnected.connect(self.reconnected)
+        # --- 同じデバイスを掴んだまま終了処理中の取得スレッドがあれば、GUI スレッドで待たずその終了後に開始する ---
+        blocker = next((
+            t for t in self._retiring
+            if isinstance(t, CameraStream) and t.device_id == device_id and not t.isFinished()
+        ), None)
+        if blocker is None:
+            stream.start()
+        else:
+            self._deferred_stream = stream
+            blocker.finished.connect(self._start_deferred)
+        self._stream = stream
+        self._device_id = device_id
+        self._device_key = device_key
+
+    def relocate(self, device_id: int) -> None:
+        """再接続された同じデバイスの新しい番号へ取得を向け直す（ワーカ・キャリブレーションは維持）。"""
+        if self._stream is None:
+            return
+        if device_id != self._device_id:
+            self._device_id = device_id
+            self._stream.set_device(device_id)
+        else:
+            self._stream.retry_now()
+
+    def suspend(self) -> None:
+        """デバイスが見つからない間は取得を休止し、番号を手放す（固有 ID は残し relocate で再開する）。"""
+        if self._stream is None:
+            return
+        self._device_id = None
+        self._stream.suspend()
+
+    def close(self) -> None:
+        """このスロットの処理を止める（GUI スレッドでは待たない）。"""
+        stream = self._stream
+        self._deferred_stream = None
+
+        # --- 既存ストリーム停止 ---
+        if stream:
+            safe_disconnect(stream.image_ready, self.preview)
+            self._retire(stream, stream.finished)
+            self._stream = None
+
+        # --- PoseWorker は止めずに待機させ、次のカメラで使い回す ---
+        pworker = self._pose_worker
+        if pworker:
+            safe_disconnect(pworker.image_ready, self.preview)
+            safe_disconnect(pworker.presence_changed, self.presence_changed)
+            if stream:
+                safe_disconnect(stream.frame_ready, pworker.enqueue_frame)
+            if isinstance(pworker, InferenceChannel):
+                self._scheduler.unregister(self.cam_id)  # type: ignore[union-attr]
+            else:
+                pworker.pause()
+                self._idle_pose_worker = pworker
+            self._pose_worker = None
+
+        # --- キャリブレーションワーカ停止 ---
+        worker = self._calib_worker
+        if worker:
+            if stream:
+                safe_disconnect(stream.frame_ready, worker.enqueue_frame)
+            safe_disconnect(worker.preview, self.preview)
+            self._retire(worker, worker.stopped)
+            self._calib_worker = None
+
+        self._device_id = None
+        self._device_key = None
+
+    def shutdown(self) -> None:
+        """待機中の PoseWorker も含め、全スレッドに停止を要求する（待たない）。"""
+        self.close()
+        idle = self._idle_pose_worker
+        if idle is not None:
+            self._retire(idle, idle.finished)
+            self._idle_pose_worker = None
+
+    def wait_stopped(self) -> None:
+        """停止要求済みのスレッドがすべて終わるまで待つ（アプリ終了時用）。"""
+        for thread in self._retiring:
+            thread.wait()
+        self._retiring.clear()
+
+    def start_pose(self, providers: list[str] | None = None) -> None:
+        """姿勢推定を開始する（起動済みなら何もしない）。共有スケジューラがあればそこへ登録する。"""
+        if self._stream is None or self._pose_worker is not None or self._device_id is None:
+            return
+        log_dir = self._pose_log_dir(self._device_id)
+        if self._scheduler is not None:
+            pworker: PoseWorker | InferenceChannel = self._scheduler.register(
+                self.cam_id, log_dir=log_dir, preview_size=self._preview_size,
+                publisher=self._publisher, slot=self.cam_id - 1,
+            )
+        elif self._idle_pose_worker is not None and self._idle_pose_worker.isRunning():
+            # --- 待機中のスレッドを読み込み済みセッションごと付け替える ---
+            pworker = self._idle_pose_worker
+            self._idle_pose_worker = None
+            pworker.reset(log_dir)
+            self.pose_ready.emit()
+        else:
+            self._idle_pose_worker = None
+            pworker = PoseWorker(
+                model_type=self._model_type, providers=providers, log_dir=log_dir, preview_size=self._preview_size,
+                publisher=self._publisher, slot=self.cam_id - 1, allocation=self._allocation,
+            )
+            pworker.ready.connect(self.pose_ready)
+            pworker.failed.connect(self.pose_failed)
+            pworker.start()
+        pworker.image_ready.connect(self.preview)
+        pworker.presence_changed.connect(self.presence_changed)
+        self._stream.frame_ready.connect(pworker.enqueue_frame)
+        self._pose_worker = pworker
+
+    # ===== キャリブレーション =====
+    def start_calibration(self) -> bool:
+        """キャリブレーションを開始する。開始できなければ False。"""
+        if self._device_id is None or self._calib_worker is not None:
+            return False
+
+        calib_worker = FrameCalibrator(
+            device_id=self._device_id, board=self._calib_board, preview_size=self._preview_size,
+        )
+        self._calib_worker = calib_worker
+
+        # --- プレビューをキャリブレーション画像へ切り替え ---
+        if self._stream:
+            self._stream.frame_ready.connect(calib_worker.enqueue_frame)
+            safe_disconnect(self._stream.image_ready, self.preview)
+        calib_worker.preview.connect(self.preview)
+
+        calib_worker.progress.connect(self.calib_progress)
+        calib_worker.capture_done.connect(self._on_capture_done)
+        calib_worker.finished.connect(self._on_calibration_finished)
+        calib_worker.failed.connect(self._on_calibration_failed)
+        calib_worker.start()
+        return True
+
+    def _on_capture_done(self) -> None:
+        """撮影終了時にプレビュー接続を戻す。"""
+        stream, worker = self._stream, self._calib_worker
+        if stream and worker:
+            safe_disconnect(stream.frame_ready, worker.enqueue_frame)
+            safe_disconnect(worker.preview, self.preview)
+            stream.image_ready.connect(self.preview)
+        self.calib_captured.emit()
+
+    def _on_calibration_finished(self, result: dict[str, object]) -> None:
+        """キャリブレーション完了時にワーカを片付けて通知する。"""
+        self._release_calib_worker()
+        self.calib_finished.emit(result)
+
+    def _on_calibration_failed(self, message: str) -> None:
+        """キャリブレーション失敗時にワーカを片付けて通知する。"""
+        self._release_calib_worker()
+        self.calib_failed.emit(message)
+
+    def _release_calib_worker(self) -> None:
+        """終了済みキャリブレーションワーカを破棄する。"""
+        worker = self._calib_worker
+        if worker:
+            worker.wait()
+        self._calib_worker = None
+
+    # ===== 内部ヘルパ =====
+    def _retire(self, thread: QThread, done: Signal) -> None:
+        """停止要求だけ出し、done（終了通知）を受けてから参照を手放す。"""
+        self._retiring.append(thread)
+        done.connect(self._reap)
+        if not thread.isRunning():   # 自ら終了済み（取得エラー等）や開始待ちのままなら通知は来ない
+            self._retiring.remove(thread)
+            return
+        thread.stop(wait=False)  # type: ignore[attr-defined]
+
+    def _reap(self) -> None:
+        """終了通知を送ってきたスレッドを片付ける。"""
+        thread = self.sender()
+        if thread in self._retiring:
+            thread.wait()  # type: ignore[attr-defined]  # run は抜けているので即座に戻る
+            self._retiring.remove(thread)  # type: ignore[arg-type]
+
+    def _start_deferred(self) -> None:
+        """同じデバイスの旧取得スレッドが終わったら、開始を待たせていた取得スレッドを開始する。"""
+        stream, self._deferred_stream = self._deferred_stream, None
+        if stream is not None and stream is self._stream:
+            stream.start()
+
+    def _pose_log_dir(self, device_id: int) -> Path | None:
+        """カメラ・起動時刻ごとの軌跡ログ保存先を返す（記録しないなら None）。"""
+        if self._log_root is None:
+            return None
+        return self._log_root / f"cam{device_id}" / time.strftime("%Y%m%d_%H%M%S")
+
+
+class CameraPipelineSet(QObject):
+    """実行時に台数を決める CameraPipeline の集合。"""
+
+    def __init__(
+        self,
+        count: int,
+        *,
+        fps: int = 15,
+        calib_board: str = "chessboard",
+        scheduler: InferenceScheduler | None = None,
+        publisher: KeypointPublisher | None = None,
+        budget: ThreadBudget | None = None,
+        log_root: Path | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """cam_id 1..count のスロットを生成する。scheduler を渡すと全スロットで推論を共有する。"""
+        # --- publisher: 各スロットの最新キーポイントを共有メモリへ（count 以上のスロットが必要） ---
+        # --- budget: cam_id-1 番の割り当てを各スロットの PoseWorker に使う ---
+        # --- log_root: 指定時のみ log_root/cam{device_id}/<起動時刻> へ軌跡を記録する ---
+        super().__init__(parent)
+        if count < 1:
+            raise ValueError("count must be >= 1")
+        self._scheduler: InferenceScheduler | None = scheduler
+        self._publisher: KeypointPublisher | None = publisher
+        self._pipelines: Dict[int, CameraPipeline] = {
+            cam_id: CameraPipeline(
+                cam_id, fps=fps, calib_board=calib_board, scheduler=scheduler, publisher=publisher,
+                allocation=budget.allocation(cam_id - 1) if budget is not None else None, log_root=log_root,
+                parent=self,
+            )
+            for cam_id in range(1, count + 1)
+        }
+
+    def __len__(self) -> int:
+        """スロット数を返す。"""
+        return len(self._pipelines)
+
+    def __iter__(self) -> Iterator[CameraPipeline]:
+        """cam_id 順に CameraPipeline を返す。"""
+        return iter(self._pipelines.values())
+
+    def __getitem__(self, cam_id: int) -> CameraPipeline:
+        """cam_id の CameraPipeline を返す。"""
+        return self._pipelines[cam_id]
+
+    @property
+    def cam_ids(self) -> List[int]:
+        """スロット番号一覧を返す。"""
+        return list(self._pipelines)
+
+    def owner_of(self, device_id: int) -> int | None:
+        """device_id を使用中のスロット番号を返す（未使用なら None）。"""
+        for pipeline in self._pipelines.values():
+            if pipeline.device_id == device_id:
+                return pipeline.cam_id
+        return None
+
+    def match_devices(self, device_keys: Sequence[str]) -> Dict[int, Optional[int]]:
+        """接続中デバイスの固有 ID 一覧から各スロットの新しい番号を求め、取得を向け直す。"""
+        # --- 戻り値は使用中スロットの cam_id → 新しい番号（見つからなければ None） ---
+        locations: Dict[int, Optional[int]] = {}
+        for pipeline in self._pipelines.values():
+            key = pipeline.device_key
+            if key is None:
+                if pipeline.device_id is not None:
+                    locations[pipeline.cam_id] = pipeline.device_id if pipeline.device_id < len(device_keys) else None
+                continue
+            # --- 見つからなければ休止して番号を手放し（重複判定から外す）、戻ってきたら向け直す ---
+            index = device_keys.index(key) if key in device_keys else None
+            if index is None:
+                pipeline.suspend()
+            else:
+                pipeline.relocate(index)
+            locations[pipeline.cam_id] = index
+        return locations
+
+    def close_all(self) -> None:
+        """全スロットと共有スケジューラを停止し、共有メモリを破棄する。"""
+        # --- 先に全スレッドへ停止を要求してからまとめて待つ ---
+        for pipeline in self._pipelines.values():
+            pipeline.shutdown()
+        for pipeline in self._pipelines.values():
+            pipeline.wait_stopped()
+        if self._scheduler is not None:
+            self._scheduler.stop()
+        # --- 書き込み側のスレッドが全て止まってから破棄する ---
+        if self._publisher is not None:
+            self._publisher.close()
+            self._publisher = None
@@ -1,3 +1,5 @@
 """pose サブパッケージの公開 API。"""
 from .pose_estimator import PoseEstimator  # re-export
-__all__ = ["PoseEstimator"]
+from .person_tracker import PersonTracker  # re-export
+from .trajectory_log import TrajectoryLog  # re-export
+__all__ = ["PoseEstimator", "PersonTracker", "TrajectoryLog"]
@@ -0,0 +1,64 @@
+# ===== インポート =====
+from __future__ import annotations
+from typing import Dict
+
+import cv2   as cv
+import numpy as np
+# ====
+
+# ===== 定数定義 =====
+THUMBNAIL_SIZE: int = 32   # 変化・動き判定に使う縮小グレー画像の一辺
+# ====
+
+
+def gray_thumbnail(frame_bgr: np.ndarray, size: int = THUMBNAIL_SIZE) -> np.ndarray:
+    """判定用の縮小グレー画像を返す（先に縮小してから色変換すると 1 フレーム数十 µs で済む）。"""
+    small = cv.resize(frame_bgr, (size, size), interpolation=cv.INTER_AREA)
+    return cv.cvtColor(small, cv.COLOR_BGR2GRAY)
+
+
+class ChangeDetector:
+    """縮小グレー画像を前回推論時と比べ、画面がほぼ静止していれば推論を省略させるクラス。"""
+
+    def __init__(self, *, size: int = THUMBNAIL_SIZE, threshold: float = 3.0, max_reuse: float = 0.5) -> None:
+        """サムネイル一辺の画素数、変化とみなす平均輝度差、結果を使い回す最大秒数を設定する。"""
+        self._size: int = size
+        self._threshold: float = threshold
+        self._max_reuse: float = max_reuse
+        self._reference: np.ndarray | None = None
+        self._reference_time: float = 0.0
+        self._candidate: np.ndarray | None = None
+        # --- 統計 ---
+        self.checked: int = 0
+        self.skipped: int = 0
+
+    def changed(self, frame_bgr: np.ndarray, timestamp: float, *, thumb: np.ndarray | None = None) -> bool:
+        """前回推論したフレームから十分変化したか（または再利用期限切れか）を返す。thumb は計算済みの縮小画像。"""
+        if thumb is None:
+            thumb = gray_thumbnail(frame_bgr, self._size)
+        self._candidate = thumb
+        self.checked += 1
+
+        if self._reference is None or timestamp - self._reference_time >= self._max_reuse:
+            return True
+        diff = float(cv.absdiff(thumb, self._reference).mean())
+        if diff >= self._threshold:
+            return True
+        self.skipped += 1
+        return False
+
+    def commit(self, timestamp: float, thumb: np.ndarray | None = None) -> None:
+        """推論したフレーム（thumb 省略時は直前に changed() へ渡したもの）を基準として記録する。"""
+        reference = thumb if thumb is not None else self._candidate
+        if reference is not None:
+            self._reference = reference
+            self._reference_time = timestamp
+
+    def reset(self) -> None:
+        """基準フレームを破棄し、次は必ず推論させる。"""
+        self._reference = None
+        self._candidate = None
+
+    def stats(self) -> Dict[str, int]:
+        """判定したフレーム数と推論を省略したフレーム数を返す。"""
+        return {"checked": self.checked, "skipped": self.skipped}
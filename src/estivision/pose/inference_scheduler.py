@@ -0,0 +1,274 @@
+# ===== インポート =====
+from __future__ import annotations
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy                as np
+from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtGui  import QImage
+
+from ..profiling      import name_thread, timed
+from ..thread_budget  import WorkerAllocation, enter_allocation
+from .change_detector import ChangeDetector
+from .pose_estimator  import PoseEstimator
+from .keypoint_shm    import KeypointPublisher
+from .low_light       import LowLightEnhancer
+from .pose_processor  import PoseProcessor
+from .presence_gate   import PresenceGate
+# ====
+
+# ===== 定数定義 =====
+POLICIES: Tuple[str, ...] = ("round_robin", "priority")
+# ====
+
+
+class InferenceChannel(QObject):
+    """スケジューラに登録されたカメラ 1 台分の入出力窓口（PoseWorker と同じ接続口を持つ）。"""
+
+    image_ready: Signal = Signal(QImage)     # GUI へ送る完成画像
+    presence_changed: Signal = Signal(bool)  # False: 人物不在で推論を間引き開始, True: 通常の推論へ復帰
+
+    def __init__(self, scheduler: "InferenceScheduler", cam_id: int) -> None:
+        """所属スケジューラとカメラ番号を保持する。"""
+        super().__init__()
+        self.cam_id: int = cam_id
+        self._scheduler: InferenceScheduler = scheduler
+        self._seq: int = 0
+
+    def enqueue_frame(self, frame_bgr: np.ndarray, timestamp: float | None = None, seq: int | None = None) -> None:
+        """CameraStream から受け取ったフレームをスケジューラへ渡す（最新 1 枚のみ保持）。"""
+        if timestamp is None:
+            timestamp = time.time()
+        if seq is None:
+            seq = self._seq
+        self._seq = seq + 1
+        self._scheduler.submit(self.cam_id, frame_bgr, timestamp, seq)
+
+
+class _CameraSlot:
+    """スケジューラ内部で保持するカメラごとの状態。"""
+
+    def __init__(self, channel: InferenceChannel, processor: PoseProcessor, priority: int) -> None:
+        """最新フレーム・統計値を初期化する。"""
+        self.channel: InferenceChannel = channel
+        self.processor: PoseProcessor = processor
+        self.priority: int = priority
+        self.pending: Optional[Tuple[np.ndarray, float, int]] = None
+        self.last_served: float = 0.0
+        self.opened: bool = False
+        # --- 統計 ---
+        self.served: int = 0
+        self.overwritten: int = 0
+        self.dropped_stale: int = 0
+
+
+class InferenceScheduler(QThread):
+    """全カメラのフレームを受け取り、1 つの推論セッションで公平に推論するスレッド。"""
+
+    failed: Signal = Signal(str)             # モデル読み込み失敗
+
+    def __init__(
+        self,
+        *,
+        model_type: str = "lightning",
+        providers: Optional[list[str]] = None,
+        policy: str = "round_robin",
+        max_age: float = 0.25,
+        max_batch: int = 4,
+        allocation: WorkerAllocation | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """スケジューリング方針を設定する（推論セッションは run() 内で生成する）。"""
+        super().__init__(parent)
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        self._model_type: str = model_type
+        self._providers: Optional[list[str]] = providers
+        self._allocation: WorkerAllocation | None = allocation
+        self._est: PoseEstimator | None = None
+        self._policy: str = policy
+        self._max_age: float = max_age
+        self._max_batch: int = max(1, max_batch)
+        self._slots: Dict[int, _CameraSlot] = {}
+        self._closing: List[PoseProcessor] = []
+        self._cond = threading.Condition()
+        self._running: bool = False
+
+    # ===== 登録／解除（GUI スレッド） =====
+    def register(
+        self,
+        cam_id: int,
+        *,
+        priority: int = 0,
+        thr: float = 0.2,
+        log_dir: Path | None = None,
+        skip_static: bool = True,
+        enhance_low_light: bool = True,
+        idle_when_absent: bool = True,
+        preview_size: int | None = None,
+        publisher: KeypointPublisher | None = None,
+        slot: int = 0,
+    ) -> InferenceChannel:
+        """カメラを登録して入出力窓口を返す。priority は priority 方針でのみ使う。"""
+        channel = InferenceChannel(self, cam_id)
+        processor = PoseProcessor(
+            thr=thr, log_dir=log_dir, change_detector=ChangeDetector() if skip_static else None,
+            preview_size=preview_size, publisher=publisher, slot=slot,
+            enhancer=LowLightEnhancer() if enhance_low_light else None,
+            presence_gate=PresenceGate() if idle_when_absent else None,
+        )
+        with self._cond:
+            old = self._slots.pop(cam_id, None)
+            if old is not None:
+                self._closing.append(old.processor)
+            self._slots[cam_id] = _CameraSlot(channel, processor, priority)
+            self._cond.notify()
+        return channel
+
+    def unregister(self, cam_id: int) -> None:
+        """カメラの登録を解除する（ログはスケジューラスレッドで閉じる）。"""
+        with self._cond:
+            slot = self._slots.pop(cam_id, None)
+            if slot is not None:
+                self._closing.append(slot.processor)
+                self._cond.notify()
+
+    # ===== フレーム受付（任意スレッド） =====
+    def submit(self, cam_id: int, frame: np.ndarray, timestamp: float, seq: int) -> None:
+        """カメラの最新フレームを差し替える。未処理の古いフレームは捨てる。"""
+        with self._cond:
+            slot = self._slots.get(cam_id)
+            if slot is None:
+                return
+            if slot.pending is not None:
+                slot.overwritten += 1
+            slot.pending = (frame, timestamp, seq)
+            self._cond.notify()
+
+    # ===== 統計 =====
+    def stats(self) -> Dict[int, Dict[str, float]]:
+        """カメラごとの処理数・上書き破棄数・期限切れ破棄数・静止による推論省略数・不在時の間引き・低照度補正の統計を返す。"""
+        with self._cond:
+            return {
+                cam_id: {
+                    "served": s.served,
+                    "overwritten": s.overwritten,
+                    "dropped_stale": s.dropped_stale,
+                    "skipped_static": s.processor.skip_stats().get("skipped", 0),
+                    **s.processor.presence_stats(),
+                    **s.processor.enhance_stats(),
+                }
+                for cam_id, s in self._slots.items()
+            }
+
+    # ===== スレッド本体 =====
+    def run(self) -> None:  # noqa: D401
+        """準備のできたカメラを方針に従って選び、まとめて推論する。"""
+        self._running = True
+        name_thread("InferenceScheduler")
+        enter_allocation(self._allocation)
+        try:
+            self._est = PoseEstimator(model_type=self._model_type, providers=self._providers, allocation=self._allocation)
+        except Exception as exc:
+            self._running = False
+            self.failed.emit(str(exc))
+            return
+        try:
+            while self._running:
+                batch = self._next_batch()
+                if not batch:
+                    continue
+
+                # --- MultiPose は 1 回で全員を推論済みなので、カメラごとに追跡しながら処理 ---
+                if self._est.multipose:  # type: ignore[union-attr]
+                    for slot, (frame, timestamp, seq) in batch:
+                        self._deliver(slot, slot.processor.process(frame, timestamp, seq))
+                    continue
+
+                # --- 静止・不在のカメラは前回結果を使い回し、残りだけまとめて推論 ---
+                infer = []
+                for slot, (frame, timestamp, seq) in batch:
+                    cached = slot.processor.reusable_result(frame, timestamp)
+                    if cached is not None:
+                        self._deliver(slot, slot.processor.finish(frame, timestamp, seq, *cached, reused=True))
+                    else:
+                        infer.append((slot, (frame, timestamp, seq)))
+                if not infer:
+                    continue
+
+                frames = [slot.processor.enhance(item[0]) for slot, item in infer]
+                with timed("estimate_batch"):
+                    results = self._est.estimate_batch(frames)  # type: ignore[union-attr]
+                for (slot, (frame, timestamp, seq)), (kps, scores) in zip(infer, results):
+                    slot.processor.remember(timestamp, kps, scores)
+                    self._deliver(slot, slot.processor.finish(frame, timestamp, seq, kps, scores))
+        finally:
+            with self._cond:
+                processors = [s.processor for s in self._slots.values()] + self._closing
+                self._closing = []
+            for processor in processors:
+                processor.close()
+
+    @staticmethod
+    def _deliver(slot: _CameraSlot, qimg: QImage) -> None:
+        """完成画像と、待機状態の変化があればそれをカメラの窓口から通知する。"""
+        slot.channel.image_ready.emit(qimg)
+        present = slot.processor.take_presence_change()
+        if present is not None:
+            slot.channel.presence_changed.emit(present)
+
+    def _next_batch(self) -> List[Tuple[_CameraSlot, Tuple[np.ndarray, float, int]]]:
+        """最新フレームを持つカメラから、期限切れを除いて今回処理する分を取り出す。"""
+        with self._cond:
+            if not any(s.pending is not None for s in self._slots.values()) and not self._closing:
+                self._cond.wait(timeout=0.1)
+            closing, self._closing = self._closing, []
+            now = time.time()
+
+            # --- 締切を過ぎたフレームは推論せず捨てる ---
+            ready: List[_CameraSlot] = []
+            for slot in self._slots.values():
+                if slot.pending is None:
+                    continue
+                if now - slot.pending[1] > self._max_age:
+                    slot.pending = None
+                    slot.dropped_stale += 1
+                    continue
+                ready.append(slot)
+
+            # --- 最後に処理されてから最も待っているカメラを優先（= ラウンドロビン） ---
+            if self._policy == "priority":
+                ready.sort(key=lambda s: (-s.priority, s.last_served))
+            else:
+                ready.sort(key=lambda s: s.last_served)
+
+            # --- 1 回の推論に複数カメラをまとめられない場合は 1 台ずつ ---
+            limit = self._max_batch if self._est is not None and self._est.batchable else 1
+            batch = []
+            for slot in ready[:limit]:
+                batch.append((slot, slot.pending))
+                slot.pending = None
+                slot.last_served = now
+                slot.served += 1
+            opening = [slot.processor for slot, _ in batch if not slot.opened]
+            for slot, _ in batch:
+                slot.opened = True
+
+        # --- ログの開閉はファイル I/O を伴うため、submit を止めないようロック外で行う ---
+        for processor in opening:
+            processor.estimator = self._est
+            processor.open()
+        for processor in closing:
+            processor.close()
+        return batch  # type: ignore[return-value]
+
+    # ===== 停止要求 =====
+    def stop(self) -> None:
+        """スレッドを停止する。"""
+        self._running = False
+        with self._cond:
+            self._cond.notify()
+        self.requestInterruption()
+        self.wait()
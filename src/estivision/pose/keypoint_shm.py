@@ -0,0 +1,172 @@
+# ===== インポート =====
+from __future__ import annotations
+import os
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+# ====
+
+# ===== 定数定義 =====
+DEFAULT_NAME: str = "estivision_keypoints"
+MAGIC: bytes = b"ESTK"
+VERSION: int = 2
+NUM_KEYPOINTS: int = 17
+
+# --- ヘッダ: magic(4s) version(u32) slots(u32) keypoints(u32) slot_size(u32) 書き手 PID(u32) 予約(8B) = 32B ---
+_HEADER = struct.Struct("<4sIIIII8x")
+
+# --- スロット: seqlock カウンタ(u64) フレーム連番(i64) 時刻(f64) keypoints(f32×17×2) scores(f32×17) ---
+SLOT_DTYPE = np.dtype([
+    ("counter", "<u8"),
+    ("seq", "<i8"),
+    ("timestamp", "<f8"),
+    ("keypoints", "<f4", (NUM_KEYPOINTS, 2)),
+    ("scores", "<f4", (NUM_KEYPOINTS,)),
+], align=True)
+# ====
+
+
+def _slots_view(buf: memoryview, slots: int) -> np.ndarray:
+    """共有メモリ上のスロット配列をコピーせずに参照する。"""
+    return np.ndarray((slots,), SLOT_DTYPE, buffer=buf, offset=_HEADER.size)
+
+
+def _pid_alive(pid: int) -> bool:
+    """pid のプロセスが生きているかを返す。"""
+    if sys.platform == "win32":
+        return True   # Windows の共有メモリは全ハンドルが閉じると消えるため、残っていれば書き手は生きている
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True   # 他ユーザのプロセス
+    return True
+
+
+def _reclaim_if_stale(name: str) -> None:
+    """name の共有メモリが異常終了した書き手の残骸なら削除する。使用中なら FileExistsError。"""
+    existing = shared_memory.SharedMemory(name=name)
+    try:
+        magic, _, _, _, _, pid = _HEADER.unpack_from(existing.buf, 0)
+    except struct.error:
+        magic, pid = b"", 0
+    # --- 自分のレイアウトで、書き手がもういない場合だけ作り直す（他アプリの同名領域には触れない） ---
+    stale = magic == MAGIC and pid != 0 and not _pid_alive(pid)
+    if not stale and pid != os.getpid() and sys.platform != "win32":
+        # --- 確認のために開いただけなので、終了時に resource_tracker が消さないよう登録を外す（同一プロセスの書き手の登録は残す） ---
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(existing._name, "shared_memory")  # type: ignore[attr-defined]
+    existing.close()
+    if not stale:
+        owner = f"PID {pid}" if magic == MAGIC else "別のアプリケーション"
+        raise FileExistsError(f"共有メモリ '{name}' は {owner} が使用中です。")
+    existing.unlink()
+
+
+class KeypointPublisher:
+    """カメラごとの最新キーポイントを固定レイアウトの共有メモリへ書き込むクラス（seqlock 方式）。"""
+
+    def __init__(self, slots: int = 4, *, name: str = DEFAULT_NAME) -> None:
+        """スロット数分の共有メモリを作成する（異常終了した書き手の残骸だけ作り直し、使用中なら FileExistsError）。"""
+        size = _HEADER.size + SLOT_DTYPE.itemsize * slots
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            _reclaim_if_stale(name)
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        _HEADER.pack_into(
+            self._shm.buf, 0, MAGIC, VERSION, slots, NUM_KEYPOINTS, SLOT_DTYPE.itemsize, os.getpid(),
+        )
+        self._slots: np.ndarray = _slots_view(self._shm.buf, slots)
+        self._slots[:] = np.zeros((), SLOT_DTYPE)
+        self._slots["seq"] = -1
+
+    @property
+    def name(self) -> str:
+        """共有メモリ名を返す。"""
+        return self._shm.name
+
+    def publish(self, slot: int, timestamp: float, seq: int, kps: np.ndarray, scores: np.ndarray) -> None:
+        """slot に最新の結果を書き込む（奇数カウンタの間は書き込み中）。"""
+        # --- ロックを取らないため読み手が何人いても待たされない（1 スロットは 1 スレッドからのみ書くこと） ---
+        rec = self._slots[slot:slot + 1]
+        counter = int(rec["counter"][0])
+        rec["counter"] = counter + 1
+        rec["seq"] = seq
+        rec["timestamp"] = timestamp
+        rec["keypoints"][0] = kps
+        rec["scores"][0] = scores
+        rec["counter"] = counter + 2
+
+    def close(self) -> None:
+        """共有メモリを破棄する。"""
+        self._slots = None  # type: ignore[assignment]
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class KeypointReader:
+    """KeypointPublisher が書いた共有メモリを別プロセスからポーリングするクラス。"""
+
+    def __init__(self, *, name: str = DEFAULT_NAME) -> None:
+        """既存の共有メモリへ接続し、レイアウトを検証する。"""
+        self._shm = shared_memory.SharedMemory(name=name)
+        # --- POSIX では接続側の終了時に resource_tracker が共有メモリを消してしまうため登録を外す ---
+        if sys.platform != "win32":
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self._shm._name, "shared_memory")  # type: ignore[attr-defined]
+
+        magic, version, slots, keypoints, slot_size, _ = _HEADER.unpack_from(self._shm.buf, 0)
+        if magic != MAGIC or version != VERSION or keypoints != NUM_KEYPOINTS or slot_size != SLOT_DTYPE.itemsize:
+            self._shm.close()
+            raise ValueError(f"共有メモリ '{name}' のレイアウトが一致しません。")
+        self.slots: int = slots
+        self._view: np.ndarray = _slots_view(self._shm.buf, slots)
+        self._scratch: np.ndarray = np.zeros((), SLOT_DTYPE)
+
+    def counter(self, slot: int) -> int:
+        """slot の更新カウンタを返す（変化していれば新しい結果がある）。"""
+        return int(self._view[slot]["counter"])
+
+    def read(self, slot: int, *, retries: int = 100) -> Optional[Dict[str, object]]:
+        """slot の一貫した最新結果を返す。未書き込みなら None（配列は次の read で上書きされる作業領域）。"""
+        for _ in range(retries):
+            before = int(self._view[slot]["counter"])
+            if before & 1:
+                time.sleep(0)   # 書き込み中（数 µs）なので譲って再試行
+                continue
+            self._scratch[...] = self._view[slot]
+            if int(self._view[slot]["counter"]) == before:
+                if before == 0:
+                    return None
+                rec = self._scratch
+                return {
+                    "counter": before,
+                    "seq": int(rec["seq"]),
+                    "timestamp": float(rec["timestamp"]),
+                    "keypoints": rec["keypoints"],
+                    "scores": rec["scores"],
+                }
+        return None
+
+    def close(self) -> None:
+        """接続を閉じる（共有メモリ自体は残す）。"""
+        self._view = None  # type: ignore[assignment]
+        self._shm.close()
+
+    def __enter__(self) -> "KeypointReader":
+        """with 文で使えるよう自身を返す。"""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """with 文を抜けるときに接続を閉じる。"""
+        self.close()
@@ -0,0 +1,106 @@
+# ===== インポート =====
+from __future__ import annotations
+import time
+from typing import Dict
+
+import cv2   as cv
+import numpy as np
+# ====
+
+
+class LowLightEnhancer:
+    """縮小画像で明るさ・コントラストを測り、暗い／コントラストの低いフレームだけを推論前に補正するクラス。"""
+
+    def __init__(
+        self,
+        *,
+        size: int = 64,
+        dark_mean: float = 70.0,
+        target_mean: float = 110.0,
+        low_contrast: float = 25.0,
+        clahe_clip: float = 2.0,
+        clahe_tiles: int = 8,
+        smoothing: float = 0.3,
+    ) -> None:
+        """判定に使うサムネイル一辺、暗いとみなす平均輝度と補正後の目標、低コントラストとみなす標準偏差を設定する。"""
+        self._size: int = size
+        self._dark_mean: float = dark_mean
+        self._target_mean: float = target_mean
+        self._low_contrast: float = low_contrast
+        self._smoothing: float = smoothing
+        self._mean: float | None = None     # 平滑化した平均輝度（ガンマのちらつき防止）
+        # --- ガンマは 0.05 刻みに丸めて LUT を使い回す ---
+        self._luts: Dict[int, np.ndarray] = {}
+        self._clahe: cv.CLAHE = cv.createCLAHE(clipLimit=clahe_clip, tileGridSize=(clahe_tiles, clahe_tiles))
+        # --- 直近の判定と統計 ---
+        self.last: Dict[str, float | str] = {"action": "none", "mean": 0.0, "contrast": 0.0, "gamma": 1.0, "cost_ms": 0.0}
+        self.frames: int = 0
+        self.gamma_frames: int = 0
+        self.clahe_frames: int = 0
+        self.cost: float = 0.0
+
+    def apply(self, frame_bgr: np.ndarray) -> np.ndarray:
+        """必要なら補正した新しい画像を、不要なら frame_bgr 自身を返す。"""
+        start = time.perf_counter()
+        # --- 明るさの統計には間引きで十分（INTER_AREA より 1 桁以上速い） ---
+        small = cv.resize(frame_bgr, (self._size, self._size), interpolation=cv.INTER_NEAREST)
+        thumb = cv.cvtColor(small, cv.COLOR_BGR2GRAY)
+        mean, std = cv.meanStdDev(thumb)
+        mean, contrast = float(mean[0, 0]), float(std[0, 0])
+        self._mean = mean if self._mean is None else self._mean + self._smoothing * (mean - self._mean)
+        self.frames += 1
+
+        # --- 暗さ → ガンマ（LUT）、薄暗くコントラスト不足 → 輝度への CLAHE ---
+        gamma = self._gamma(self._mean) if self._mean < self._dark_mean else 1.0
+        actions = []
+        out = frame_bgr
+        if gamma != 1.0:
+            out = cv.LUT(out, self._lut(gamma))
+            actions.append("gamma")
+            self.gamma_frames += 1
+        if contrast < self._low_contrast and self._mean < self._target_mean:   # 明るい無地の壁などは対象外
+            ycrcb = cv.cvtColor(out, cv.COLOR_BGR2YCrCb)
+            ycrcb[:, :, 0] = self._clahe.apply(ycrcb[:, :, 0])
+            out = cv.cvtColor(ycrcb, cv.COLOR_YCrCb2BGR)
+            actions.append("clahe")
+            self.clahe_frames += 1
+
+        elapsed = time.perf_counter() - start
+        self.cost += elapsed
+        self.last = {
+            "action": "+".join(actions) or "none",
+            "mean": mean,
+            "contrast": contrast,
+            "gamma": gamma,
+            "cost_ms": elapsed * 1000,
+        }
+        return out
+
+    def reset(self) -> None:
+        """平滑化した明るさを破棄する（カメラ切替時など）。"""
+        self._mean = None
+
+    def stats(self) -> Dict[str, float]:
+        """判定したフレーム数、補正の種類ごとの回数、補正段の累計時間 [ms] を返す。"""
+        return {
+            "enhance_frames": self.frames,
+            "enhance_gamma": self.gamma_frames,
+            "enhance_clahe": self.clahe_frames,
+            "enhance_ms": self.cost * 1000,
+        }
+
+    # ===== 内部ヘルパ =====
+    def _gamma(self, mean: float) -> float:
+        """平均輝度を目標へ持ち上げるガンマ値を 0.05 刻みで返す（1 未満で明るくなる）。"""
+        mean = min(max(mean, 1.0), 254.0)
+        gamma = np.log(self._target_mean / 255.0) / np.log(mean / 255.0)
+        return round(min(max(gamma, 0.3), 1.0) * 20) / 20
+
+    def _lut(self, gamma: float) -> np.ndarray:
+        """ガンマ値に対応する 256 段の LUT を返す（初回のみ生成）。"""
+        key = int(round(gamma * 20))
+        lut = self._luts.get(key)
+        if lut is None:
+            lut = np.clip(((np.arange(256) / 255.0) ** gamma) * 255.0 + 0.5, 0, 255).astype(np.uint8)
+            self._luts[key] = lut
+        return lut
@@ -0,0 +1,44 @@
+# ===== インポート =====
+from __future__ import annotations
+import time
+from typing import Optional
+
+from PySide6.QtCore import QThread, Signal, QObject
+
+from ..thread_budget import WorkerAllocation, enter_allocation
+# ====
+
+
+class ModelPreloader(QThread):
+    """推論セッションをバックグラウンドで読み込み、ダミー入力でウォームアップするスレッド。"""
+
+    loaded: Signal = Signal(float)   # 読み込み＋ウォームアップに要した秒数
+    failed: Signal = Signal(str)     # 失敗メッセージ
+
+    def __init__(
+        self,
+        *,
+        model_type: str = "lightning",
+        providers: Optional[list[str]] = None,
+        allocation: WorkerAllocation | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """読み込むモデル種別とプロバイダ、最初の推論スレッドと同じ割り当てを保持する。"""
+        super().__init__(parent)
+        self._model_type: str = model_type
+        self._providers: Optional[list[str]] = providers
+        self._allocation: WorkerAllocation | None = allocation
+
+    def run(self) -> None:  # noqa: D401
+        """セッションを共有キャッシュへ読み込み、1 回推論しておく。"""
+        start = time.perf_counter()
+        enter_allocation(self._allocation)
+        try:
+            # --- onnxruntime の import もこのスレッドで行う ---
+            from .pose_estimator import PoseEstimator
+            estimator = PoseEstimator(model_type=self._model_type, providers=self._providers, allocation=self._allocation)
+            estimator.warm_up()
+        except Exception as exc:  # モデル未配置なども GUI へ通知するだけにする
+            self.failed.emit(str(exc))
+            return
+        self.loaded.emit(time.perf_counter() - start)
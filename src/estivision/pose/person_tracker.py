@@ -0,0 +1,142 @@
+# ===== インポート =====
+from __future__ import annotations
+from typing import List
+
+import numpy as np
+# ====
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(T,4) と (P,4) の xyxy ボックス間の IoU 行列 (T,P) を返す。"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def keypoint_distance(
+    kps_a: np.ndarray,
+    scores_a: np.ndarray,
+    kps_b: np.ndarray,
+    scores_b: np.ndarray,
+    scale: np.ndarray,
+    thr: float,
+) -> np.ndarray:
+    """双方で信頼度が thr を超える関節の平均距離を scale で正規化した (T,P) 行列を返す。"""
+    diff = kps_a[:, None].astype(np.float32) - kps_b[None].astype(np.float32)  # (T,P,17,2)
+    dist = np.linalg.norm(diff, axis=-1)                                        # (T,P,17)
+    valid = (scores_a[:, None] > thr) & (scores_b[None] > thr)
+    count = valid.sum(axis=-1)
+    mean = np.where(count > 0, (dist * valid).sum(axis=-1) / np.maximum(count, 1), np.inf)
+    return mean / np.maximum(scale[:, None], 1e-6)
+
+
+class PersonTracker:
+    """IoU とキーポイント距離でフレーム間の人物を対応付け、安定した ID を振るトラッカー。"""
+
+    def __init__(
+        self,
+        *,
+        max_age: int = 15,
+        max_cost: float = 0.8,
+        iou_weight: float = 0.5,
+        kp_thr: float = 0.2,
+    ) -> None:
+        """見失ってから破棄するまでのフレーム数や対応付けの許容コストを設定する。"""
+        self._max_age: int = max_age
+        self._max_cost: float = max_cost
+        self._iou_weight: float = iou_weight
+        self._kp_thr: float = kp_thr
+        self._next_id: int = 1
+        self._target_id: int | None = None
+
+        # --- トラック状態（列指向で保持） ---
+        self._ids = np.zeros(0, np.int64)
+        self._boxes = np.zeros((0, 4), np.float32)
+        self._kps = np.zeros((0, 17, 2), np.float32)
+        self._scores = np.zeros((0, 17), np.float32)
+        self._age = np.zeros(0, np.int64)
+
+    # ===== 追跡対象 =====
+    @property
+    def target_id(self) -> int | None:
+        """追従中の人物 ID を返す。"""
+        return self._target_id
+
+    def select(self, person_id: int | None) -> None:
+        """追従する人物 ID を指定する（None で自動選択に戻す）。"""
+        self._target_id = person_id
+
+    @property
+    def track_ids(self) -> List[int]:
+        """現在保持しているトラック ID 一覧を返す。"""
+        return [int(i) for i in self._ids]
+
+    # ===== 更新 =====
+    def update(
+        self,
+        kps: np.ndarray,
+        scores: np.ndarray,
+        boxes: np.ndarray,
+        person_scores: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """今フレームの検出 (P 人) に ID を割り当てて (P,) 配列で返す。"""
+        n_det = len(boxes)
+        ids = np.zeros(n_det, np.int64)
+        matched_tracks = np.zeros(len(self._ids), bool)
+        matched_dets = np.zeros(n_det, bool)
+
+        # --- コスト行列 (T,P) を一括計算し、小さい順に貪欲に対応付け ---
+        if len(self._ids) and n_det:
+            iou = box_iou(self._boxes, boxes.astype(np.float32))
+            diag = np.hypot(self._boxes[:, 2] - self._boxes[:, 0], self._boxes[:, 3] - self._boxes[:, 1])
+            kd = keypoint_distance(self._kps, self._scores, kps, scores, diag, self._kp_thr)
+            cost = self._iou_weight * (1.0 - iou) + (1.0 - self._iou_weight) * np.minimum(kd, 1.0)
+            for flat in np.argsort(cost, axis=None):
+                t, d = divmod(int(flat), n_det)
+                if cost[t, d] > self._max_cost:
+                    break
+                if matched_tracks[t] or matched_dets[d]:
+                    continue
+                matched_tracks[t] = matched_dets[d] = True
+                ids[d] = self._ids[t]
+                self._boxes[t] = boxes[d]
+                self._kps[t] = kps[d]
+                self._scores[t] = scores[d]
+                self._age[t] = 0
+
+        # --- 未対応トラックは年齢を進め、古いものを破棄 ---
+        self._age[~matched_tracks] += 1
+        alive = self._age <= self._max_age
+        self._ids, self._boxes = self._ids[alive], self._boxes[alive]
+        self._kps, self._scores, self._age = self._kps[alive], self._scores[alive], self._age[alive]
+
+        # --- 未対応の検出は新規トラック ---
+        new = np.flatnonzero(~matched_dets)
+        if new.size:
+            new_ids = np.arange(self._next_id, self._next_id + new.size)
+            self._next_id += new.size
+            ids[new] = new_ids
+            self._ids = np.concatenate([self._ids, new_ids])
+            self._boxes = np.concatenate([self._boxes, boxes[new].astype(np.float32)])
+            self._kps = np.concatenate([self._kps, kps[new].astype(np.float32)])
+            self._scores = np.concatenate([self._scores, scores[new].astype(np.float32)])
+            self._age = np.concatenate([self._age, np.zeros(new.size, np.int64)])
+
+        # --- 追従対象が消えたら最も大きく写っている人物へ切り替え ---
+        if self._target_id is None or self._target_id not in self._ids:
+            self._target_id = None
+            if n_det:
+                area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+                self._target_id = int(ids[int(np.argmax(area))])
+        return ids
+
+    def target_index(self, ids: np.ndarray) -> int | None:
+        """update の戻り値から追従対象の検出インデックスを返す（今フレームに居なければ None）。"""
+        hits = np.flatnonzero(ids == self._target_id)
+        return int(hits[0]) if hits.size else None
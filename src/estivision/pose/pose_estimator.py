@@ -1,12 +1,19 @@
 # ===== インポート =====
 # --- 標準ライブラリ ---
+from __future__ import annotations
+import threading
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
 
 # --- 外部ライブラリ ---
 import cv2 as cv
 import numpy as np
-import onnxruntime as ort
+
+# --- 自作モジュール ---
+from ..thread_budget import WorkerAllocation
+
+if TYPE_CHECKING:  # onnxruntime は読み込みが重いため実際の import はセッション生成時まで遅らせる
+    import onnxruntime as ort
 # ====
 
 # ===== 定数定義 =====
@@ -18,14 +25,76 @@ _KEYPOINT_NAMES: Tuple[str, ...] = (
 )
 
 _MODEL_INFO = {
-    "lightning": {"file": "movenet_singlepose_lightning_v4.onnx", "input_size": 192},
-    "thunder":   {"file": "movenet_singlepose_thunder_v4.onnx",   "input_size": 256},
+    "lightning": {"file": "movenet_singlepose_lightning_v4.onnx", "input_size": 192, "multipose": False},
+    "thunder":   {"file": "movenet_singlepose_thunder_v4.onnx",   "input_size": 256, "multipose": False},
+    # --- MultiPose: 出力 (1,6,56) = 最大 6 人 × (17×(y,x,score) + bbox(ymin,xmin,ymax,xmax,score)) ---
+    "multipose": {"file": "movenet_multipose_lightning_v1.onnx",  "input_size": 256, "multipose": True},
 }
+
+_DEFAULT_PROVIDERS: Tuple[str, ...] = (
+    "CUDAExecutionProvider",      # NVIDIA GPU
+    "DirectMLExecutionProvider",  # AMD / Intel GPU
+    "CPUExecutionProvider",
+)
 # ====
 
+# ===== セッションキャッシュ =====
+_SESSION_CACHE: Dict[Tuple[str, Tuple[str, ...], WorkerAllocation | None], "ort.InferenceSession"] = {}
+_SESSION_LOCK = threading.Lock()
+
+
+def load_session(
+    model_path: Path,
+    providers: Sequence[str],
+    allocation: WorkerAllocation | None = None,
+) -> "ort.InferenceSession":
+    """同じモデル・プロバイダ・割り当ての InferenceSession を使い回して返す（初回のみ読み込む）。"""
+    # --- allocation を渡すとスレッド数を制限したワーカー専用のセッションになる（スレッドプールを共有しない） ---
+    key = (model_path.resolve().as_posix(), tuple(providers), allocation)
+    with _SESSION_LOCK:
+        session = _SESSION_CACHE.get(key)
+        if session is None:
+            import onnxruntime as ort
+            options = ort.SessionOptions()
+            if allocation is not None:
+                options.intra_op_num_threads = allocation.intra_op_threads
+                options.inter_op_num_threads = 1
+                options.add_session_config_entry("session.intra_op.allow_spinning", "1" if allocation.spin else "0")
+            session = ort.InferenceSession(model_path.as_posix(), sess_options=options, providers=list(providers))
+            _SESSION_CACHE[key] = session
+    return session
+# ====
+
+
+def model_input_size(model_type: str) -> int:
+    """モデル種別の入力一辺の画素数を返す（セッションは読み込まない）。"""
+    return int(_MODEL_INFO[model_type]["input_size"])
+
+
+def decode_multipose(
+    raw: np.ndarray,
+    orig_w: int,
+    orig_h: int,
+    min_score: float = 0.2,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """MultiPose の (6,56) 出力を一括で画素座標へ変換し、人物スコアで絞り込む。"""
+    raw = raw.reshape(-1, 56)
+    keep = raw[:, 55] >= min_score
+    raw = raw[keep]
+
+    # --- キーポイント (P,17,3) → (x, y) 画素座標とスコア ---
+    kps = raw[:, :51].reshape(-1, 17, 3)
+    scale = np.array([orig_w, orig_h], np.float32)
+    keypoints_px = (kps[:, :, 1::-1] * scale).astype(np.int32)  # (y,x) → (x,y)
+    scores = kps[:, :, 2]
+
+    # --- bbox (ymin,xmin,ymax,xmax) → (x1,y1,x2,y2) 画素座標 ---
+    boxes = raw[:, [52, 51, 54, 53]] * np.tile(scale, 2)
+    return keypoints_px, scores, boxes.astype(np.float32), raw[:, 55]
+
 
 class PoseEstimator:
-    """MoveNet で単一人物姿勢推定を行うラッパークラス。"""
+    """MoveNet で姿勢推定を行うラッパークラス（MultiPose モデルでは複数人物）。"""
 
     # --- サポートされるモデルタイプ ---
     SUPPORTED_MODELS: Tuple[str, ...] = tuple(_MODEL_INFO.keys())
@@ -36,8 +105,9 @@ class PoseEstimator:
         *,
         model_dir: Path | None = None,
         providers: List[str] | None = None,
+        allocation: WorkerAllocation | None = None,
     ) -> None:
-        """モデルを読み込み、推論セッションを初期化。"""
+        """モデルを読み込み、推論セッションを初期化（allocation でスレッド数を制限）。"""
         if model_type not in self.SUPPORTED_MODELS:
             raise ValueError(f"model_type must be one of {self.SUPPORTED_MODELS}")
 
@@ -53,34 +123,29 @@ class PoseEstimator:
         # --- ONNX Runtime プロバイダ設定 ---
         if providers is None:
             # Radeon 環境など GPU が使えない場合を考慮し CPU を最後にフォールバック
-            providers = [
-                "CUDAExecutionProvider",      # NVIDIA GPU
-                "DirectMLExecutionProvider",  # AMD / Intel GPU
-                "CPUExecutionProvider",
-            ]
+            providers = list(_DEFAULT_PROVIDERS)
 
         self._input_size: int = _MODEL_INFO[model_type]["input_size"]
-        self._session: ort.InferenceSession = ort.InferenceSession(
-            model_path.as_posix(),
-            providers=providers,
-        )
+        self._multipose: bool = bool(_MODEL_INFO[model_type]["multipose"])
+        self._session: ort.InferenceSession = load_session(model_path, providers, allocation)
         self._input_name: str = self._session.get_inputs()[0].name
         self._output_name: str = self._session.get_outputs()[0].name
+        # --- 入力のバッチ次元が固定 1 でなければ複数枚を 1 回の run にまとめられる ---
+        self._batchable: bool = not isinstance(self._session.get_inputs()[0].shape[0], int) \
+            or self._session.get_inputs()[0].shape[0] != 1
+        # --- IOBinding 用バッファ（estimate_bound の初回呼び出しで確保） ---
+        self._binding: ort.IOBinding | None = None
 
     def estimate(self, image_bgr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        """1 枚の BGR 画像から 17 点の (x, y) と score を返す。"""
+        """1 枚の BGR 画像から 17 点の (x, y) と score を返す（MultiPose では最も確からしい 1 人）。"""
         orig_h, orig_w = image_bgr.shape[:2]
-
-        # --- 画像処理 ---
-        img = cv.GaussianBlur(image_bgr, (3, 3), 0)
-        yuv = cv.cvtColor(img, cv.COLOR_BGR2YUV)
-        yuv[:, :, 0] = cv.equalizeHist(yuv[:, :, 0])
-        img = cv.cvtColor(yuv, cv.COLOR_YUV2BGR)
+        if self._multipose:
+            kps_all, scores_all, _, person_scores = self.estimate_multi(image_bgr, min_score=0.0)
+            best = int(np.argmax(person_scores))
+            return kps_all[best], scores_all[best]
 
         # --- 前処理 ---
-        input_tensor = cv.resize(image_bgr, (self._input_size, self._input_size))
-        input_tensor = cv.cvtColor(input_tensor, cv.COLOR_BGR2RGB)
-        input_tensor = input_tensor.astype(np.int32)[None, ...]  # shape: (1,H,W,3)
+        input_tensor = self._preprocess(image_bgr)
 
         # --- 推論 ---
         outputs = self._session.run(
@@ -89,6 +154,109 @@ class PoseEstimator:
         )[0]  # shape: (1,1,17,3)
         kps_scores = np.squeeze(outputs)  # shape: (17,3)
 
+        return self._postprocess(kps_scores, orig_w, orig_h)
+
+    def estimate_bound(self, image_bgr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """IOBinding で確保済みバッファに直接推論する（毎フレームの配列確保なし）。"""
+        # --- 戻り値は使い回し配列のビューで、次の estimate_bound で上書きされる。保持するならコピーすること ---
+        if self._multipose:
+            return self.estimate(image_bgr)
+        if self._binding is None:
+            self._bind()
+        orig_h, orig_w = image_bgr.shape[:2]
+
+        # --- 前処理：縮小 → BGR→RGB と int32 化を 1 回のコピーで入力 OrtValue へ書き込む ---
+        cv.resize(image_bgr, (self._input_size, self._input_size), dst=self._resized)
+        np.copyto(self._input_buf[0], self._resized[:, :, ::-1])
+
+        # --- 推論（出力は (1,1,17,3) の確保済みバッファへ） ---
+        self._session.run_with_iobinding(self._binding)
+
+        # --- 後処理：(y,x) → (x,y) 画素座標を確保済み配列へ ---
+        kps_scores = self._output_buf[0, 0]
+        self._scale[0], self._scale[1] = orig_w, orig_h
+        np.multiply(kps_scores[:, 1::-1], self._scale, out=self._kps_f)
+        np.copyto(self._kps_px, self._kps_f, casting="unsafe")
+        return self._kps_px, kps_scores[:, 2]
+
+    def estimate_multi(
+        self,
+        image_bgr: np.ndarray,
+        min_score: float = 0.2,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """MultiPose モデルで (P,17,2) 座標・(P,17) スコア・(P,4) bbox・(P,) 人物スコアを返す。"""
+        if not self._multipose:
+            kps, scores = self.estimate(image_bgr)
+            h, w = image_bgr.shape[:2]
+            box = np.array([[0, 0, w, h]], np.float32)
+            return kps[None], scores[None], box, np.array([float(np.mean(scores))], np.float32)
+
+        orig_h, orig_w = image_bgr.shape[:2]
+        outputs = self._session.run(
+            [self._output_name],
+            {self._input_name: self._preprocess(image_bgr)},
+        )[0]  # shape: (1,6,56)
+        return decode_multipose(outputs[0], orig_w, orig_h, min_score)
+
+    def estimate_batch(self, images_bgr: Sequence[np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """複数の BGR 画像を推論する。モデルが対応していれば 1 回の run にまとめる。"""
+        if self._multipose or not self._batchable or len(images_bgr) <= 1:
+            return [self.estimate(img) for img in images_bgr]
+
+        batch = np.concatenate([self._preprocess(img) for img in images_bgr], axis=0)
+        outputs = self._session.run(
+            [self._output_name],
+            {self._input_name: batch},
+        )[0]  # shape: (B,1,17,3)
+        return [
+            self._postprocess(outputs[i].reshape(17, 3), img.shape[1], img.shape[0])
+            for i, img in enumerate(images_bgr)
+        ]
+
+    def warm_up(self) -> None:
+        """ダミー入力で 1 回推論し、初回推論時のメモリ確保や最適化を済ませておく。"""
+        dummy = np.zeros((1, self._input_size, self._input_size, 3), np.int32)
+        self._session.run([self._output_name], {self._input_name: dummy})
+
+    @property
+    def multipose(self) -> bool:
+        """複数人物モデルかを返す。"""
+        return self._multipose
+
+    @property
+    def batchable(self) -> bool:
+        """複数画像を 1 回の推論にまとめられるかを返す。"""
+        return self._batchable
+
+    # ===== 内部ヘルパ =====
+    def _bind(self) -> None:
+        """入出力バッファを確保し、コピーなしで参照する OrtValue としてセッションへ結び付ける。"""
+        import onnxruntime as ort
+        size = self._input_size
+        self._resized: np.ndarray = np.empty((size, size, 3), np.uint8)
+        self._input_buf: np.ndarray = np.zeros((1, size, size, 3), np.int32)
+        self._output_buf: np.ndarray = np.zeros((1, 1, 17, 3), np.float32)
+        self._scale: np.ndarray = np.ones(2, np.float32)
+        self._kps_f: np.ndarray = np.empty((17, 2), np.float32)
+        self._kps_px: np.ndarray = np.empty((17, 2), np.int32)
+
+        # --- CPU の OrtValue は numpy のメモリをそのまま使う（OrtValue 側で配列を参照保持） ---
+        self._input_value = ort.OrtValue.ortvalue_from_numpy(self._input_buf)
+        self._output_value = ort.OrtValue.ortvalue_from_numpy(self._output_buf)
+        binding = self._session.io_binding()
+        binding.bind_ortvalue_input(self._input_name, self._input_value)
+        binding.bind_ortvalue_output(self._output_name, self._output_value)
+        self._binding = binding
+
+    def _preprocess(self, image_bgr: np.ndarray) -> np.ndarray:
+        """BGR 画像をモデル入力 (1,H,W,3) int32 に変換する。"""
+        input_tensor = cv.resize(image_bgr, (self._input_size, self._input_size))
+        input_tensor = cv.cvtColor(input_tensor, cv.COLOR_BGR2RGB)
+        return input_tensor.astype(np.int32)[None, ...]  # shape: (1,H,W,3)
+
+    @staticmethod
+    def _postprocess(kps_scores: np.ndarray, orig_w: int, orig_h: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(17,3) の正規化出力を元解像度の画素座標とスコアに変換する。"""
         # --- 後処理：元解像度へ座標スケールバック ---
         keypoints_px = np.stack(
             [
@@ -0,0 +1,76 @@
+# ===== インポート =====
+from __future__ import annotations
+from typing import Dict, Tuple
+
+import numpy as np
+# ====
+
+# ===== 定数定義 =====
+# --- COCO keypoints の関節ごとのばらつき σ（MoveNet と同じ 17 点の並び） ---
+COCO_SIGMAS: np.ndarray = np.array([
+    0.026, 0.025, 0.025, 0.035, 0.035, 0.079, 0.079, 0.072, 0.072,
+    0.062, 0.062, 0.107, 0.107, 0.087, 0.087, 0.089, 0.089,
+], np.float64)
+# ====
+
+
+def keypoint_oks(pred: np.ndarray, gt: np.ndarray, area: np.ndarray) -> np.ndarray:
+    """(N,17,2) の予測と正解から関節ごとの OKS (N,17) を返す。area は人物領域の面積 (N,)。"""
+    d2 = np.sum((pred.astype(np.float64) - gt) ** 2, axis=-1)
+    variances = (2 * COCO_SIGMAS) ** 2
+    return np.exp(-d2 / (2 * variances[None, :] * (np.asarray(area, np.float64)[:, None] + np.spacing(1))))
+
+
+def keypoint_pck(pred: np.ndarray, gt: np.ndarray, ref_length: np.ndarray, alpha: float = 0.2) -> np.ndarray:
+    """関節ごとに誤差が alpha × 基準長以内なら True の (N,17) を返す。"""
+    dist = np.linalg.norm(pred.astype(np.float64) - gt, axis=-1)
+    return dist <= alpha * np.asarray(ref_length, np.float64)[:, None]
+
+
+def summarize(
+    pred: np.ndarray,
+    gt: np.ndarray,
+    visible: np.ndarray,
+    area: np.ndarray,
+    ref_length: np.ndarray,
+    alpha: float = 0.2,
+) -> Dict[str, np.ndarray | float]:
+    """可視関節だけで関節別／全体の OKS と PCK@alpha を集計する。"""
+    oks = keypoint_oks(pred, gt, area)
+    pck = keypoint_pck(pred, gt, ref_length, alpha)
+    counts = visible.sum(axis=0)
+    per_joint_oks, per_joint_pck = _masked_mean(oks, visible, counts), _masked_mean(pck, visible, counts)
+
+    # --- 人物ごとの OKS は可視関節の平均（COCO の定義） ---
+    per_person = visible.sum(axis=1)
+    person_oks = np.where(per_person > 0, (oks * visible).sum(axis=1) / np.maximum(per_person, 1), np.nan)
+    return {
+        "oks_per_joint": per_joint_oks,
+        "pck_per_joint": per_joint_pck,
+        "oks": float(np.nanmean(person_oks)) if np.any(per_person > 0) else float("nan"),
+        "pck": float((pck * visible).sum() / max(int(visible.sum()), 1)),
+        "visible_per_joint": counts,
+    }
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """mask が立つ要素だけで列平均を取る（該当なしは NaN）。"""
+    total = (values * mask).sum(axis=0)
+    return np.where(counts > 0, total / np.maximum(counts, 1), np.nan)
+
+
+def pareto_front(cost: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """cost が小さく score が大きいほど良いとき、他に支配されない点の添字を cost 順に返す。"""
+    order = np.lexsort((-score, cost))
+    front, best = [], -np.inf
+    for i in order:
+        if score[i] > best:
+            front.append(int(i))
+            best = score[i]
+    return np.array(front, np.int64)
+
+
+def person_reference(bbox: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """COCO bbox (N,4: x,y,w,h) から OKS 用の面積と PCK 用の基準長（長辺）を返す。"""
+    bbox = np.asarray(bbox, np.float64).reshape(-1, 4)
+    return bbox[:, 2] * bbox[:, 3], np.maximum(bbox[:, 2], bbox[:, 3])
@@ -0,0 +1,186 @@
+# ===== インポート =====
+from __future__ import annotations
+from pathlib import Path
+
+import numpy                as np
+from PySide6.QtGui  import QImage
+
+from ..camera.frame_converter import FrameConverter
+from ..profiling      import timed
+from .pose_estimator  import PoseEstimator
+from .change_detector import ChangeDetector, gray_thumbnail
+from .drawing         import draw_pose
+from .keypoint_shm    import KeypointPublisher
+from .low_light       import LowLightEnhancer
+from .person_tracker  import PersonTracker
+from .presence_gate   import PresenceGate
+from .trajectory_log  import TrajectoryLog
+# ====
+
+
+class PoseProcessor:
+    """カメラ 1 台分の推論結果の後処理（ログ記録・骨格描画）を担うクラス。"""
+
+    def __init__(
+        self,
+        estimator: PoseEstimator | None = None,
+        *,
+        thr: float = 0.2,
+        log_dir: Path | None = None,
+        change_detector: ChangeDetector | None = None,
+        preview_size: int | None = None,
+        publisher: KeypointPublisher | None = None,
+        slot: int = 0,
+        enhancer: LowLightEnhancer | None = None,
+        presence_gate: PresenceGate | None = None,
+    ) -> None:
+        """推論器と描画閾値、ログ保存先を保持する。推論器は処理スレッド側で後から設定してよい。"""
+        self.estimator: PoseEstimator | None = estimator
+        self._thr: float = thr
+        self._log_dir: Path | None = log_dir
+        self._log: TrajectoryLog | None = None
+        # --- MultiPose 時に追従対象を選ぶトラッカー ---
+        self.tracker: PersonTracker = PersonTracker(kp_thr=thr)
+        # --- 静止シーンでは前回の推論結果を使い回す ---
+        self._detector: ChangeDetector | None = change_detector
+        # --- 人物がいない間は推論を低頻度の確認だけにする ---
+        self._gate: PresenceGate | None = presence_gate
+        self._thumb: np.ndarray | None = None   # 両判定で共有する現フレームの縮小画像
+        self._last_result: tuple[np.ndarray, np.ndarray] | None = None
+        # --- 描画結果は使い回しバッファ上の QImage にする ---
+        self._converter: FrameConverter = FrameConverter(max_size=preview_size)
+        # --- 暗いフレームだけ推論前に補正する（描画は元画像） ---
+        self._enhancer: LowLightEnhancer | None = enhancer
+        # --- 他プロセス向けに最新キーポイントを共有メモリへ書き出す ---
+        self._publisher: KeypointPublisher | None = publisher
+        self._slot: int = slot
+
+    # ===== ライフサイクル（処理スレッド内で呼ぶ） =====
+    def open(self) -> None:
+        """ログファイルを開く。"""
+        if self._log_dir is not None and self._log is None:
+            self._log = TrajectoryLog(self._log_dir)
+
+    def close(self) -> None:
+        """ログファイルを閉じる。"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def reset(self, log_dir: Path | None) -> None:
+        """推論器を残したまま、別カメラ用にログ・追跡・使い回し状態を初期化する。"""
+        self.close()
+        self._log_dir = log_dir
+        self.tracker = PersonTracker(kp_thr=self._thr)
+        if self._detector is not None:
+            self._detector.reset()
+        if self._enhancer is not None:
+            self._enhancer.reset()
+        if self._gate is not None:
+            self._gate.reset()
+        self._last_result = None
+        self.open()
+
+    # ===== フレーム処理 =====
+    def process(self, frame: np.ndarray, timestamp: float, seq: int) -> QImage:
+        """推論から描画までを 1 フレーム分行う。"""
+        assert self.estimator is not None, "estimator が未設定です。"
+        cached = self.reusable_result(frame, timestamp)
+        if cached is not None:
+            return self.finish(frame, timestamp, seq, *cached, reused=True)
+        source = self.enhance(frame)
+        with timed("estimate"):
+            if self.estimator.multipose:
+                kps, scores = self.select_person(*self.estimator.estimate_multi(source, self._thr), frame.shape)
+            else:
+                kps, scores = self.estimator.estimate_bound(source)   # 使い回しバッファ（次の推論まで有効）
+        self.remember(timestamp, kps, scores)
+        return self.finish(frame, timestamp, seq, kps, scores)
+
+    def enhance(self, frame: np.ndarray) -> np.ndarray:
+        """推論に渡す画像を返す（暗ければ補正、明るければ frame のまま）。"""
+        if self._enhancer is None:
+            return frame
+        with timed("enhance"):
+            return self._enhancer.apply(frame)
+
+    def enhance_stats(self) -> dict[str, float]:
+        """低照度補正の統計を返す（無効なら空）。"""
+        return self._enhancer.stats() if self._enhancer is not None else {}
+
+    # ===== 静止シーン・不在時の推論省略 =====
+    def reusable_result(self, frame: np.ndarray, timestamp: float) -> tuple[np.ndarray, np.ndarray] | None:
+        """不在で待機中か、前回推論から画面がほぼ変わっていなければ、前回の結果を返す（推論が必要なら None）。"""
+        if self._detector is None and self._gate is None:
+            return None
+        thumb = self._thumb = gray_thumbnail(frame)
+        if self._gate is not None and self._gate.idle:
+            # --- 待機中は確認・動きによる推論要求を静止判定より優先する（使い回すと確認が抜ける） ---
+            if self._gate.should_infer(frame, timestamp, thumb=thumb) or self._last_result is None:
+                return None
+            return self._last_result
+        if self._gate is not None:
+            self._gate.should_infer(frame, timestamp, thumb=thumb)
+        if self._detector is None or self._detector.changed(frame, timestamp, thumb=thumb):
+            return None
+        return self._last_result
+
+    def remember(self, timestamp: float, kps: np.ndarray, scores: np.ndarray) -> None:
+        """推論結果を次回の使い回し用に記録し、人物の有無を判定する。"""
+        if self._detector is not None:
+            self._detector.commit(timestamp, self._thumb)
+        if self._gate is not None:
+            self._gate.update(timestamp, scores)
+        if self._detector is not None or self._gate is not None:
+            self._last_result = (kps, scores)
+
+    def skip_stats(self) -> dict[str, int]:
+        """推論省略の統計を返す（無効なら空）。"""
+        return self._detector.stats() if self._detector is not None else {}
+
+    @property
+    def idle(self) -> bool:
+        """人物不在で推論を間引いている最中か。"""
+        return self._gate is not None and self._gate.idle
+
+    def take_presence_change(self) -> bool | None:
+        """前回呼び出し以降の待機状態の変化を返す（待機へ: False, 通常へ: True, なし: None）。"""
+        return self._gate.take_transition() if self._gate is not None else None
+
+    def presence_stats(self) -> dict[str, int]:
+        """待機状態の出入りと間引きの統計を返す（無効なら空）。"""
+        return self._gate.stats() if self._gate is not None else {}
+
+    def select_person(
+        self,
+        kps: np.ndarray,
+        scores: np.ndarray,
+        boxes: np.ndarray,
+        person_scores: np.ndarray,
+        shape: tuple[int, ...],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """複数人物の検出に ID を振り、追従対象 1 人分を返す（不在ならスコア 0 の骨格）。"""
+        ids = self.tracker.update(kps, scores, boxes, person_scores)
+        idx = self.tracker.target_index(ids)
+        if idx is None:
+            return np.zeros((17, 2), np.int32), np.zeros(17, np.float32)
+        return kps[idx], scores[idx]
+
+    def finish(
+        self,
+        frame: np.ndarray,
+        timestamp: float,
+        seq: int,
+        kps: np.ndarray,
+        scores: np.ndarray,
+        *,
+        reused: bool = False,
+    ) -> QImage:
+        """推論済みの結果を記録し、骨格を描画した QImage を返す。reused（使い回し）の結果はログに書かない。"""
+        if self._log is not None and not reused:
+            self._log.append(timestamp, seq, kps, scores)
+        if self._publisher is not None:
+            self._publisher.publish(self._slot, timestamp, seq, kps, scores)
+        with timed("draw_pose"):
+            drawn = draw_pose(frame, kps, scores, self._thr)
+        return self._converter.convert(drawn)
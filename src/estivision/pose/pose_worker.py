@@ -1,21 +1,31 @@
 # ===== インポート =====
 from __future__ import annotations
 import queue
+import time
+from pathlib import Path
 from typing import Optional
 
-import cv2                  as cv
 import numpy                as np
-from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtCore import QThread, QTimer, Signal, QObject
 from PySide6.QtGui  import QImage
 
-from .pose_estimator import PoseEstimator
-from .drawing        import draw_pose
+from ..profiling      import name_thread
+from ..thread_budget  import WorkerAllocation, enter_allocation
+from .change_detector import ChangeDetector
+from .keypoint_shm    import KeypointPublisher
+from .low_light       import LowLightEnhancer
+from .pose_estimator  import PoseEstimator
+from .pose_processor  import PoseProcessor
+from .presence_gate   import PresenceGate
 # ====
 
 class PoseWorker(QThread):
     """CameraStream から送られたフレームで姿勢推定 → 骨格描画するスレッド。"""
 
     image_ready: Signal = Signal(QImage)     # GUI へ送る完成画像
+    ready: Signal = Signal()                 # 推論セッションの準備完了
+    failed: Signal = Signal(str)             # モデル読み込み失敗
+    presence_changed: Signal = Signal(bool)  # False: 人物不在で推論を間引き開始, True: 通常の推論へ復帰
 
     def __init__(
         self,
@@ -23,40 +33,131 @@ class PoseWorker(QThread):
         model_type: str = "lightning",
         providers: Optional[list[str]] = None,
         thr: float = 0.2,
+        log_dir: Path | None = None,
+        skip_static: bool = True,
+        enhance_low_light: bool = True,
+        idle_when_absent: bool = True,
+        preview_size: int | None = None,
+        publisher: KeypointPublisher | None = None,
+        slot: int = 0,
+        allocation: WorkerAllocation | None = None,
         parent: QObject | None = None,
     ) -> None:
         super().__init__(parent)
-        self._queue: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=20)
+        self._queue: "queue.Queue[tuple[np.ndarray, float, int] | None]" = queue.Queue(maxsize=20)
         self._running: bool = False
-        self._est: PoseEstimator = PoseEstimator(model_type=model_type, providers=providers)
-        self._thr = thr
+        self._paused: bool = False
+        self._model_type: str = model_type
+        self._providers: Optional[list[str]] = providers
+        self._allocation: WorkerAllocation | None = allocation
+        # --- セッション生成は GUI スレッドを止めないよう run() 内で行う ---
+        self._processor: PoseProcessor = PoseProcessor(
+            thr=thr, log_dir=log_dir, change_detector=ChangeDetector() if skip_static else None,
+            preview_size=preview_size, publisher=publisher, slot=slot,
+            enhancer=LowLightEnhancer() if enhance_low_light else None,
+            presence_gate=PresenceGate() if idle_when_absent else None,
+        )
+        self._seq: int = 0
+        # --- 別カメラへの付け替え要求（(log_dir,) の形で渡し、処理スレッドで反映する） ---
+        self._reset_to: tuple[Path | None] | None = None
 
     # CameraStream から呼ばれる slot
-    def enqueue_frame(self, frame_bgr: np.ndarray) -> None:
-        if not self._running:
+    def enqueue_frame(self, frame_bgr: np.ndarray, timestamp: float | None = None, seq: int | None = None) -> None:
+        if not self._running or self._paused:
             return
+        # --- 時刻・連番が無い送信元では受信時に採番 ---
+        if timestamp is None:
+            timestamp = time.time()
+        if seq is None:
+            seq = self._seq
+        self._seq = seq + 1
         try:
-            self._queue.put_nowait(frame_bgr)
+            self._queue.put_nowait((frame_bgr, timestamp, seq))
         except queue.Full:
             pass   # 最新フレーム優先で捨てる
 
     def run(self) -> None:  # noqa: D401
         self._running = True
-        while self._running:
+        name_thread(f"PoseWorker-{id(self) & 0xFFFF:04x}")
+        enter_allocation(self._allocation)   # セッション生成前に固定し、ORT のスレッドへ引き継がせる
+        if self._processor.estimator is None:
             try:
-                frame = self._queue.get(timeout=1.0)
-            except queue.Empty:
-                continue
+                self._processor.estimator = PoseEstimator(
+                    model_type=self._model_type, providers=self._providers, allocation=self._allocation,
+                )
+            except Exception as exc:
+                self._running = False
+                self.failed.emit(str(exc))
+                return
+        self._processor.open()
+        self.ready.emit()
+        try:
+            while self._running and not self.isInterruptionRequested():
+                reset, self._reset_to = self._reset_to, None
+                if reset is not None:
+                    self._processor.reset(reset[0])
+                    self._drain()   # 付け替え前に積まれたフレームは前のカメラのもの
+                    continue
+                try:
+                    item = self._queue.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                if item is None:   # stop / reset による起床
+                    continue
+                frame, timestamp, seq = item
+
+                qimg = self._processor.process(frame, timestamp, seq)
+                self.image_ready.emit(qimg)
+                present = self._processor.take_presence_change()
+                if present is not None:
+                    self.presence_changed.emit(present)
+        finally:
+            self._processor.close()
+
+    def stats(self) -> dict[str, float]:
+        """静止シーンや人物不在で推論を省略した回数、低照度補正の回数・時間などを返す。"""
+        return {
+            **self._processor.skip_stats(), **self._processor.presence_stats(), **self._processor.enhance_stats(),
+        }
+
+    # ===== 使い回し（GUI スレッド） =====
+    def reset(self, log_dir: Path | None = None) -> None:
+        """読み込み済みのセッションのまま別カメラ用に付け替える（未処理フレームは捨てる）。"""
+        self.pause()
+        self._seq = 0
+        self._reset_to = (log_dir,)
+        self._wake()
+        # --- 前のカメラから配送待ちのフレームを捨て切ってから受付を再開する ---
+        QTimer.singleShot(0, self._resume)
+
+    def pause(self) -> None:
+        """未処理フレームを捨てて待機状態にする（スレッドとセッションは保持）。"""
+        self._paused = True
+        self._drain()
 
-            kps, scores = self._est.estimate(frame)
-            drawn = draw_pose(frame, kps, scores, self._thr)
+    def _resume(self) -> None:
+        """フレームの受付を再開する。"""
+        self._paused = False
 
-            rgb = cv.cvtColor(drawn, cv.COLOR_BGR2RGB)
-            h, w, _ = rgb.shape
-            qimg = QImage(rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888)
-            self.image_ready.emit(qimg)
+    def _drain(self) -> None:
+        """キューに残ったフレームを捨てる。"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _wake(self) -> None:
+        """キュー待ちを即座に解除する。"""
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
 
-    def stop(self) -> None:
+    def stop(self, *, wait: bool = True) -> None:
+        """スレッドを停止する。wait=False なら要求だけ出して戻り、完了は finished で通知される。"""
         self._running = False
         self.requestInterruption()
-        self.wait()
+        self._wake()
+        if wait:
+            self.wait()
@@ -0,0 +1,109 @@
+# ===== インポート =====
+from __future__ import annotations
+from typing import Dict
+
+import cv2   as cv
+import numpy as np
+
+from .change_detector import THUMBNAIL_SIZE, gray_thumbnail
+# ====
+
+
+class PresenceGate:
+    """人物がしばらく写っていなければ待機状態に入り、推論を低頻度の確認だけに間引くクラス。"""
+
+    def __init__(
+        self,
+        *,
+        min_score: float = 0.15,
+        idle_after: float = 2.0,
+        probe_interval: float = 0.5,
+        motion_threshold: float = 8.0,
+        size: int = THUMBNAIL_SIZE,
+    ) -> None:
+        """人物ありとみなす平均スコア、待機に入るまでの秒数、待機中の確認間隔、動きとみなす輝度差を設定する。"""
+        self._min_score: float = min_score
+        self._idle_after: float = idle_after
+        self._probe_interval: float = probe_interval
+        self._motion_threshold: float = motion_threshold
+        self._size: int = size
+        self.idle: bool = False
+        self._absent_since: float | None = None   # 低スコアが続き始めた時刻
+        self._last_infer: float = 0.0
+        self._reference: np.ndarray | None = None  # 最後に推論したフレームの縮小画像
+        self._candidate: np.ndarray | None = None
+        self._transition: bool | None = None     # 未通知の状態変化（False: 待機へ, True: 通常へ）
+        # --- 統計 ---
+        self.entered: int = 0
+        self.woke_detection: int = 0
+        self.woke_motion: int = 0
+        self.probes: int = 0
+        self.skipped: int = 0
+
+    def should_infer(self, frame_bgr: np.ndarray, timestamp: float, *, thumb: np.ndarray | None = None) -> bool:
+        """このフレームを推論すべきかを返す（通常時は常に True）。動きを検出すると待機を抜ける。"""
+        # --- 待機中は probe_interval ごとの確認か、最後に推論したフレームからの大きな動きでだけ推論させる ---
+        if thumb is None:
+            thumb = gray_thumbnail(frame_bgr, self._size)
+        self._candidate = thumb
+        if not self.idle:
+            return True
+        if self._reference is not None and float(cv.absdiff(thumb, self._reference).mean()) >= self._motion_threshold:
+            self._wake()
+            self.woke_motion += 1
+            return True
+        if timestamp - self._last_infer >= self._probe_interval:
+            self.probes += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def update(self, timestamp: float, scores: np.ndarray) -> None:
+        """推論結果の平均スコアで状態を更新する。"""
+        self._last_infer = timestamp
+        if self._candidate is not None:
+            self._reference = self._candidate
+        if float(np.mean(scores)) >= self._min_score:
+            self._absent_since = None
+            if self.idle:
+                self._wake()
+                self.woke_detection += 1
+            return
+        if self.idle:
+            return
+        if self._absent_since is None:
+            self._absent_since = timestamp
+        elif timestamp - self._absent_since >= self._idle_after:
+            self.idle = True
+            self.entered += 1
+            self._transition = False
+
+    def take_transition(self) -> bool | None:
+        """前回呼び出し以降の状態変化を返す（待機へ: False, 通常へ: True, なし: None）。"""
+        transition, self._transition = self._transition, None
+        return transition
+
+    def reset(self) -> None:
+        """通常状態に戻し、比較用の画像を破棄する（カメラ切替時など）。"""
+        self.idle = False
+        self._absent_since = None
+        self._reference = None
+        self._candidate = None
+        self._transition = None
+
+    def stats(self) -> Dict[str, int]:
+        """待機に入った回数、検出／動きで抜けた回数、待機中の確認推論と省略の回数を返す。"""
+        return {
+            "idle_entered": self.entered,
+            "idle_woke_detection": self.woke_detection,
+            "idle_woke_motion": self.woke_motion,
+            "idle_probes": self.probes,
+            "idle_skipped": self.skipped,
+        }
+
+    # ===== 内部ヘルパ =====
+    def _wake(self) -> None:
+        """通常状態へ戻す。"""
+        self.idle = False
+        self._absent_since = None
+        self._transition = None if self._transition is False else True   # 同じ呼び出し間の出入りは相殺
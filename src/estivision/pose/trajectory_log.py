@@ -0,0 +1,203 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Dict
+
+# --- 外部ライブラリ ---
+import numpy as np
+# ====
+
+# ===== 定数定義 =====
+_NUM_KEYPOINTS: int = 17
+_FORMAT_VERSION: int = 1
+_META_FILE: str = "meta.json"
+
+# --- 列名 → (ファイル名, dtype, 1 行あたりの形状) ---
+_COLUMNS: Dict[str, tuple[str, str, tuple[int, ...]]] = {
+    "timestamp": ("timestamp.f64", "<f8", ()),
+    "seq":       ("seq.i64",       "<i8", ()),
+    "keypoints": ("keypoints.f32", "<f4", (_NUM_KEYPOINTS, 2)),
+    "scores":    ("scores.f32",    "<f4", (_NUM_KEYPOINTS,)),
+}
+# ====
+
+
+class TrajectoryLog:
+    """キーポイント軌跡を列ごとの memmap ファイルへ追記保存する追記専用ログ。"""
+
+    # --- 書き込み中は拡張でファイルを切り詰め直すため、列・範囲はコピーで返す（読み取り専用ならビュー） ---
+
+    def __init__(self, directory: Path, *, read_only: bool = False, chunk_rows: int = 4096) -> None:
+        """directory 配下の列ファイルを開く（無ければ作成する）。"""
+        self._dir: Path = Path(directory)
+        self._read_only: bool = read_only
+        self._chunk_rows: int = max(1, chunk_rows)
+        self._columns: Dict[str, np.memmap] = {}
+        self._count: int = 0
+        self._capacity: int = 0
+
+        # ===== 既存ログの読込 or 新規作成 =====
+        if read_only:
+            if not (self._dir / _META_FILE).is_file():
+                raise FileNotFoundError(f"ログが見つかりません: {self._dir}")
+            self._count = self._read_meta_count()
+            self._capacity = self._file_rows()
+            self._map(self._capacity)
+            self._count = self._recover_count(self._count)
+        else:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            if (self._dir / _META_FILE).is_file():
+                self._count = self._read_meta_count()
+                self._capacity = self._file_rows()
+                self._map(self._capacity)
+                self._count = self._recover_count(self._count)
+            else:
+                self._grow(self._chunk_rows)
+                self._write_meta()
+        # ====
+
+    # ===== 生成ヘルパ =====
+    @classmethod
+    def open(cls, directory: Path) -> "TrajectoryLog":
+        """解析用に既存ログを読み取り専用で開く。"""
+        return cls(directory, read_only=True)
+
+    # ===== 追記 =====
+    def append(self, timestamp: float, seq: int, keypoints: np.ndarray, scores: np.ndarray) -> None:
+        """1 フレーム分の結果を末尾へ追記する。"""
+        if self._read_only:
+            raise PermissionError("読み取り専用ログには追記できません。")
+        if self._count >= self._capacity:
+            self._grow(self._capacity + max(self._chunk_rows, self._capacity))
+
+        # --- 事前確保済み領域へ直接書き込む（再確保なし） ---
+        i = self._count
+        self._columns["timestamp"][i] = timestamp
+        self._columns["seq"][i] = seq
+        self._columns["keypoints"][i] = keypoints
+        self._columns["scores"][i] = scores
+        self._count = i + 1
+
+    # ===== 列ビュー =====
+    def __len__(self) -> int:
+        """記録済みフレーム数を返す。"""
+        return self._count
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """タイムスタンプ列 (N,) を返す。"""
+        return self._rows("timestamp", 0, self._count)
+
+    @property
+    def seq(self) -> np.ndarray:
+        """フレーム連番列 (N,) を返す。"""
+        return self._rows("seq", 0, self._count)
+
+    @property
+    def keypoints(self) -> np.ndarray:
+        """キーポイント列 (N,17,2) を返す。"""
+        return self._rows("keypoints", 0, self._count)
+
+    @property
+    def scores(self) -> np.ndarray:
+        """スコア列 (N,17) を返す。"""
+        return self._rows("scores", 0, self._count)
+
+    # ===== 時間範囲クエリ =====
+    def time_range(self, start: float, end: float) -> Dict[str, np.ndarray]:
+        """start <= t < end の行を列ごとに返す。"""
+        lo, hi = self.index_range(start, end)
+        return {name: self._rows(name, lo, hi) for name in self._columns}
+
+    def index_range(self, start: float, end: float) -> tuple[int, int]:
+        """start <= t < end を満たす行の [lo, hi) を二分探索で返す。"""
+        ts = self._columns["timestamp"][: self._count]
+        lo = int(np.searchsorted(ts, start, side="left"))
+        hi = int(np.searchsorted(ts, end, side="left"))
+        return lo, max(lo, hi)
+
+    # ===== 終了処理 =====
+    def flush(self) -> None:
+        """memmap とメタ情報をディスクへ書き出す。"""
+        if self._read_only:
+            return
+        for col in self._columns.values():
+            col.flush()
+        self._write_meta()
+
+    def close(self) -> None:
+        """書き出してファイルを閉じる。"""
+        self.flush()
+        self._columns.clear()
+
+    def __enter__(self) -> "TrajectoryLog":
+        """with 文用。"""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """with 文終了時に close する。"""
+        self.close()
+
+    # ===== 内部ヘルパ =====
+    def _rows(self, name: str, lo: int, hi: int) -> np.ndarray:
+        """列 name の [lo, hi) 行を返す（書き込み中はコピー、読み取り専用は memmap のビュー）。"""
+        rows = self._columns[name][lo:hi]
+        return rows if self._read_only else np.array(rows)
+
+    def _grow(self, rows: int) -> None:
+        """全列ファイルを rows 行分に拡張して再マップする。"""
+        for col in self._columns.values():
+            col.flush()
+        self._columns.clear()
+        for fname, dtype, shape in _COLUMNS.values():
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+            with open(self._dir / fname, "ab") as f:
+                f.truncate(rows * row_bytes)
+        self._map(rows)
+        self._capacity = rows
+        self._write_meta()
+
+    def _map(self, rows: int) -> None:
+        """各列ファイルを memmap として開く。"""
+        mode = "r" if self._read_only else "r+"
+        for name, (fname, dtype, shape) in _COLUMNS.items():
+            if rows == 0:
+                self._columns[name] = np.zeros((0, *shape), dtype=dtype)  # type: ignore[assignment]
+                continue
+            self._columns[name] = np.memmap(self._dir / fname, dtype=dtype, mode=mode, shape=(rows, *shape))
+
+    def _file_rows(self) -> int:
+        """列ファイルのサイズから確保済み行数を求める（最小の列に合わせる）。"""
+        rows: list[int] = []
+        for fname, dtype, shape in _COLUMNS.values():
+            path = self._dir / fname
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+            rows.append(path.stat().st_size // row_bytes if path.is_file() else 0)
+        return min(rows)
+
+    def _recover_count(self, count: int) -> int:
+        """異常終了でメタが古い場合、タイムスタンプ列から実際の行数を復元する。"""
+        count = min(count, self._capacity)
+        if count >= self._capacity:
+            return count
+        tail = np.flatnonzero(self._columns["timestamp"][count:])
+        return count + int(tail[-1]) + 1 if tail.size else count
+
+    def _read_meta_count(self) -> int:
+        """meta.json から記録済み行数を読む。"""
+        meta = json.loads((self._dir / _META_FILE).read_text(encoding="utf-8"))
+        if meta.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"未対応のログ形式です: {meta.get('version')}")
+        return int(meta.get("count", 0))
+
+    def _write_meta(self) -> None:
+        """行数や形式情報を meta.json に保存する。"""
+        meta = {
+            "version": _FORMAT_VERSION,
+            "count": self._count,
+            "num_keypoints": _NUM_KEYPOINTS,
+            "columns": {name: {"file": f, "dtype": d, "shape": list(s)} for name, (f, d, s) in _COLUMNS.items()},
+        }
+        (self._dir / _META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
@@ -0,0 +1,264 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from __future__ import annotations
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+# ====
+
+# ===== 定数定義 =====
+ENV_VAR: str = "ESTIVISION_PROFILE"             # "1" で有効、値がディレクトリならそこへ出力
+DEFAULT_OUTPUT_DIR: Path = Path("data/profiles")
+# ====
+
+# ===== モジュール状態 =====
+_enabled: bool = False
+_output_dir: Path = DEFAULT_OUTPUT_DIR
+_sampler: Optional["_Sampler"] = None
+_atexit_registered: bool = False
+_lock = threading.Lock()
+# --- スレッド ID → {計測名: [回数, 合計 ns, 最大 ns]} ---
+_timings: Dict[int, Dict[str, List[int]]] = {}
+_thread_names: Dict[int, str] = {}
+# ====
+
+
+# ===== 区間計測 =====
+class _NullTimer:
+    """無効時に返す何もしないタイマー。"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        """何もせず自身を返す。"""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """何もしない。"""
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """perf_counter_ns で区間を測り、呼び出しスレッドの集計へ加える。"""
+
+    __slots__ = ("_name", "_start")
+
+    def __init__(self, name: str) -> None:
+        """計測名を保持する。"""
+        self._name: str = name
+        self._start: int = 0
+
+    def __enter__(self) -> "_Timer":
+        """計測を開始する。"""
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """経過時間を呼び出しスレッドの集計へ加える。"""
+        elapsed = time.perf_counter_ns() - self._start
+        tid = threading.get_ident()
+        table = _timings.get(tid)
+        if table is None:
+            with _lock:
+                table = _timings.setdefault(tid, {})
+        entry = table.get(self._name)
+        if entry is None:
+            entry = table.setdefault(self._name, [0, 0, 0])
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+
+def timed(name: str) -> _Timer | _NullTimer:
+    """with 文で囲んだ区間の時間を計測する（プロファイル無効時はほぼゼロコスト）。"""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def name_thread(name: str) -> None:
+    """レポートに表示する現在スレッドの名前を登録する。"""
+    if _enabled:
+        _thread_names[threading.get_ident()] = name
+# ====
+
+
+# ===== サンプリングプロファイラ =====
+class _Sampler(threading.Thread):
+    """全スレッド（QThread 含む）のスタックを一定間隔で採取し、関数ごとに集計するスレッド。"""
+
+    def __init__(self, interval: float) -> None:
+        """採取間隔と集計領域を用意する。"""
+        super().__init__(name="estivision-profiler", daemon=True)
+        self._interval: float = interval
+        self._stop_event = threading.Event()
+        self.lock = threading.Lock()   # レポート作成中の集計更新を防ぐ
+        self.samples: Dict[int, int] = Counter()
+        self.self_hits: Dict[int, Counter] = {}
+        self.total_hits: Dict[int, Counter] = {}
+        self.names: Dict[int, str] = {}
+
+    def run(self) -> None:
+        """停止要求まで一定間隔で全スレッドのスタックを採取する。"""
+        own = threading.get_ident()
+        while not self._stop_event.wait(self._interval):
+            frames = sys._current_frames()
+            with self.lock:
+                for tid, frame in frames.items():
+                    if tid != own:
+                        self._record(tid, frame)
+            del frames
+
+    def _record(self, tid: int, frame: object) -> None:
+        """1 スレッド分のスタックを集計する（葉 = self、スタック内 = total）。"""
+        self.samples[tid] += 1
+        selfs = self.self_hits.setdefault(tid, Counter())
+        totals = self.total_hits.setdefault(tid, Counter())
+        seen = set()
+        leaf = True
+        owner = None
+        f = frame
+        while f is not None:
+            code = f.f_code  # type: ignore[attr-defined]
+            key = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+            if leaf:
+                selfs[key] += 1
+                leaf = False
+            if key not in seen:
+                totals[key] += 1
+                seen.add(key)
+            # --- スレッド名は最初の 1 回だけ run(self) の所有クラスから推定する ---
+            if tid not in self.names and code.co_name == "run" and code.co_varnames[:1] == ("self",):
+                owner = type(f.f_locals.get("self")).__name__  # type: ignore[attr-defined]
+            f = f.f_back  # type: ignore[attr-defined]
+        if owner and tid not in self.names:
+            self.names[tid] = owner
+
+    def stop(self) -> None:
+        """採取を止めてスレッドの終了を待つ。"""
+        self._stop_event.set()
+        self.join(timeout=1.0)
+# ====
+
+
+# ===== 有効化 =====
+def enabled() -> bool:
+    """プロファイルが有効かを返す。"""
+    return _enabled
+
+
+def enable(output_dir: Path | str | None = None, *, interval: float = 0.005) -> None:
+    """区間計測とサンプリングを開始し、終了時にレポートを書き出すよう登録する。"""
+    global _enabled, _output_dir, _sampler, _atexit_registered
+    if _enabled:
+        return
+    _enabled = True
+    if output_dir is not None:
+        _output_dir = Path(output_dir)
+    _sampler = _Sampler(interval)
+    _sampler.start()
+    # --- 有効化と無効化を繰り返しても、終了時のレポートは 1 回だけ書き出す ---
+    if not _atexit_registered:
+        atexit.register(_dump_at_exit)
+        _atexit_registered = True
+
+
+def enable_from_env() -> bool:
+    """環境変数 ESTIVISION_PROFILE が設定されていれば有効化し、その結果を返す。"""
+    value = os.environ.get(ENV_VAR, "")
+    if value and value != "0":
+        enable(value if value not in ("1", "true", "yes") else None)
+    return _enabled
+
+
+def disable() -> None:
+    """サンプリングを止める（集計値は残す）。"""
+    global _enabled, _sampler
+    _enabled = False
+    if _sampler is not None:
+        _sampler.stop()
+
+
+def reset() -> None:
+    """サンプリングを止め、集計値と出力先を初期状態へ戻す（テスト用）。"""
+    global _sampler, _output_dir
+    disable()
+    _sampler = None
+    _output_dir = DEFAULT_OUTPUT_DIR
+    with _lock:
+        _timings.clear()
+        _thread_names.clear()
+# ====
+
+
+# ===== レポート =====
+def _thread_label(tid: int) -> str:
+    """スレッド ID を表示名へ変換する。"""
+    if tid in _thread_names:
+        return _thread_names[tid]
+    if _sampler is not None and tid in _sampler.names:
+        return f"{_sampler.names[tid]}-{tid & 0xFFFF:04x}"
+    for t in threading.enumerate():
+        if t.ident == tid:
+            return t.name
+    return f"thread-{tid & 0xFFFF:04x}"
+
+
+def report(top: int = 15) -> str:
+    """スレッドごとの区間計測結果とホットパス（上位関数）を文字列で返す。"""
+    with _sampler.lock if _sampler is not None else _lock:
+        return _format_report(top)
+
+
+def _format_report(top: int) -> str:
+    """report() の本体（サンプリング集計はロック済みの前提）。"""
+    lines: List[str] = []
+    tids = set(_timings) | (set(_sampler.samples) if _sampler is not None else set())
+
+    for tid in sorted(tids, key=_thread_label):
+        lines.append(f"===== {_thread_label(tid)} =====")
+
+        # --- 区間計測 ---
+        table = dict(_timings.get(tid, {}))
+        if table:
+            lines.append(f"{'section':<24}{'calls':>8}{'total[ms]':>12}{'mean[ms]':>10}{'max[ms]':>10}")
+            for name, (count, total, peak) in sorted(table.items(), key=lambda kv: -kv[1][1]):
+                lines.append(
+                    f"{name:<24}{count:>8}{total / 1e6:>12.1f}{total / count / 1e6:>10.2f}{peak / 1e6:>10.2f}"
+                )
+
+        # --- サンプリング ---
+        if _sampler is not None and _sampler.samples.get(tid):
+            n = _sampler.samples[tid]
+            lines.append(f"samples: {n}")
+            lines.append(f"{'self%':>7}{'total%':>8}  function")
+            totals = _sampler.total_hits[tid]
+            for key, hits in _sampler.self_hits[tid].most_common(top):
+                lines.append(f"{hits / n * 100:>6.1f}%{totals[key] / n * 100:>7.1f}%  {key}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def dump(path: Path | str | None = None) -> Path:
+    """レポートをファイルへ書き出してそのパスを返す。"""
+    if path is None:
+        path = _output_dir / time.strftime("profile_%Y%m%d_%H%M%S.txt")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report(), encoding="utf-8")
+    return path
+
+
+def _dump_at_exit() -> None:
+    """プロセス終了時にレポートを書き出す。"""
+    if _timings or (_sampler is not None and _sampler.samples):
+        disable()
+        dump()
+# ====
@@ -0,0 +1,103 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from __future__ import annotations
+import os
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+# ====
+
+
+class WorkerAllocation(NamedTuple):
+    """推論スレッド 1 本分の割り当て（ONNX Runtime の intra-op スレッド数と使う CPU）。"""
+
+    index: int
+    intra_op_threads: int
+    cpus: Tuple[int, ...]
+    pinned: bool          # True なら cpus へアフィニティを固定する
+    spin: bool            # ORT の待機スレッドをスピンさせるか（False で空き CPU を食わない）
+
+
+def available_cpus() -> Tuple[int, ...]:
+    """このプロセスが使える CPU 番号を返す。"""
+    if hasattr(os, "sched_getaffinity"):
+        return tuple(sorted(os.sched_getaffinity(0)))
+    return tuple(range(os.cpu_count() or 1))
+
+
+def pin_current_thread(cpus: Sequence[int]) -> bool:
+    """呼び出したスレッドを cpus に固定する（Linux のみ。後から作るスレッドにも引き継がれる）。"""
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, cpus)   # pid 0 = 呼び出しスレッド
+    except OSError:
+        return False
+    return True
+
+
+def enter_allocation(allocation: WorkerAllocation | None) -> bool:
+    """推論スレッドの開始時に呼び、割り当てが固定指定なら自スレッドを固定する。"""
+    # --- ORT の intra-op スレッドはセッション生成時に作られ、生成したスレッドのアフィニティを引き継ぐ ---
+    if allocation is None or not allocation.pinned:
+        return False
+    return pin_current_thread(allocation.cpus)
+
+
+# --- 先頭 reserve 個の CPU を GUI・取得スレッド・VRChat 用に残し、残りを推論スレッドへ等分する ---
+# --- OpenCV のスレッドプールはプロセス共通なので cv_threads 本に絞る ---
+class ThreadBudget:
+    """取得・推論・GUI が CPU を奪い合わないよう、スレッド数とアフィニティを 1 か所で決めるクラス。"""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        *,
+        reserve: int = 2,
+        ort_threads: int | None = None,
+        cv_threads: int = 1,
+        pin: bool = False,
+        spin: bool = False,
+        cpus: Sequence[int] | None = None,
+    ) -> None:
+        """推論スレッド数、残す CPU 数、1 本あたりの ORT スレッド数（None で等分）などを設定する。"""
+        self.workers: int = max(1, workers)
+        self.cpus: Tuple[int, ...] = tuple(cpus) if cpus is not None else available_cpus()
+        self.reserve: int = min(max(0, reserve), max(0, len(self.cpus) - self.workers))
+        self.cv_threads: int = max(0, cv_threads)
+        self._ort_threads: int | None = ort_threads
+        self._pin: bool = pin and hasattr(os, "sched_setaffinity")
+        self._spin: bool = spin
+
+    def allocation(self, index: int) -> WorkerAllocation:
+        """index 番目の推論スレッドの割り当てを返す（workers 以上の番号は循環させる）。"""
+        usable = self.cpus[self.reserve:] or self.cpus
+        per = max(1, len(usable) // self.workers)
+        start = (index % self.workers) * per % len(usable)
+        cpus = usable[start:start + per]
+        threads = self._ort_threads or len(cpus)
+        return WorkerAllocation(index % self.workers, threads, cpus, self._pin, self._spin)
+
+    def apply_process(self) -> None:
+        """プロセス共通の設定（OpenCV のスレッド数）を反映する。"""
+        import cv2
+        cv2.setNumThreads(self.cv_threads)
+
+    def report(self) -> Dict[str, object]:
+        """選んだ割り当てを返す。"""
+        workers: List[Dict[str, object]] = [
+            {"index": a.index, "intra_op_threads": a.intra_op_threads, "cpus": list(a.cpus)}
+            for a in (self.allocation(i) for i in range(self.workers))
+        ]
+        return {
+            "cpus": len(self.cpus),
+            "reserved": list(self.cpus[:self.reserve]),
+            "cv_threads": self.cv_threads,
+            "pinned": self._pin,
+            "spin": self._spin,
+            "workers": workers,
+        }
+
+    def describe(self) -> str:
+        """ステータスバー向けの 1 行要約を返す。"""
+        a = self.allocation(0)
+        pin = f"CPU {self.cpus[self.reserve]}–{self.cpus[-1]} に固定" if self._pin else "CPU 固定なし"
+        return f"推論 {self.workers} 本 × ORT {a.intra_op_threads} スレッド, OpenCV {self.cv_threads}, {pin}"
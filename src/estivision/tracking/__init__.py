@@ -0,0 +1,11 @@
+"""tracking サブパッケージの公開 API。"""
+from .epipolar         import EpipolarValidator                     # re-export
+from .motion_predictor import MotionPredictor                       # re-export
+from .skeleton_solver  import SkeletonSolver                        # re-export
+from .tracker_output   import TrackerClock, TrackerInterpolator     # re-export
+from .tracker_pose     import TRACKER_NAMES, synthesize_trackers    # re-export
+__all__ = [
+    "EpipolarValidator", "MotionPredictor", "SkeletonSolver",
+    "TrackerClock", "TrackerInterpolator",
+    "TRACKER_NAMES", "synthesize_trackers",
+]
@@ -0,0 +1,97 @@
+# ===== インポート =====
+from __future__ import annotations
+from typing import Dict
+
+import numpy as np
+# ====
+
+# ===== 定数定義 =====
+# --- MoveNet の左右対応（左, 右） ---
+LR_PAIRS: np.ndarray = np.array([(1, 2), (3, 4), (5, 6), (7, 8), (9, 10), (11, 12), (13, 14), (15, 16)], np.int64)
+
+# --- 左右を入れ替えた時の各関節の参照先 ---
+SWAP_INDEX: np.ndarray = np.arange(17)
+SWAP_INDEX[LR_PAIRS[:, 0]] = LR_PAIRS[:, 1]
+SWAP_INDEX[LR_PAIRS[:, 1]] = LR_PAIRS[:, 0]
+# ====
+
+
+def fundamental_from_stereo(K1: np.ndarray, K2: np.ndarray, R: np.ndarray, T: np.ndarray) -> np.ndarray:
+    """ステレオキャリブレーション結果（cam1 → cam2 の R, T）から基礎行列 F を求める。"""
+    t = np.asarray(T, np.float64).reshape(3)
+    tx = np.array([[0.0, -t[2], t[1]], [t[2], 0.0, -t[0]], [-t[1], t[0], 0.0]])
+    F = np.linalg.inv(K2).T @ tx @ np.asarray(R, np.float64) @ np.linalg.inv(K1)
+    return F / np.linalg.norm(F)
+
+
+def epipolar_distances(F: np.ndarray, pts1: np.ndarray, pts2: np.ndarray) -> np.ndarray:
+    """対応点 (N,2) 同士の対称エピポーラ距離（両画像での点と線の距離の平均、画素）を一括で返す。"""
+    n = len(pts1)
+    x1 = np.concatenate([np.asarray(pts1, np.float64), np.ones((n, 1))], axis=1)
+    x2 = np.concatenate([np.asarray(pts2, np.float64), np.ones((n, 1))], axis=1)
+    l2 = x1 @ F.T   # 画像 2 上のエピポーラ線 F x1
+    l1 = x2 @ F     # 画像 1 上のエピポーラ線 F^T x2
+    num = np.abs(np.einsum("ij,ij->i", x2, l2))
+    d2 = num / np.maximum(np.hypot(l2[:, 0], l2[:, 1]), 1e-12)
+    d1 = num / np.maximum(np.hypot(l1[:, 0], l1[:, 1]), 1e-12)
+    return 0.5 * (d1 + d2)
+
+
+class EpipolarValidator:
+    """2 台の推定結果の対応をエピポーラ拘束で検査し、左右取り違えの修正と外れ値の除外を行うクラス。"""
+
+    def __init__(self, F: np.ndarray, *, max_distance: float = 10.0, min_score: float = 0.2) -> None:
+        """基礎行列と許容距離（画素）、検査対象とする最小スコアを設定する。"""
+        self._F: np.ndarray = np.asarray(F, np.float64)
+        self._max_distance: float = max_distance
+        self._min_score: float = min_score
+        # --- 統計 ---
+        self.frames: int = 0
+        self.swapped: int = 0
+        self.rejected: int = 0
+
+    def validate(
+        self,
+        kps1: np.ndarray,
+        scores1: np.ndarray,
+        kps2: np.ndarray,
+        scores2: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """歪み補正済みの (17,2) 座標とスコアを検査し、三角測量に渡す値と有効マスクを返す。"""
+        # --- そのままの対応と、カメラ 2 側の左右を入れ替えた対応を 1 回で評価 ---
+        pts2_both = np.concatenate([kps2, kps2[SWAP_INDEX]], axis=0)
+        dist_both = epipolar_distances(self._F, np.concatenate([kps1, kps1], axis=0), pts2_both)
+        dist, dist_sw = dist_both[:17], dist_both[17:]
+
+        # --- 左右ペア単位で、入れ替えた方が明らかに整合する場合だけ入れ替える ---
+        left, right = LR_PAIRS[:, 0], LR_PAIRS[:, 1]
+        conf = np.minimum(scores1, scores2) >= self._min_score
+        pair_ok = conf[left] & conf[right]
+        keep_cost = dist[left] + dist[right]
+        swap_cost = dist_sw[left] + dist_sw[right]
+        swap = pair_ok & (swap_cost < keep_cost) & (swap_cost <= 2.0 * self._max_distance)
+
+        index = np.arange(17)
+        index[left[swap]] = right[swap]
+        index[right[swap]] = left[swap]
+        out_kps2 = kps2[index]
+        out_scores2 = scores2[index]
+        out_dist = np.where(index != np.arange(17), dist_sw, dist)
+
+        # --- 入れ替え後も拘束を満たさない関節は三角測量から外す ---
+        valid = (np.minimum(scores1, out_scores2) >= self._min_score) & (out_dist <= self._max_distance)
+
+        self.frames += 1
+        self.swapped += int(swap.sum())
+        self.rejected += int((~valid).sum())
+        return {
+            "kps2": out_kps2,
+            "scores2": out_scores2,
+            "distances": out_dist,
+            "valid": valid,
+            "swapped_pairs": LR_PAIRS[swap],
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """処理フレーム数・左右入れ替え数・除外関節数を返す。"""
+        return {"frames": self.frames, "swapped": self.swapped, "rejected": self.rejected}
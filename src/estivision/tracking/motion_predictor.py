@@ -0,0 +1,114 @@
+# ===== インポート =====
+from __future__ import annotations
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+# ====
+
+
+class MotionPredictor:
+    """撮影から出力までの実測遅延ぶん、関節位置を減衰付き速度・加速度モデルで先読みするクラス。"""
+
+    def __init__(
+        self,
+        *,
+        damping: float = 8.0,
+        smoothing: float = 0.5,
+        max_age: float = 0.2,
+        history: int = 32,
+    ) -> None:
+        """減衰係数 [1/s]、速度・加速度推定の平滑化係数、先読みの上限秒数を設定する。"""
+        self._damping: float = damping
+        self._smoothing: float = smoothing
+        self._max_age: float = max_age
+        self._last: Optional[Tuple[float, np.ndarray]] = None
+        self._vel: Optional[np.ndarray] = None
+        self._acc: Optional[np.ndarray] = None
+        # --- 答え合わせ待ちの予測（目標時刻, 予測値, 予測なしの値） ---
+        self._pending: Deque[Tuple[float, np.ndarray, np.ndarray]] = deque(maxlen=history)
+        # --- 誤差統計 ---
+        self._count: int = 0
+        self._sum_err: float = 0.0
+        self._sum_sq: float = 0.0
+        self._sum_base: float = 0.0
+        self._last_err: float = math.nan
+
+    # ===== 予測 =====
+    def predict(self, timestamp: float, joints: np.ndarray, now: float | None = None) -> np.ndarray:
+        """撮影時刻 timestamp の (N,3) 関節を受け取り、now 時点の推定位置を返す。"""
+        joints = np.asarray(joints, np.float64)
+        if now is None:
+            now = time.time()
+        self._score(timestamp, joints)
+        self._update_motion(timestamp, joints)
+
+        age = min(max(now - timestamp, 0.0), self._max_age)
+        if self._vel is None or age == 0.0:
+            predicted = joints
+        else:
+            # --- 減衰付き経過時間 g(τ) = (1 - e^{-kτ}) / k（k→0 で τ） ---
+            k = self._damping
+            g = (1.0 - math.exp(-k * age)) / k if k > 0.0 else age
+            predicted = joints + self._vel * g
+            if self._acc is not None:
+                predicted = predicted + 0.5 * self._acc * g * g
+        self._pending.append((timestamp + age, predicted, joints))
+        return predicted
+
+    def reset(self) -> None:
+        """運動状態と答え合わせ待ちの予測を破棄する（誤差統計は残す）。"""
+        self._last = None
+        self._vel = None
+        self._acc = None
+        self._pending.clear()
+
+    def _update_motion(self, timestamp: float, joints: np.ndarray) -> None:
+        """直前サンプルとの差分から速度・加速度を指数平滑で更新する。"""
+        if self._last is not None:
+            dt = timestamp - self._last[0]
+            if dt > 1e-6:
+                vel = (joints - self._last[1]) / dt
+                a = self._smoothing
+                if self._vel is not None:
+                    acc = (vel - self._vel) / dt
+                    self._acc = acc if self._acc is None else a * acc + (1.0 - a) * self._acc
+                    vel = a * vel + (1.0 - a) * self._vel
+                self._vel = vel
+        self._last = (timestamp, joints)
+
+    # ===== 誤差評価 =====
+    def _score(self, timestamp: float, joints: np.ndarray) -> None:
+        """目標時刻を過ぎた予測を、前後の観測の線形補間と比べて誤差を記録する。"""
+        if self._last is None:
+            return
+        t0, p0 = self._last
+        span = timestamp - t0
+        while self._pending and self._pending[0][0] <= timestamp:
+            target, predicted, base = self._pending.popleft()
+            if target < t0 or span <= 0.0:
+                continue
+            u = (target - t0) / span
+            actual = p0 + (joints - p0) * u
+            err = float(np.nanmean(np.linalg.norm(predicted - actual, axis=1)))
+            base_err = float(np.nanmean(np.linalg.norm(base - actual, axis=1)))
+            if math.isnan(err):
+                continue
+            self._count += 1
+            self._sum_err += err
+            self._sum_sq += err * err
+            self._sum_base += base_err
+            self._last_err = err
+
+    def stats(self) -> Dict[str, float]:
+        """予測誤差（平均・RMS・直近）と、予測しなかった場合の平均誤差を返す。"""
+        n = self._count
+        return {
+            "samples": n,
+            "mean_error": self._sum_err / n if n else math.nan,
+            "rms_error": math.sqrt(self._sum_sq / n) if n else math.nan,
+            "last_error": self._last_err,
+            "mean_error_uncompensated": self._sum_base / n if n else math.nan,
+        }
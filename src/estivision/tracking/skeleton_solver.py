@@ -0,0 +1,165 @@
+# ===== インポート =====
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+# ====
+
+# ===== 定数定義 =====
+# --- MoveNet 17 点の骨（親, 子）。左右対称の骨は同じ長さとして推定する ---
+BONES: np.ndarray = np.array([
+    (0, 1), (0, 2), (1, 3), (2, 4),          # 頭部
+    (5, 6), (11, 12), (5, 11), (6, 12),      # 胴体
+    (5, 7), (7, 9), (6, 8), (8, 10),         # 腕
+    (11, 13), (13, 15), (12, 14), (14, 16),  # 脚
+], np.int64)
+
+# --- 各骨の左右反対側の骨インデックス（なければ -1） ---
+MIRROR: np.ndarray = np.array([
+    1, 0, 3, 2,
+    -1, -1, 7, 6,
+    10, 11, 8, 9,
+    14, 15, 12, 13,
+], np.int64)
+# ====
+
+
+# ===== JIT カーネル =====
+@njit(cache=True)
+def _accumulate_lengths(
+    joints: np.ndarray,
+    conf: np.ndarray,
+    bones: np.ndarray,
+    sum_w: np.ndarray,
+    sum_wl: np.ndarray,
+    min_conf: float,
+    decay: float,
+) -> None:
+    """信頼度を重みに、骨長の指数加重平均の分子・分母を更新する。"""
+    for b in range(bones.shape[0]):
+        i, j = bones[b, 0], bones[b, 1]
+        w = min(conf[i], conf[j])
+        if w < min_conf:
+            continue
+        d = 0.0
+        for k in range(3):
+            diff = joints[j, k] - joints[i, k]
+            d += diff * diff
+        d = np.sqrt(d)
+        if not np.isfinite(d):
+            continue
+        sum_w[b] = sum_w[b] * decay + w
+        sum_wl[b] = sum_wl[b] * decay + w * d
+
+
+@njit(cache=True)
+def _resolve_lengths(sum_w: np.ndarray, sum_wl: np.ndarray, mirror: np.ndarray, out: np.ndarray) -> None:
+    """累積値から骨長を求める。左右対称の骨は両側の観測を合わせて平均する（未観測は NaN）。"""
+    for b in range(sum_w.shape[0]):
+        w, wl = sum_w[b], sum_wl[b]
+        m = mirror[b]
+        if m >= 0:
+            w += sum_w[m]
+            wl += sum_wl[m]
+        out[b] = wl / w if w > 0.0 else np.nan
+
+
+@njit(cache=True)
+def _project(
+    joints: np.ndarray,
+    conf: np.ndarray,
+    bones: np.ndarray,
+    lengths: np.ndarray,
+    iterations: int,
+    out: np.ndarray,
+) -> None:
+    """骨長制約を反復射影で満たす。信頼度の低い関節ほど大きく動かす。"""
+    n = joints.shape[0]
+    inv = np.empty(n)
+    for i in range(n):
+        out[i, 0], out[i, 1], out[i, 2] = joints[i, 0], joints[i, 1], joints[i, 2]
+        inv[i] = 1.0 / max(conf[i], 1e-3)
+
+    for _ in range(iterations):
+        for b in range(bones.shape[0]):
+            target = lengths[b]
+            if not target > 0.0:
+                continue
+            i, j = bones[b, 0], bones[b, 1]
+            dx = out[j, 0] - out[i, 0]
+            dy = out[j, 1] - out[i, 1]
+            dz = out[j, 2] - out[i, 2]
+            d = np.sqrt(dx * dx + dy * dy + dz * dz)
+            if not d > 1e-9:
+                continue
+            s = (d - target) / (d * (inv[i] + inv[j]))
+            ci, cj = inv[i] * s, inv[j] * s
+            out[i, 0] += ci * dx
+            out[i, 1] += ci * dy
+            out[i, 2] += ci * dz
+            out[j, 0] -= cj * dx
+            out[j, 1] -= cj * dy
+            out[j, 2] -= cj * dz
+# ====
+
+
+class SkeletonSolver:
+    """ユーザーの骨長を時間をかけて推定し、毎フレームの 3D 関節を一定骨長の骨格へ当てはめるクラス。"""
+
+    def __init__(
+        self,
+        *,
+        bones: np.ndarray = BONES,
+        mirror: np.ndarray | None = MIRROR,
+        min_conf: float = 0.3,
+        decay: float = 0.995,
+        iterations: int = 4,
+    ) -> None:
+        """骨の定義、骨長推定に使う最小信頼度・忘却率、射影の反復回数を設定する。"""
+        self._bones: np.ndarray = np.ascontiguousarray(bones, np.int64)
+        self._mirror: np.ndarray = (
+            np.full(len(self._bones), -1, np.int64) if mirror is None else np.ascontiguousarray(mirror, np.int64)
+        )
+        self._min_conf: float = min_conf
+        self._decay: float = decay
+        self._iterations: int = iterations
+        self._sum_w: np.ndarray = np.zeros(len(self._bones))
+        self._sum_wl: np.ndarray = np.zeros(len(self._bones))
+        self._lengths: np.ndarray = np.full(len(self._bones), np.nan)
+
+    # ===== 骨長 =====
+    @property
+    def lengths(self) -> np.ndarray:
+        """推定済みの骨長 (B,) を返す（未観測の骨は NaN）。"""
+        return self._lengths.copy()
+
+    def reset(self) -> None:
+        """推定した骨長を破棄する（ユーザー交代時など）。"""
+        self._sum_w[:] = 0.0
+        self._sum_wl[:] = 0.0
+        self._lengths[:] = np.nan
+
+    def update_lengths(self, joints: np.ndarray, conf: np.ndarray) -> None:
+        """1 フレーム分の観測で骨長推定を更新する。"""
+        joints, conf = self._as_arrays(joints, conf)
+        _accumulate_lengths(joints, conf, self._bones, self._sum_w, self._sum_wl, self._min_conf, self._decay)
+        _resolve_lengths(self._sum_w, self._sum_wl, self._mirror, self._lengths)
+
+    # ===== 当てはめ =====
+    def fit(self, joints: np.ndarray, conf: np.ndarray) -> np.ndarray:
+        """現在の骨長で (17,3) 関節を骨格へ射影した結果を返す（骨長は更新しない）。"""
+        joints, conf = self._as_arrays(joints, conf)
+        out = np.empty_like(joints)
+        _project(joints, conf, self._bones, self._lengths, self._iterations, out)
+        return out
+
+    def solve(self, joints: np.ndarray, conf: np.ndarray) -> np.ndarray:
+        """骨長推定の更新と骨格への射影をまとめて行う。"""
+        self.update_lengths(joints, conf)
+        return self.fit(joints, conf)
+
+    @staticmethod
+    def _as_arrays(joints: np.ndarray, conf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """JIT 関数に渡せる連続 float64 配列へ揃える。"""
+        return np.ascontiguousarray(joints, np.float64), np.ascontiguousarray(conf, np.float64)
@@ -0,0 +1,135 @@
+# ===== インポート =====
+from __future__ import annotations
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PySide6.QtCore import QThread, Signal, QObject
+
+from .tracker_pose import synthesize_trackers
+# ====
+
+# ===== 定数定義 =====
+MIN_RATE_HZ: float = 60.0
+MAX_RATE_HZ: float = 120.0
+# ====
+
+_Sample = Tuple[float, np.ndarray, np.ndarray]
+
+
+def slerp_quaternions(q0: np.ndarray, q1: np.ndarray, t: float) -> np.ndarray:
+    """(N,4) 四元数同士を一括で球面補間する（t は外挿のため 0〜1 外も可）。"""
+    dot = np.einsum("ij,ij->i", q0, q1)
+    q1 = np.where(dot[:, None] < 0.0, -q1, q1)       # 最短経路側へ揃える
+    dot = np.clip(np.abs(dot), -1.0, 1.0)
+    theta = np.arccos(dot)
+    sin = np.sin(theta)
+    near = sin < 1e-6
+    safe = np.where(near, 1.0, sin)
+    w0 = np.where(near, 1.0 - t, np.sin((1.0 - t) * theta) / safe)
+    w1 = np.where(near, t, np.sin(t * theta) / safe)
+    q = w0[:, None] * q0 + w1[:, None] * q1
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+class TrackerInterpolator:
+    """低レートの姿勢サンプルから任意時刻のトラッカー姿勢を補間／外挿するクラス（スレッドセーフ）。"""
+
+    def __init__(self, *, delay: float = 0.0, max_extrapolation: float = 0.1) -> None:
+        """表示遅延（補間に回す秒数）と外挿を打ち切る秒数を設定する。"""
+        self._delay: float = delay
+        self._max_extrapolation: float = max_extrapolation
+        self._prev: Optional[_Sample] = None
+        self._last: Optional[_Sample] = None
+        self._lock = threading.Lock()
+
+    def push(self, timestamp: float, positions: np.ndarray, rotations: np.ndarray) -> None:
+        """新しい姿勢サンプルを追加する（時刻が戻るサンプルは捨てる）。"""
+        with self._lock:
+            if self._last is not None and timestamp <= self._last[0]:
+                return
+            self._prev, self._last = self._last, (timestamp, positions, rotations)
+
+    def sample(self, now: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """時刻 now（から delay 戻した時刻）の位置 (N,3)・四元数 (N,4) を返す。サンプルが無ければ None。"""
+        with self._lock:
+            prev, last = self._prev, self._last
+        if last is None:
+            return None
+        if prev is None:
+            return last[1], last[2]
+
+        t0, p0, q0 = prev
+        t1, p1, q1 = last
+        target = min(now - self._delay, t1 + self._max_extrapolation)   # 外挿しすぎたらその場で保持
+        u = (target - t0) / max(t1 - t0, 1e-6)
+        return p0 + (p1 - p0) * u, slerp_quaternions(q0, q1, u)
+
+
+class TrackerClock(QThread):
+    """カメラのフレームレートと独立した一定周期でトラッカー姿勢を出力するスレッド。"""
+
+    poses_ready: Signal = Signal(float, object, object)   # 出力時刻, 位置 (N,3), 四元数 (N,4)
+
+    def __init__(
+        self,
+        rate_hz: float = 90.0,
+        *,
+        delay: float = 0.0,
+        max_extrapolation: float = 0.1,
+        parent: QObject | None = None,
+    ) -> None:
+        """出力レート（60〜120 Hz に制限）と補間設定を保持する。"""
+        super().__init__(parent)
+        self._period: float = 1.0 / min(max(rate_hz, MIN_RATE_HZ), MAX_RATE_HZ)
+        self._interp: TrackerInterpolator = TrackerInterpolator(delay=delay, max_extrapolation=max_extrapolation)
+        self._running: bool = False
+        # --- 統計 ---
+        self.ticks: int = 0
+        self.late_ticks: int = 0
+
+    @property
+    def rate_hz(self) -> float:
+        """実際に使う出力レートを返す。"""
+        return 1.0 / self._period
+
+    # ===== 入力（任意スレッド） =====
+    def push_joints(self, timestamp: float, joints: np.ndarray) -> None:
+        """3D 関節からトラッカー姿勢を合成してサンプルに加える。"""
+        positions, rotations = synthesize_trackers(joints)
+        self._interp.push(timestamp, positions, rotations)
+
+    def push_poses(self, timestamp: float, positions: np.ndarray, rotations: np.ndarray) -> None:
+        """合成済みのトラッカー姿勢をサンプルに加える。"""
+        self._interp.push(timestamp, positions, rotations)
+
+    def stats(self) -> Dict[str, float]:
+        """出力回数と周期に間に合わなかった回数を返す。"""
+        return {"rate_hz": self.rate_hz, "ticks": self.ticks, "late_ticks": self.late_ticks}
+
+    # ===== スレッド本体 =====
+    def run(self) -> None:  # noqa: D401
+        """締切ベースで一定周期に補間結果を送出する。入力待ちはしない。"""
+        self._running = True
+        next_deadline = time.perf_counter()
+        while self._running:
+            pose = self._interp.sample(time.time())
+            if pose is not None:
+                self.poses_ready.emit(time.time(), pose[0], pose[1])
+            self.ticks += 1
+
+            # --- 遅れた周期は詰めて撃たず、次の締切から再開する ---
+            next_deadline += self._period
+            remaining = next_deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+            else:
+                self.late_ticks += 1
+                next_deadline = time.perf_counter()
+
+    # ===== 停止要求 =====
+    def stop(self) -> None:
+        """スレッドを停止する。"""
+        self._running = False
+        self.wait()
@@ -0,0 +1,103 @@
+# ===== インポート =====
+from __future__ import annotations
+from typing import Dict, Tuple
+
+import numpy as np
+# ====
+
+# ===== 定数定義 =====
+TRACKER_NAMES: Tuple[str, ...] = (
+    "hip", "chest",
+    "left_foot", "right_foot",
+    "left_knee", "right_knee",
+    "left_elbow", "right_elbow",
+)
+
+
+def _weights(spec: Dict[int, float]) -> np.ndarray:
+    """{関節番号: 係数} から 17 要素の重みベクトルを作る。"""
+    w = np.zeros(17)
+    for idx, val in spec.items():
+        w[idx] += val
+    return w
+
+
+_HIP_MID = {11: 0.5, 12: 0.5}
+_SHOULDER_MID = {5: 0.5, 6: 0.5}
+_SPINE_UP = {5: 0.5, 6: 0.5, 11: -0.5, 12: -0.5}   # 腰中点 → 肩中点
+_HIP_SIDE = {11: 1.0, 12: -1.0}                     # 右腰 → 左腰
+_SHOULDER_SIDE = {5: 1.0, 6: -1.0}                  # 右肩 → 左肩
+
+# --- トラッカーごとの 原点 / 主軸（+Y） / 横方向の参照（+X 近似） を関節の線形結合で定義 ---
+_ORIGIN: np.ndarray = np.stack([
+    _weights(_HIP_MID),
+    _weights({5: 0.35, 6: 0.35, 11: 0.15, 12: 0.15}),
+    _weights({15: 1.0}), _weights({16: 1.0}),
+    _weights({13: 1.0}), _weights({14: 1.0}),
+    _weights({7: 1.0}), _weights({8: 1.0}),
+])
+_UP: np.ndarray = np.stack([
+    _weights(_SPINE_UP),
+    _weights(_SPINE_UP),
+    _weights({13: 1.0, 15: -1.0}), _weights({14: 1.0, 16: -1.0}),   # 足首 → 膝
+    _weights({11: 1.0, 13: -1.0}), _weights({12: 1.0, 14: -1.0}),   # 膝 → 腰
+    _weights({5: 1.0, 7: -1.0}), _weights({6: 1.0, 8: -1.0}),       # 肘 → 肩
+])
+_SIDE: np.ndarray = np.stack([
+    _weights(_HIP_SIDE),
+    _weights(_SHOULDER_SIDE),
+    _weights(_HIP_SIDE), _weights(_HIP_SIDE),
+    _weights(_HIP_SIDE), _weights(_HIP_SIDE),
+    _weights(_SHOULDER_SIDE), _weights(_SHOULDER_SIDE),
+])
+# ====
+
+
+def matrices_to_quaternions(m: np.ndarray) -> np.ndarray:
+    """(N,3,3) 回転行列を (N,4) 四元数 (x, y, z, w) へ一括変換する。"""
+    m00, m11, m22 = m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]
+    # --- 数値的に安定な成分を軸ごとに選ぶ（各候補を全て計算して選択） ---
+    cand = np.stack([
+        1.0 + m00 + m11 + m22,
+        1.0 + m00 - m11 - m22,
+        1.0 - m00 + m11 - m22,
+        1.0 - m00 - m11 + m22,
+    ], axis=1)
+    best = np.argmax(cand, axis=1)
+    s = 2.0 * np.sqrt(np.maximum(cand[np.arange(len(m)), best], 1e-12))
+    q = np.empty((len(m), 4))
+
+    w = best == 0
+    q[w] = np.stack([
+        (m[w, 2, 1] - m[w, 1, 2]), (m[w, 0, 2] - m[w, 2, 0]), (m[w, 1, 0] - m[w, 0, 1]), 0.25 * s[w] ** 2,
+    ], axis=1)
+    x = best == 1
+    q[x] = np.stack([
+        0.25 * s[x] ** 2, (m[x, 0, 1] + m[x, 1, 0]), (m[x, 0, 2] + m[x, 2, 0]), (m[x, 2, 1] - m[x, 1, 2]),
+    ], axis=1)
+    y = best == 2
+    q[y] = np.stack([
+        (m[y, 0, 1] + m[y, 1, 0]), 0.25 * s[y] ** 2, (m[y, 1, 2] + m[y, 2, 1]), (m[y, 0, 2] - m[y, 2, 0]),
+    ], axis=1)
+    z = best == 3
+    q[z] = np.stack([
+        (m[z, 0, 2] + m[z, 2, 0]), (m[z, 1, 2] + m[z, 2, 1]), 0.25 * s[z] ** 2, (m[z, 1, 0] - m[z, 0, 1]),
+    ], axis=1)
+    q /= s[:, None]
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def synthesize_trackers(joints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(17,3) の 3D 関節（Y 上向き）から各トラッカーの位置 (8,3) と姿勢四元数 (8,4) を求める。"""
+    joints = np.asarray(joints, np.float64)
+    origin = _ORIGIN @ joints
+    up = _UP @ joints
+    side = _SIDE @ joints
+
+    # --- 主軸を Y、横方向を直交化して X、両者の外積を Z とする ---
+    y = up / np.maximum(np.linalg.norm(up, axis=1, keepdims=True), 1e-9)
+    x = side - np.einsum("ij,ij->i", side, y)[:, None] * y
+    x /= np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-9)
+    z = np.cross(x, y)
+    rot = np.stack([x, y, z], axis=2)   # 列ベクトルが各軸
+    return origin, matrices_to_quaternions(rot)
@@ -0,0 +1,58 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from typing import List, Tuple
+
+# --- 自作モジュール ---
+from estivision.pipeline.camera_pipeline import CameraPipelineSet
+# ====
+
+
+# ===== テスト用ストリーム =====
+class FakeStream:
+    """CameraPipeline から受けた休止・付け替え要求を記録する取得スレッドの代用品。"""
+
+    def __init__(self) -> None:
+        """要求の記録を初期化する。"""
+        self.calls: List[Tuple[str, object]] = []
+
+    def suspend(self) -> None:
+        """休止要求を記録する。"""
+        self.calls.append(("suspend", None))
+
+    def set_device(self, device_id: int) -> None:
+        """付け替え要求を記録する。"""
+        self.calls.append(("set_device", device_id))
+
+    def retry_now(self) -> None:
+        """再試行要求を記録する。"""
+        self.calls.append(("retry_now", None))
+# ====
+
+
+def _attach(pipelines: CameraPipelineSet, cam_id: int, device_id: int, key: str) -> FakeStream:
+    """スレッドを起動せずに、cam_id のスロットが device_id（固有 ID key）で取得中の状態にする。"""
+    pipeline = pipelines[cam_id]
+    stream = FakeStream()
+    pipeline._stream = stream          # type: ignore[assignment]
+    pipeline._device_id = device_id
+    pipeline._device_key = key
+    return stream
+
+
+# --- 消えたデバイスのスロットを休止し、戻ったら向け直すか確認 ---
+def test_vanished_device_is_suspended_and_relocated_when_back() -> None:
+    """固有 ID が消えたスロットは番号を手放して休止し、再び現れたら新しい番号で再開することを確認。"""
+    pipelines = CameraPipelineSet(2)
+    stream = _attach(pipelines, 1, 0, "cam-a")
+    _attach(pipelines, 2, 1, "cam-b")
+
+    # --- cam-a が抜け、cam-b が番号 0 に繰り上がった ---
+    assert pipelines.match_devices(["cam-b"]) == {1: None, 2: 0}
+    assert stream.calls == [("suspend", None)]
+    assert pipelines[1].device_id is None and pipelines[1].device_key == "cam-a"
+    assert pipelines.owner_of(0) == 2                  # 古い番号 0 はもう cam 1 のものではない
+
+    # --- cam-a が番号 1 で戻ってきた ---
+    assert pipelines.match_devices(["cam-b", "cam-a"]) == {1: 1, 2: 0}
+    assert stream.calls[-1] == ("set_device", 1)
+    assert pipelines.owner_of(1) == 1
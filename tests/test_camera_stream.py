@@ -0,0 +1,113 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import threading
+
+# --- 自作モジュール ---
+from estivision.camera.camera_stream import CameraStream
+from estivision.camera.capture_backends import FileBackend, SyntheticBackend
+# ====
+
+
+# ===== テスト用バックエンド =====
+class FlakyBackend(SyntheticBackend):
+    """5 フレーム後に抜け、2 回 open に失敗してから戻る合成カメラ。"""
+
+    def __init__(self) -> None:
+        """open の成否と grab 回数を数える。"""
+        super().__init__(64, 48, 1000.0, embed_timestamp=False)
+        self.opens = 0
+        self.grabs = 0
+        self.stream: CameraStream | None = None
+
+    def open(self) -> bool:
+        """2, 3 回目の open だけ失敗させる。"""
+        self.opens += 1
+        if self.opens in (2, 3):
+            return False
+        return super().open()
+
+    def grab(self) -> bool:
+        """最初の接続で 5 フレーム取れたら抜け、再接続後 5 フレームで停止要求を出す。"""
+        if self.opens == 1 and self.grabs == 5:
+            return False
+        if self.grabs == 10:
+            self.stream.stop(wait=False)   # type: ignore[union-attr]
+        self.grabs += 1
+        return super().grab()
+
+
+class SwitchingBackend(SyntheticBackend):
+    """3 フレーム目でデバイスが消えたとして休止させ、0.2 s 後に別の番号で戻す合成カメラ。"""
+
+    def __init__(self) -> None:
+        """開いた番号と grab 回数を記録する。"""
+        super().__init__(64, 48, 1000.0, embed_timestamp=False)
+        self.source: int | str = 0
+        self.opened: list[int | str] = []
+        self.grabs = 0
+        self.stream: CameraStream | None = None
+
+    def set_source(self, source: int | str) -> None:
+        """次回 open する番号を記録する。"""
+        self.source = source
+
+    def open(self) -> bool:
+        """開いた番号を記録して開く。"""
+        self.opened.append(self.source)
+        return super().open()
+
+    def grab(self) -> bool:
+        """3 回目で休止させて番号の付け替えを予約し、6 回目で停止要求を出す。"""
+        self.grabs += 1
+        if self.grabs == 3:
+            self.stream.suspend()   # type: ignore[union-attr]
+            threading.Timer(0.2, self.stream.set_device, (1,)).start()   # type: ignore[union-attr]
+        if self.grabs == 6:
+            self.stream.stop(wait=False)   # type: ignore[union-attr]
+        return super().grab()
+# ====
+
+
+# --- 抜けてもバックオフで開き直し、連番が途切れないか確認 ---
+def test_reopens_with_backoff_and_keeps_sequence() -> None:
+    """5 フレーム後の抜けから 3 回目の open で復帰し、前後の連番が連続することを確認。"""
+    backend = FlakyBackend()
+    stream = CameraStream(backend=backend, fps=1000, reconnect=True)
+    backend.stream = stream
+    events, modes, seqs = [], [], []
+    stream.disconnected.connect(lambda: events.append(("lost", len(seqs))))
+    stream.reconnected.connect(lambda sec: events.append(("back", sec)))
+    stream.mode_negotiated.connect(modes.append)
+    stream.frame_ready.connect(lambda frame, ts, seq: seqs.append(seq))
+
+    stream.run()   # 同期実行
+
+    assert [e[0] for e in events] == ["lost", "back"]
+    assert events[0][1] == 5                        # 5 フレーム配信した後で抜けた
+    assert 0.1 < events[1][1] < 1.0                 # 0.05 + 0.1 s 待って 3 回目で復帰
+    assert backend.opens == 4
+    assert seqs == list(range(11))                  # 抜けの前後で連番が連続（停止要求と同じ回の 1 枚まで）
+    assert len(modes) == 2                          # 再接続後にもモードを通知
+
+
+# --- 動画ファイルは既定では開き直さないか確認 ---
+def test_reconnect_defaults_to_live_devices_only() -> None:
+    """実デバイス以外（動画・合成映像）では既定で再接続しないことを確認。"""
+    assert not CameraStream(backend=SyntheticBackend())._reconnect
+    assert not CameraStream(backend=FileBackend("missing.mp4"))._reconnect
+
+
+# --- 休止中は古い番号で開き直さないか確認 ---
+def test_suspended_stream_waits_for_set_device() -> None:
+    """休止した取得は古い番号を開き直さずに待ち、set_device で新しい番号から再開することを確認。"""
+    backend = SwitchingBackend()
+    stream = CameraStream(backend=backend, fps=1000, reconnect=True)
+    backend.stream = stream
+    events = []
+    stream.disconnected.connect(lambda: events.append("lost"))
+    stream.reconnected.connect(lambda sec: events.append(("back", sec)))
+
+    stream.run()   # 同期実行
+
+    assert backend.opened == [0, 1]                  # 休止中に番号 0 を開き直していない
+    assert events[0] == "lost" and events[1][0] == "back" and events[1][1] >= 0.19
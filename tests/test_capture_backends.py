@@ -0,0 +1,153 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# --- 外部ライブラリ ---
+import cv2
+import numpy as np
+import pytest
+
+# --- 自作モジュール ---
+from estivision.camera.capture_backends import (
+    FileBackend,
+    OpenCVBackend,
+    SyntheticBackend,
+    create_backend,
+    latch_frames,
+    read_embedded_timestamp,
+    write_embedded_timestamp,
+)
+# ====
+
+
+# ===== テスト用バックエンド =====
+class RecordingBackend(SyntheticBackend):
+    """grab / retrieve の呼び出し順を共有リストへ記録する合成カメラ。"""
+
+    def __init__(self, name: str, calls: List[Tuple[str, str]], *, ok: bool = True) -> None:
+        """記録名と、grab を成功させるかを指定する。"""
+        super().__init__(64, 48, 1000.0, embed_timestamp=False)
+        self._name = name
+        self._calls = calls
+        self._ok = ok
+
+    def grab(self) -> bool:
+        """呼び出しを記録して grab する。"""
+        self._calls.append(("grab", self._name))
+        return self._ok and super().grab()
+
+    def retrieve(self) -> Tuple[bool, np.ndarray | None]:
+        """呼び出しを記録して retrieve する。"""
+        self._calls.append(("retrieve", self._name))
+        return super().retrieve()
+# ====
+
+
+def _write_video(path: Path, frames: int = 3) -> Path:
+    """フレーム番号を明るさにした 64×48 の MJPG 動画を書き出す。"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), 40 + 80 * i, np.uint8))
+    writer.release()
+    return path
+
+
+# --- 全カメラを grab してから retrieve するか確認 ---
+def test_latch_frames_grabs_all_before_retrieving() -> None:
+    """latch_frames が全バックエンドの grab を済ませてからデコードし、失敗した分は None を返すことを確認。"""
+    calls: List[Tuple[str, str]] = []
+    backends = [RecordingBackend("a", calls), RecordingBackend("b", calls), RecordingBackend("c", calls, ok=False)]
+    for backend in backends:
+        backend.open()
+
+    results = latch_frames(backends)
+
+    assert calls == [("grab", "a"), ("grab", "b"), ("grab", "c"), ("retrieve", "a"), ("retrieve", "b")]
+    assert [ok for ok, _, _ in results] == [True, True, False]
+    assert results[0][1].shape == (48, 64, 3) and results[2][1] is None
+    stamps = [ts for _, _, ts in results]
+    assert stamps == sorted(stamps) and stamps[-1] - stamps[0] < 0.05   # grab 直後の時刻が近い
+
+
+# --- 合成カメラが露光時刻を埋め込み、設定を反映するか確認 ---
+def test_synthetic_backend_embeds_grab_time_and_applies_configure() -> None:
+    """retrieve した画像から grab 時刻が読め、configure の未指定項目は元の値が残ることを確認。"""
+    backend = SyntheticBackend(320, 240, 1000.0)
+    assert backend.open() and backend.is_opened() and not backend.live
+    before = time.time()
+    assert backend.grab()
+    ok, frame = backend.retrieve()
+    assert ok and frame.shape == (240, 320, 3)
+    assert before <= read_embedded_timestamp(frame) <= time.time()
+
+    backend.configure(width=400, fps=None, fourcc="MJPG")
+    assert backend.frame_size() == (400, 240) and backend.fps() == 1000.0
+    backend.grab()
+    assert backend.retrieve()[1].shape == (240, 400, 3)
+
+    backend.release()
+    assert not backend.grab()
+    with pytest.raises(ValueError):
+        SyntheticBackend(pattern="unknown")
+
+
+# --- 埋め込みタイムスタンプの往復と、小さい画像での扱いを確認 ---
+def test_embedded_timestamp_round_trips_and_skips_small_frames() -> None:
+    """書いた時刻がそのまま読め、埋め込めない小さな画像や未記入の画像では None になることを確認。"""
+    frame = np.zeros((8, 256, 3), np.uint8)
+    write_embedded_timestamp(frame, 1234.5)
+    assert read_embedded_timestamp(frame) == 1234.5
+    assert read_embedded_timestamp(np.zeros((8, 256, 3), np.uint8)) is None
+
+    small = np.zeros((8, 64, 3), np.uint8)
+    write_embedded_timestamp(small, 1234.5)
+    assert not small.any() and read_embedded_timestamp(small) is None
+
+
+# --- 動画ファイルの再生と巻き戻しを確認 ---
+def test_file_backend_loops_and_ignores_configure(tmp_path: Path) -> None:
+    """loop=True なら末尾で先頭へ戻り、False なら止まり、解像度の要求は無視されることを確認。"""
+    path = _write_video(tmp_path / "clip.avi")
+
+    looping = FileBackend(path)
+    assert looping.open() and not looping.live
+    looping.configure(width=320, height=240, fourcc="YUYV")
+    assert looping.frame_size() == (64, 48)
+    levels = []
+    for _ in range(4):
+        ok, frame = looping.read()
+        assert ok
+        levels.append(int(frame.mean()))
+    assert levels[3] == pytest.approx(levels[0], abs=4)   # 4 枚目は先頭に戻る
+    looping.release()
+
+    once = FileBackend(path, loop=False)
+    once.open()
+    assert [once.grab() for _ in range(4)] == [True, True, True, False]
+    once.release()
+    assert not FileBackend(tmp_path / "missing.avi").open()
+
+
+# --- OpenCV バックエンドの設定が失敗せず無視されるか確認 ---
+def test_opencv_backend_configure_falls_back_safely(tmp_path: Path) -> None:
+    """未オープン時や FOURCC にならない形式を渡しても configure が例外にならないことを確認。"""
+    backend = OpenCVBackend(str(_write_video(tmp_path / "clip.avi")))
+    backend.configure(width=64, fourcc="MJPG")                  # 未オープンなら何もしない
+    assert backend.frame_size() == (0, 0) and backend.fourcc() == "" and backend.fps() == 0.0
+    assert backend.open()
+    backend.configure(fourcc="XRGB8888", buffer_size=1)        # 不正な FOURCC と未対応項目は無視
+    assert backend.frame_size() == (64, 48)
+    assert backend.grab() and backend.retrieve()[0]
+    backend.release()
+    assert not backend.is_opened()
+
+
+# --- 名前からバックエンドを生成できるか確認 ---
+def test_create_backend_by_name() -> None:
+    """名前に応じたクラスが生成され、未知の名前は ValueError になることを確認。"""
+    assert isinstance(create_backend("synthetic", width=32, height=24), SyntheticBackend)
+    assert isinstance(create_backend("file", "clip.avi"), FileBackend)
+    with pytest.raises(ValueError):
+        create_backend("unknown")
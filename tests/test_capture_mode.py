@@ -0,0 +1,71 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from types import SimpleNamespace
+
+# --- 自作モジュール ---
+from estivision.camera.capture_mode import (
+    CaptureMode, _pixel_format_name, device_capture_modes, negotiation_report, select_capture_mode,
+)
+# ====
+
+
+# ===== 定数定義 =====
+MODES = [
+    CaptureMode(1920, 1080, 30, "MJPG"),
+    CaptureMode(1280, 720, 30, "MJPG"),
+    CaptureMode(640, 480, 30, "YUYV"),
+    CaptureMode(640, 480, 30, "MJPG"),
+    CaptureMode(352, 288, 10, "YUYV"),
+    CaptureMode(320, 240, 30, "YUYV"),
+]
+# ====
+
+
+def _format(width: int, height: int, fps: float, pixel_format: str) -> SimpleNamespace:
+    """QCameraFormat と同じ呼び方で解像度・上限 fps・Qt の画素形式名を返す代用品を作る。"""
+    return SimpleNamespace(
+        resolution=lambda: SimpleNamespace(width=lambda: width, height=lambda: height),
+        maxFrameRate=lambda: fps,
+        pixelFormat=lambda: SimpleNamespace(name=pixel_format),
+    )
+
+
+# --- モデル入力と fps を満たす最小モードを選ぶか確認 ---
+def test_picks_smallest_mode_covering_model_input_and_fps() -> None:
+    """入力辺と fps を満たすモードのうち、最も負荷の低いものが選ばれることを確認。"""
+    assert select_capture_mode(MODES, 192, 15) == CaptureMode(320, 240, 30, "YUYV")
+    assert select_capture_mode(MODES, 256, 15) == CaptureMode(640, 480, 30, "YUYV")
+    assert select_capture_mode(MODES, 256, 5) == CaptureMode(352, 288, 10, "YUYV")
+
+
+# --- 満たすモードが無いときの代替を確認 ---
+def test_falls_back_to_largest_when_nothing_covers() -> None:
+    """条件を満たすモードが無ければ fps を守れる最大解像度、一覧が空なら None になることを確認。"""
+    assert select_capture_mode(MODES[4:], 256, 15) == CaptureMode(320, 240, 30, "YUYV")
+    assert select_capture_mode([], 192, 15) is None
+
+
+# --- 要求と実際のモードの不一致を検出するか確認 ---
+def test_negotiation_report_detects_mismatch() -> None:
+    """ドライバが要求と異なる解像度を返したとき matched が False になることを確認。"""
+    requested = CaptureMode(320, 240, 15, "YUYV")
+    assert negotiation_report(requested, 320, 240, 15.0, "YUYV")["matched"]
+    assert not negotiation_report(requested, 640, 480, 15.0, "YUYV")["matched"]
+
+
+# --- FOURCC で表せない画素形式のモードを選ばないか確認 ---
+def test_unmappable_pixel_formats_are_never_selected() -> None:
+    """Qt 固有の画素形式は一覧から外れ、小さくても MJPG より優先されないことを確認。"""
+    assert _pixel_format_name(SimpleNamespace(name="Format_YUV420P")) == "I420"
+    assert _pixel_format_name(SimpleNamespace(name="Format_XRGB8888")) == ""
+
+    device = SimpleNamespace(videoFormats=lambda: [
+        _format(320, 240, 30, "Format_XRGB8888"),
+        _format(640, 480, 30, "Format_Jpeg"),
+    ])
+    assert device_capture_modes(device) == [CaptureMode(640, 480, 30, "MJPG")]
+
+    # --- 直接渡されたモード一覧でも FOURCC にならない形式は除く ---
+    modes = [CaptureMode(320, 240, 30, "XRGB8888"), CaptureMode(640, 480, 30, "MJPG")]
+    assert select_capture_mode(modes, 192, 15) == CaptureMode(640, 480, 30, "MJPG")
+    assert select_capture_mode(modes[:1], 192, 15) is None
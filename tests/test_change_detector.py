@@ -0,0 +1,27 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.change_detector import ChangeDetector
+# ====
+
+
+# --- 静止フレームを動きか期限切れまで読み飛ばすか確認 ---
+def test_skips_static_frames_until_motion_or_max_reuse() -> None:
+    """ノイズ程度の差は静止扱いとし、使い回し期限切れと大きな動きで再推論させることを確認。"""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+    detector = ChangeDetector(max_reuse=0.5)
+
+    assert detector.changed(frame, 0.0)
+    detector.commit(0.0)
+    noisy = np.clip(frame.astype(np.int16) + rng.integers(-2, 3, frame.shape), 0, 255).astype(np.uint8)
+    assert not detector.changed(noisy, 0.1)          # センサーノイズ程度は静止扱い
+    assert detector.changed(noisy, 0.6)              # 使い回し期限切れ
+    detector.commit(0.6)
+
+    moved = frame.copy()
+    moved[60:180, 80:240] = 255                      # 人が入ってきた
+    assert detector.changed(moved, 0.7)
+    assert detector.stats() == {"checked": 4, "skipped": 1}
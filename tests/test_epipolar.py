@@ -0,0 +1,51 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from typing import Tuple
+
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.tracking.epipolar import EpipolarValidator, epipolar_distances, fundamental_from_stereo
+# ====
+
+
+def _project(K: np.ndarray, R: np.ndarray, t: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """3 次元点をカメラ (K, R, t) の画素座標へ投影する。"""
+    x = (X @ R.T + t) @ K.T
+    return x[:, :2] / x[:, 2:]
+
+
+def _setup() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ステレオ配置の基礎行列と、17 点を両カメラへ投影した座標を返す。"""
+    K = np.array([[500.0, 0, 320], [0, 500, 240], [0, 0, 1]])
+    a = np.deg2rad(20)
+    R = np.array([[np.cos(a), 0, np.sin(a)], [0, 1, 0], [-np.sin(a), 0, np.cos(a)]])
+    T = np.array([-0.5, 0.0, 0.1])
+    X = np.random.default_rng(0).uniform([-0.5, -0.8, 2.5], [0.5, 0.8, 3.5], (17, 3))
+    pts1 = _project(K, np.eye(3), np.zeros(3), X)
+    pts2 = _project(K, R, T, X)
+    return fundamental_from_stereo(K, K, R, T), pts1, pts2
+
+
+# --- 正しい対応点のエピポーラ距離が 0 に近いか確認 ---
+def test_true_correspondences_have_small_distance() -> None:
+    """同じ 3 次元点の投影同士ではエピポーラ距離がほぼ 0 になることを確認。"""
+    F, pts1, pts2 = _setup()
+    assert epipolar_distances(F, pts1, pts2).max() < 1e-6
+
+
+# --- 左右の取り違えを直し、誤検出を除外するか確認 ---
+def test_swapped_legs_are_restored_and_outliers_rejected() -> None:
+    """左右を取り違えた脚は入れ替えて戻し、どちらとも合わない点は無効にすることを確認。"""
+    F, pts1, pts2 = _setup()
+    bad = pts2.copy()
+    bad[[13, 14, 15, 16]] = pts2[[14, 13, 16, 15]]   # カメラ 2 で左右の脚を取り違え
+    bad[0] += [0.0, 80.0]                             # 背景を鼻と誤検出
+    scores = np.full(17, 0.9)
+
+    validator = EpipolarValidator(F, max_distance=3.0)
+    out = validator.validate(pts1, scores, bad, scores)
+    np.testing.assert_allclose(out["kps2"][1:], pts2[1:])
+    assert out["valid"].tolist() == [False] + [True] * 16
+    assert validator.stats() == {"frames": 1, "swapped": 2, "rejected": 1}
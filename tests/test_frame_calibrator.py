@@ -0,0 +1,19 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.camera.frame_calibrator import spans_board_plane
+# ====
+
+
+# --- 一部だけ写った ChArUco ビューの退化判定を確認 ---
+def test_rejects_collinear_partial_views() -> None:
+    """1 行・斜め 1 列に並んだコーナーは不採用、2 行以上に広がれば採用されることを確認。"""
+    row = np.array([[x, 0, 0] for x in range(6)], np.float32)
+    diagonal = np.array([[x, x, 0] for x in range(6)], np.float32)
+    block = np.array([[x, y, 0] for x in range(3) for y in range(2)], np.float32)
+
+    assert not spans_board_plane(row)
+    assert not spans_board_plane(diagonal)
+    assert spans_board_plane(block.reshape(-1, 1, 3))   # matchImagePoints の (N,1,3) 形状
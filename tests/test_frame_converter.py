@@ -0,0 +1,32 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.camera.frame_converter import FrameConverter
+# ====
+
+
+# --- GUI が手放したバッファだけ使い回すか確認 ---
+def test_buffers_are_reused_only_after_images_are_released() -> None:
+    """保持中の QImage のバッファは上書きせず、解放後はプールから使い回すことを確認。"""
+    converter = FrameConverter(pool_size=2)
+    frame = np.random.default_rng(0).integers(0, 255, (48, 64, 3), dtype=np.uint8)
+
+    held = [converter.convert(frame) for _ in range(3)]   # GUI がまだ保持中
+    assert converter.stats() == {"reused": 0, "allocated": 2, "overflow": 1}
+    assert held[0].pixelColor(1, 2).getRgb()[:3] == tuple(int(v) for v in frame[2, 1, ::-1])
+
+    del held
+    for _ in range(4):
+        converter.convert(frame)
+    assert converter.stats()["allocated"] == 2
+    assert converter.stats()["reused"] == 4
+
+
+# --- 表示サイズまで縮小するか確認 ---
+def test_downscales_to_max_size() -> None:
+    """長辺が max_size を超えるフレームは縦横比を保って縮小されることを確認。"""
+    converter = FrameConverter(max_size=32)
+    img = converter.convert(np.zeros((48, 64, 3), np.uint8))
+    assert (img.width(), img.height()) == (32, 24)
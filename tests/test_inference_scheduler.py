@@ -0,0 +1,133 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import time
+from types import SimpleNamespace
+from typing import List
+
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.inference_scheduler import InferenceScheduler
+# ====
+
+
+# ===== 定数定義 =====
+_FRAME: np.ndarray = np.zeros((48, 64, 3), np.uint8)
+# ====
+
+
+# ===== テスト用プロセッサ =====
+class FakeProcessor:
+    """ログを開閉したことと、そのときスケジューラのロックを持っていたかを記録するプロセッサ。"""
+
+    def __init__(self, scheduler: InferenceScheduler) -> None:
+        """監視するスケジューラを保持する。"""
+        self.estimator: object = None
+        self.events: List[str] = []
+        self._scheduler = scheduler
+
+    def open(self) -> None:
+        """開いたことを記録する。"""
+        self.events.append("open-locked" if self._scheduler._cond._is_owned() else "open")
+
+    def close(self) -> None:
+        """閉じたことを記録する。"""
+        self.events.append("close-locked" if self._scheduler._cond._is_owned() else "close")
+# ====
+
+
+def _scheduler(cams: int, *, batchable: bool = False, **kwargs: object) -> InferenceScheduler:
+    """スレッドを起動せず、cams 台を FakeProcessor で登録したスケジューラを返す。"""
+    scheduler = InferenceScheduler(**kwargs)   # type: ignore[arg-type]
+    scheduler._est = SimpleNamespace(batchable=batchable, multipose=False)   # type: ignore[assignment]
+    for cam_id in range(1, cams + 1):
+        scheduler.register(cam_id, skip_static=False, enhance_low_light=False, idle_when_absent=False)
+        scheduler._slots[cam_id].processor = FakeProcessor(scheduler)   # type: ignore[assignment]
+    return scheduler
+
+
+def _submit_all(scheduler: InferenceScheduler, seq: int) -> None:
+    """登録済みの全カメラへ現在時刻のフレームを送る。"""
+    for cam_id in scheduler._slots:
+        scheduler.submit(cam_id, _FRAME, time.time(), seq)
+
+
+def _served(scheduler: InferenceScheduler) -> List[int]:
+    """次のバッチに選ばれたカメラ番号を返す。"""
+    return [slot.channel.cam_id for slot, _ in scheduler._next_batch()]
+
+
+# --- カメラごとに最新フレームだけを保持するか確認 ---
+def test_submit_keeps_only_the_freshest_frame() -> None:
+    """未処理のフレームは新しいもので置き換えて上書き数を数え、未登録カメラへの送信は無視することを確認。"""
+    scheduler = _scheduler(1)
+    scheduler.submit(1, _FRAME, time.time(), 0)
+    scheduler.submit(1, _FRAME, time.time(), 1)
+    scheduler.submit(9, _FRAME, time.time(), 0)
+
+    batch = scheduler._next_batch()
+    assert [(slot.channel.cam_id, item[2]) for slot, item in batch] == [(1, 1)]
+    slot = scheduler._slots[1]
+    assert slot.overwritten == 1 and slot.served == 1 and 9 not in scheduler._slots
+
+
+# --- ラウンドロビンで全カメラを順に処理するか確認 ---
+def test_round_robin_serves_the_longest_waiting_camera() -> None:
+    """1 台ずつの推論では、最後に処理されてから最も待っているカメラが選ばれ全台が一巡することを確認。"""
+    scheduler = _scheduler(3)
+    order = []
+    for seq in range(6):
+        _submit_all(scheduler, seq)
+        order += _served(scheduler)
+    assert order[:3] == [1, 2, 3] and order[3:] == order[:3]
+
+
+# --- 優先度方針で優先カメラを先に処理するか確認 ---
+def test_priority_policy_prefers_higher_priority() -> None:
+    """priority 方針では直前に処理したばかりでも優先度の高いカメラが選ばれることを確認。"""
+    scheduler = _scheduler(2, policy="priority")
+    scheduler._slots[2].priority = 5
+    for seq in range(3):
+        _submit_all(scheduler, seq)
+        assert _served(scheduler) == [2]
+    assert _served(scheduler) == [1]   # 優先カメラのフレームが無ければ残りを処理
+
+
+# --- 締切を過ぎたフレームを推論せず捨てるか確認 ---
+def test_frames_older_than_max_age_are_dropped() -> None:
+    """max_age より古いフレームはバッチに入れず、期限切れ破棄数に数えることを確認。"""
+    scheduler = _scheduler(2, max_age=0.25)
+    scheduler.submit(1, _FRAME, time.time() - 1.0, 0)
+    scheduler.submit(2, _FRAME, time.time(), 0)
+
+    assert _served(scheduler) == [2]
+    assert scheduler._slots[1].dropped_stale == 1 and scheduler._slots[1].pending is None
+
+
+# --- まとめて推論できるモデルだけ複数カメラをまとめるか確認 ---
+def test_batch_size_follows_batchable_and_max_batch() -> None:
+    """batchable なモデルでは max_batch 台まで、そうでなければ 1 台ずつ取り出すことを確認。"""
+    batched = _scheduler(3, batchable=True, max_batch=2)
+    _submit_all(batched, 0)
+    assert len(batched._next_batch()) == 2
+    assert len(batched._next_batch()) == 1
+
+    single = _scheduler(3, batchable=False, max_batch=2)
+    _submit_all(single, 0)
+    assert len(single._next_batch()) == 1
+
+
+# --- ログの開閉をロック外で行うか確認 ---
+def test_processors_open_and_close_outside_the_lock() -> None:
+    """初回に選ばれたカメラのログは 1 回だけ開き、解除したカメラのログを閉じるのもロック外であることを確認。"""
+    scheduler = _scheduler(1)
+    processor = scheduler._slots[1].processor
+    for seq in range(2):
+        scheduler.submit(1, _FRAME, time.time(), seq)
+        scheduler._next_batch()
+    assert processor.estimator is scheduler._est
+
+    scheduler.unregister(1)
+    scheduler._next_batch()
+    assert processor.events == ["open", "close"]
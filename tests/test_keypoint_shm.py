@@ -0,0 +1,85 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import subprocess
+import sys
+import uuid
+from multiprocessing import shared_memory
+
+# --- 外部ライブラリ ---
+import numpy as np
+import pytest
+
+# --- 自作モジュール ---
+from estivision.pose.keypoint_shm import _HEADER, MAGIC, KeypointPublisher, KeypointReader
+# ====
+
+
+def _unique_name() -> str:
+    """テストごとに衝突しない共有メモリ名を返す。"""
+    return f"estivision_test_{uuid.uuid4().hex[:8]}"
+
+
+# --- 別プロセスの読み手が最新結果を読めるか確認 ---
+def test_reader_sees_latest_keypoints_from_another_process() -> None:
+    """書き込んだ結果を同一・別プロセスから読め、読み手の終了で共有メモリが消えないことを確認。"""
+    name = _unique_name()
+    publisher = KeypointPublisher(2, name=name)
+    try:
+        reader = KeypointReader(name=name)
+        assert reader.slots == 2
+        assert reader.read(0) is None                 # 未書き込み
+
+        kps = np.arange(34, dtype=np.int32).reshape(17, 2)
+        scores = np.linspace(0, 1, 17, dtype=np.float32)
+        publisher.publish(1, 12.5, 7, kps, scores)
+        result = reader.read(1)
+        assert result["seq"] == 7 and result["timestamp"] == 12.5
+        np.testing.assert_array_equal(result["keypoints"], kps)
+        np.testing.assert_allclose(result["scores"], scores)
+        assert reader.counter(1) == result["counter"] == 2
+
+        # --- 別プロセスから読める（終了しても共有メモリは消えない） ---
+        code = (
+            "from estivision.pose.keypoint_shm import KeypointReader\n"
+            f"with KeypointReader(name={name!r}) as r:\n"
+            "    print(r.read(1)['seq'])\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "7"
+        assert reader.read(1)["seq"] == 7
+        reader.close()
+    finally:
+        publisher.close()
+
+
+# --- 使用中の共有メモリを横取りしないか確認 ---
+def test_second_publisher_fails_while_writer_is_alive() -> None:
+    """書き手が生きている間は 2 つ目の KeypointPublisher が FileExistsError になり、既存の読み手が切れないことを確認。"""
+    name = _unique_name()
+    publisher = KeypointPublisher(1, name=name)
+    try:
+        publisher.publish(0, 1.0, 3, np.zeros((17, 2)), np.ones(17))
+        with pytest.raises(FileExistsError):
+            KeypointPublisher(1, name=name)
+        with KeypointReader(name=name) as reader:
+            assert reader.read(0)["seq"] == 3
+    finally:
+        publisher.close()
+
+
+# --- 異常終了した書き手の残骸だけ作り直すか確認 ---
+@pytest.mark.skipif(sys.platform == "win32", reason="Windows では残骸が残らない")
+def test_stale_segment_from_dead_writer_is_reclaimed() -> None:
+    """書き手の PID が存在しない残骸は作り直されることを確認。"""
+    name = _unique_name()
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    stale = shared_memory.SharedMemory(name=name, create=True, size=_HEADER.size + 512)
+    _HEADER.pack_into(stale.buf, 0, MAGIC, 2, 1, 17, 0, int(dead.stdout))
+    stale.close()
+
+    publisher = KeypointPublisher(1, name=name)
+    try:
+        with KeypointReader(name=name) as reader:
+            assert reader.slots == 1
+    finally:
+        publisher.close()
@@ -0,0 +1,28 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.low_light import LowLightEnhancer
+# ====
+
+
+# --- 暗いフレームだけ補正するか確認 ---
+def test_only_dark_frames_are_enhanced() -> None:
+    """明るいフレームはそのまま返し、暗いフレームはガンマ補正して LUT を使い回すことを確認。"""
+    rng = np.random.default_rng(0)
+    bright = rng.integers(60, 250, (240, 320, 3), dtype=np.uint8)
+    dark = (bright // 6).astype(np.uint8)
+
+    enhancer = LowLightEnhancer()
+    assert enhancer.apply(bright) is bright                  # 明るいフレームはそのまま
+    assert enhancer.last["action"] == "none"
+
+    enhancer.reset()
+    out = enhancer.apply(dark)
+    assert "gamma" in enhancer.last["action"] and out is not dark
+    assert out.mean() > 2 * dark.mean()
+    enhancer.apply(dark)
+    assert len(enhancer._luts) == 1                          # 同じガンマの LUT を使い回す
+    stats = enhancer.stats()
+    assert stats["enhance_frames"] == 3 and stats["enhance_gamma"] == 2
@@ -0,0 +1,56 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.person_tracker import PersonTracker
+from estivision.pose.pose_estimator import decode_multipose
+# ====
+
+
+def _person(x: float, y: float, size: float = 100.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(x, y) から size 四方に収まる 1 人分のキーポイント・スコア・矩形を返す。"""
+    rng = np.random.default_rng(0)
+    kps = np.stack([rng.uniform(x, x + size, 17), rng.uniform(y, y + size, 17)], axis=1)
+    return kps.astype(np.int32), np.full(17, 0.9, np.float32), np.array([x, y, x + size, y + size], np.float32)
+
+
+# --- 検出順が入れ替わっても ID が変わらないか確認 ---
+def test_ids_stay_stable_when_order_changes() -> None:
+    """少し動いて検出順が入れ替わっても、同じ人物に同じ ID が付くことを確認。"""
+    a, b = _person(0, 0), _person(300, 0)
+    tracker = PersonTracker()
+    ids1 = tracker.update(np.stack([a[0], b[0]]), np.stack([a[1], b[1]]), np.stack([a[2], b[2]]))
+
+    a2, b2 = _person(5, 3), _person(310, 2)
+    ids2 = tracker.update(np.stack([b2[0], a2[0]]), np.stack([b2[1], a2[1]]), np.stack([b2[2], a2[2]]))
+    assert ids2.tolist() == ids1[::-1].tolist()
+
+
+# --- 短い隠れでは追跡対象を保ち、max_age 後に切り替えるか確認 ---
+def test_target_survives_short_occlusion_and_is_replaced_after_max_age() -> None:
+    """追跡対象が max_age フレームまで見えなくても保持され、それを超えると残った人物へ移ることを確認。"""
+    a, b = _person(0, 0, 200), _person(300, 0)
+    tracker = PersonTracker(max_age=2)
+    ids = tracker.update(np.stack([a[0], b[0]]), np.stack([a[1], b[1]]), np.stack([a[2], b[2]]))
+    target = tracker.target_id
+    assert target == ids[0]  # 大きく写っている方
+
+    for _ in range(2):
+        tracker.update(b[0][None], b[1][None], b[2][None])
+        assert tracker.target_id == target
+    tracker.update(b[0][None], b[1][None], b[2][None])
+    assert tracker.target_id == ids[1]
+
+
+# --- MultiPose 出力を画素座標へ変換し、空の枠を除くか確認 ---
+def test_decode_multipose_filters_and_converts() -> None:
+    """正規化座標を画素座標と矩形へ変換し、人物スコアの低い枠を除外することを確認。"""
+    raw = np.zeros((1, 6, 56), np.float32)
+    raw[0, 0, :51] = np.tile([0.5, 0.25, 0.8], 17)
+    raw[0, 0, 51:56] = [0.1, 0.2, 0.9, 0.6, 0.7]
+    kps, scores, boxes, person = decode_multipose(raw[0], 400, 200)
+    assert kps.shape == (1, 17, 2)
+    assert kps[0, 0].tolist() == [100, 100]
+    np.testing.assert_allclose(boxes[0], [80, 20, 240, 180])
+    np.testing.assert_allclose(person, [0.7])
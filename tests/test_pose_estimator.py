@@ -0,0 +1,24 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.pose_estimator import PoseEstimator
+# ====
+
+
+# --- IOBinding 経路が通常の推論と一致し、バッファを使い回すか確認 ---
+def test_iobinding_path_matches_run_and_reuses_buffers() -> None:
+    """estimate_bound が estimate と同じ結果を返し、2 回目以降は同じ配列へ上書きすることを確認。"""
+    estimator = PoseEstimator(providers=["CPUExecutionProvider"])
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (240, 320, 3), dtype=np.uint8) for _ in range(2)]
+
+    first_kps, first_scores = estimator.estimate_bound(frames[0])
+    ref_kps, ref_scores = estimator.estimate(frames[0])
+    np.testing.assert_array_equal(first_kps, ref_kps)
+    np.testing.assert_allclose(first_scores, ref_scores)
+
+    kps, scores = estimator.estimate_bound(frames[1])
+    assert kps is first_kps and np.shares_memory(scores, first_scores)   # 同じバッファに上書き
+    np.testing.assert_array_equal(kps, estimator.estimate(frames[1])[0])
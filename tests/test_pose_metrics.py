@@ -0,0 +1,33 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.pose_metrics import pareto_front, person_reference, summarize
+# ====
+
+
+# --- OKS と PCK が正解のある関節だけで計算されるか確認 ---
+def test_oks_and_pck_use_only_visible_joints() -> None:
+    """正解の無い関節は NaN とし、関節ごとの σ で OKS の寛容さが変わることを確認。"""
+    gt = np.tile(np.arange(17, dtype=np.float64)[:, None] * 10, (2, 1, 2))
+    pred = gt.copy()
+    pred[1, :, 0] += 30                        # 2 人目は全関節が右へ 30px ずれる
+    visible = np.ones((2, 17), bool)
+    visible[:, 0] = False                      # 鼻は正解なし
+    area, ref = person_reference(np.array([[0, 0, 100, 200], [0, 0, 100, 200]]))
+
+    result = summarize(pred, gt, visible, area, ref, alpha=0.2)
+    assert np.isnan(result["oks_per_joint"][0])
+    assert np.all(result["pck_per_joint"][1:] == 1.0)          # 30px ≤ 0.2 × 200
+    oks = result["oks_per_joint"][1:]
+    assert np.all((oks > 0.5) & (oks < 1.0))                   # 1 人は完全一致、1 人はずれ
+    assert result["oks_per_joint"][11] > result["oks_per_joint"][1]   # σ の大きい腰は目より寛容
+
+
+# --- パレート最適な設定だけ残すか確認 ---
+def test_pareto_front_keeps_non_dominated_configs() -> None:
+    """コストと精度の両方で劣る設定を除き、コスト順に並べて返すことを確認。"""
+    cost = np.array([5.0, 2.0, 8.0, 3.0])
+    score = np.array([0.70, 0.50, 0.72, 0.45])
+    assert pareto_front(cost, score).tolist() == [1, 0, 2]
@@ -0,0 +1,57 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+from PySide6.QtCore import QCoreApplication
+
+# --- 自作モジュール ---
+from estivision.pose.pose_worker import PoseWorker
+# ====
+
+
+# ===== 定数定義 =====
+_FRAME: np.ndarray = np.zeros((48, 64, 3), np.uint8)
+# ====
+
+
+def _worker() -> PoseWorker:
+    """スレッドを起動せずにフレームを受け付ける状態の PoseWorker を返す。"""
+    QCoreApplication.instance() or QCoreApplication([])
+    worker = PoseWorker(skip_static=False, enhance_low_light=False, idle_when_absent=False)
+    worker._running = True
+    return worker
+
+
+# --- 待機中・付け替え中に届いたフレームを捨てるか確認 ---
+def test_paused_worker_drops_late_frames_until_reset_settles() -> None:
+    """pause 後に配送されたフレームは積まず、reset 後は配送待ちを捨て切ってから受付を再開することを確認。"""
+    worker = _worker()
+    worker.enqueue_frame(_FRAME, 0.0, 0)
+    worker.pause()
+    assert worker._queue.empty()
+    worker.enqueue_frame(_FRAME, 0.1, 1)            # pause 前に送られて遅れて届いたフレーム
+    assert worker._queue.empty()
+
+    worker.reset()
+    worker._drain()                                  # reset の起床用 None を除く
+    worker.enqueue_frame(_FRAME, 0.2, 2)            # 前のカメラの配送待ち
+    assert worker._queue.empty()
+    QCoreApplication.processEvents()
+    worker.enqueue_frame(_FRAME, 0.3, 0)
+    assert worker._queue.get_nowait()[1] == 0.3
+
+
+# --- 付け替えの反映時に残っていたフレームを処理しないか確認 ---
+def test_reset_drops_frames_queued_before_it_is_applied() -> None:
+    """処理スレッドが付け替えを反映するとき、それまでに積まれたフレームを推論せずに捨てることを確認。"""
+    worker = _worker()
+    worker._processor.estimator = object()          # type: ignore[assignment]
+    worker._processor.open = lambda: None           # type: ignore[method-assign]
+    worker._processor.reset = lambda log_dir: setattr(worker, "_running", False)  # type: ignore[method-assign]
+    images = []
+    worker.image_ready.connect(images.append)
+
+    worker._queue.put_nowait((_FRAME, 0.0, 7))
+    worker._reset_to = (None,)
+    worker.run()   # 同期実行（reset の反映で停止）
+
+    assert worker._queue.empty() and images == []
@@ -0,0 +1,75 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.change_detector import ChangeDetector
+from estivision.pose.pose_processor import PoseProcessor
+from estivision.pose.presence_gate import PresenceGate
+# ====
+
+
+# ===== 定数定義 =====
+_EMPTY: np.ndarray = np.full((120, 160, 3), 80, np.uint8)
+_ABSENT: np.ndarray = np.full(17, 0.02, np.float32)
+_PRESENT: np.ndarray = np.full(17, 0.6, np.float32)
+_KPS: np.ndarray = np.zeros((17, 2), np.int32)
+# ====
+
+
+def _go_idle(gate: PresenceGate, t: float = 0.0) -> float:
+    """低スコアの推論を待機に入るまで続け、次の時刻を返す。"""
+    while not gate.idle:
+        assert gate.should_infer(_EMPTY, t)
+        gate.update(t, _ABSENT)
+        t += 1 / 30
+    return t
+
+
+# --- 待機中は低頻度の確認だけ推論し、検出か動きで戻るか確認 ---
+def test_idle_probes_at_low_rate_and_wakes_on_detection_or_motion() -> None:
+    """待機中の推論が 2 Hz に間引かれ、確かな検出・大きな動きで通常に戻ることを確認。"""
+    gate = PresenceGate(min_score=0.15, idle_after=1.0, probe_interval=0.5)
+    t = _go_idle(gate)
+    assert gate.take_transition() is False and gate.take_transition() is None
+
+    # --- 待機中は 1 秒に 2 回だけ推論させる ---
+    inferred = 0
+    for _ in range(30):
+        if gate.should_infer(_EMPTY, t):
+            gate.update(t, _ABSENT)
+            inferred += 1
+        t += 1 / 30
+    assert inferred == 2 and gate.idle
+
+    # --- 確認推論で人物を検出すれば通常へ ---
+    while not gate.should_infer(_EMPTY, t):
+        t += 1 / 30
+    gate.update(t, _PRESENT)
+    assert not gate.idle and gate.take_transition() is True
+
+    # --- 再び待機させ、画面が大きく動けば確認を待たずに通常へ ---
+    t = _go_idle(gate, t)
+    gate.take_transition()
+    assert gate.should_infer(np.full_like(_EMPTY, 200), t + 1 / 30)
+    assert not gate.idle and gate.take_transition() is True
+    stats = gate.stats()
+    assert stats["idle_entered"] == 2 and stats["idle_woke_detection"] == 1 and stats["idle_woke_motion"] == 1
+
+
+# --- 待機中の確認が静止判定で使い回されないか確認 ---
+def test_probe_bypasses_static_scene_reuse() -> None:
+    """静止シーンでも確認時刻には推論させ、確認間隔が静止判定の期限に引きずられないことを確認。"""
+    gate = PresenceGate(idle_after=0.2, probe_interval=0.5)
+    processor = PoseProcessor(change_detector=ChangeDetector(max_reuse=2.0), presence_gate=gate)
+
+    t, inferred = 0.0, []
+    for _ in range(150):
+        if processor.reusable_result(_EMPTY, t) is None:
+            processor.remember(t, _KPS, _ABSENT)
+            inferred.append(t)
+        t += 1 / 30
+    assert processor.idle
+    probes = inferred[2:]                                        # t=0 と、待機に入った 2 s 後の推論の後
+    assert len(probes) >= 5 and np.all(np.diff(probes) < 0.6)   # 約 2 Hz（静止判定任せなら 2 s に 1 回）
+    assert gate.stats()["idle_probes"] == len(probes)
@@ -0,0 +1,78 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import threading
+import time
+from unittest import mock
+
+# --- 外部ライブラリ ---
+import pytest
+
+# --- 自作モジュール ---
+from estivision import profiling
+# ====
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch: pytest.MonkeyPatch):
+    """atexit への登録を差し替え、テスト後にモジュール状態を初期化する。"""
+    register = mock.Mock()
+    monkeypatch.setattr(profiling.atexit, "register", register)
+    monkeypatch.setattr(profiling, "_atexit_registered", False)
+    yield register
+    profiling.reset()
+
+
+def _busy(seconds: float) -> None:
+    """指定時間だけ CPU を回す。"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+# --- スレッドごとの区間計測とサンプリングがレポートに出るか確認 ---
+def test_timers_and_sampler_report_per_thread(tmp_path) -> None:
+    """無効時は共有の空タイマーを返し、有効時はスレッド名ごとに区間とサンプルを集計することを確認。"""
+    assert profiling.timed("noop") is profiling.timed("other")
+
+    profiling.enable(tmp_path, interval=0.001)
+    try:
+        def worker() -> None:
+            """名前を付けたスレッドで計測区間を回す。"""
+            profiling.name_thread("worker-A")
+            for _ in range(5):
+                with profiling.timed("busy"):
+                    _busy(0.01)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        path = profiling.dump()
+    finally:
+        profiling.disable()
+
+    text = path.read_text(encoding="utf-8")
+    assert path.parent == tmp_path
+    assert "===== worker-A =====" in text
+    assert "busy" in text and "samples:" in text
+
+
+# --- 有効化を繰り返しても終了時の書き出しが 1 回だけ登録されるか確認 ---
+def test_enable_registers_exit_dump_once(tmp_path, _isolated: mock.Mock) -> None:
+    """enable と disable を繰り返しても atexit への登録が 1 回に留まることを確認。"""
+    for _ in range(3):
+        profiling.enable(tmp_path, interval=0.01)
+        profiling.disable()
+    assert _isolated.call_count == 1
+
+
+# --- reset で集計値と出力先が初期状態に戻るか確認 ---
+def test_reset_clears_module_state(tmp_path) -> None:
+    """reset 後は集計値・スレッド名・出力先が残らず、次のテストへ影響しないことを確認。"""
+    profiling.enable(tmp_path, interval=0.01)
+    profiling.name_thread("main")
+    with profiling.timed("section"):
+        pass
+    profiling.reset()
+    assert not profiling.enabled()
+    assert profiling._timings == {} and profiling._thread_names == {}
+    assert profiling._output_dir == profiling.DEFAULT_OUTPUT_DIR and profiling._sampler is None
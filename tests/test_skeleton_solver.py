@@ -0,0 +1,46 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.tracking.skeleton_solver import BONES, SkeletonSolver
+# ====
+
+
+def _bone_lengths(joints: np.ndarray) -> np.ndarray:
+    """関節位置から各ボーンの長さを返す。"""
+    return np.linalg.norm(joints[BONES[:, 1]] - joints[BONES[:, 0]], axis=1)
+
+
+# --- 骨長が収束し、fit で骨長を満たす位置へ戻すか確認 ---
+def test_lengths_converge_and_fit_restores_them() -> None:
+    """ノイズ付き観測から骨長を推定し、信頼度の低い関節を主に動かして骨長を満たすことを確認。"""
+    rng = np.random.default_rng(0)
+    truth = rng.uniform(-0.5, 0.5, (17, 3))
+    truth[0, 0] = 0.0
+    truth[[2, 4, 6, 8, 10, 12, 14, 16]] = truth[[1, 3, 5, 7, 9, 11, 13, 15]] * [-1, 1, 1]  # 左右対称
+    conf = np.full(17, 0.9)
+
+    solver = SkeletonSolver()
+    for _ in range(300):
+        solver.solve(truth + rng.normal(0, 0.01, truth.shape), conf)
+    np.testing.assert_allclose(solver.lengths, _bone_lengths(truth), atol=0.01)
+
+    # --- 1 関節だけ信頼度が低く大きくずれた観測でも、その関節が骨長を満たす位置へ戻される ---
+    noisy = truth.copy()
+    noisy[9] += [0.2, 0.0, 0.0]
+    low = conf.copy()
+    low[9] = 0.05
+    fitted = solver.fit(noisy, low)
+    before = abs(_bone_lengths(noisy) - solver.lengths)
+    after = abs(_bone_lengths(fitted) - solver.lengths)
+    assert after.max() < before.max() * 0.2
+    assert np.linalg.norm(fitted[7] - noisy[7]) < np.linalg.norm(fitted[9] - noisy[9])
+
+
+# --- 観測の無いボーンには触れないか確認 ---
+def test_unobserved_bones_are_left_untouched() -> None:
+    """骨長が未推定で信頼度も 0 なら、fit が関節位置を変えないことを確認。"""
+    solver = SkeletonSolver()
+    joints = np.random.default_rng(1).normal(size=(17, 3))
+    np.testing.assert_allclose(solver.fit(joints, np.zeros(17)), joints)
@@ -0,0 +1,46 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import os
+import threading
+
+# --- 外部ライブラリ ---
+import pytest
+
+# --- 自作モジュール ---
+from estivision.thread_budget import ThreadBudget, enter_allocation
+# ====
+
+
+# --- 予約分を除いた CPU をワーカーで分け合うか確認 ---
+def test_workers_split_the_cpus_left_after_reserve() -> None:
+    """GUI 用の予約を除いた CPU を均等に割り当て、足りなければ予約を削ることを確認。"""
+    budget = ThreadBudget(2, reserve=2, cpus=range(8))
+    a0, a1 = budget.allocation(0), budget.allocation(1)
+    assert a0.cpus == (2, 3, 4) and a1.cpus == (5, 6, 7)
+    assert a0.intra_op_threads == 3
+    report = budget.report()
+    assert report["reserved"] == [0, 1] and [w["cpus"] for w in report["workers"]] == [[2, 3, 4], [5, 6, 7]]
+
+    # --- CPU が足りなければ予約を削ってでも各ワーカーに 1 つは割り当てる ---
+    small = ThreadBudget(2, reserve=2, cpus=range(2), ort_threads=1)
+    assert small.allocation(0).cpus == (0,) and small.allocation(1).cpus == (1,)
+
+
+# --- 固定が呼び出したスレッドだけに効くか確認 ---
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="sched_setaffinity が無い環境")
+def test_pinning_applies_to_the_calling_thread_only() -> None:
+    """enter_allocation がワーカースレッドだけを CPU に固定し、呼び出し元には影響しないことを確認。"""
+    cpus = sorted(os.sched_getaffinity(0))
+    budget = ThreadBudget(1, reserve=0, cpus=cpus[:1], pin=True)
+    seen = {}
+
+    def worker() -> None:
+        """割り当てに入り、固定の結果を記録する。"""
+        seen["pinned"] = enter_allocation(budget.allocation(0))
+        seen["affinity"] = os.sched_getaffinity(0)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert seen["pinned"] and seen["affinity"] == {cpus[0]}
+    assert sorted(os.sched_getaffinity(0)) == cpus   # 呼び出し元のスレッドは変わらない
@@ -0,0 +1,45 @@
+# ===== インポート =====
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.tracking.tracker_output import TrackerInterpolator
+from estivision.tracking.tracker_pose import TRACKER_NAMES, synthesize_trackers
+# ====
+
+
+def _standing() -> np.ndarray:
+    """正面を向いて直立した 17 関節の位置を返す。"""
+    j = np.zeros((17, 3))
+    j[[5, 6]] = [[0.2, 1.4, 0], [-0.2, 1.4, 0]]
+    j[[7, 8]] = [[0.2, 1.1, 0], [-0.2, 1.1, 0]]
+    j[[9, 10]] = [[0.25, 0.85, 0], [-0.25, 0.85, 0]]
+    j[[11, 12]] = [[0.1, 0.9, 0], [-0.1, 0.9, 0]]
+    j[[13, 14]] = [[0.1, 0.5, 0], [-0.1, 0.5, 0]]
+    j[[15, 16]] = [[0.1, 0.1, 0], [-0.1, 0.1, 0]]
+    return j
+
+
+# --- 直立姿勢でトラッカーの回転が単位になるか確認 ---
+def test_standing_pose_gives_identity_rotations() -> None:
+    """直立姿勢では腰トラッカーが腰の中点に置かれ、全トラッカーの回転が単位四元数になることを確認。"""
+    pos, rot = synthesize_trackers(_standing())
+    assert pos.shape == (len(TRACKER_NAMES), 3) and rot.shape == (len(TRACKER_NAMES), 4)
+    np.testing.assert_allclose(pos[0], [0, 0.9, 0])
+    np.testing.assert_allclose(np.abs(rot[:, 3]), 1.0, atol=1e-6)
+
+
+# --- 補間と外挿上限を確認 ---
+def test_interpolates_and_caps_extrapolation() -> None:
+    """サンプル間は線形補間し、最新サンプルからの外挿は max_extrapolation で止まることを確認。"""
+    interp = TrackerInterpolator(max_extrapolation=0.05)
+    q = np.tile([0.0, 0.0, 0.0, 1.0], (2, 1))
+    interp.push(1.0, np.zeros((2, 3)), q)
+    interp.push(1.1, np.ones((2, 3)), q)
+
+    pos, _ = interp.sample(1.05)
+    np.testing.assert_allclose(pos, 0.5)
+    pos, _ = interp.sample(1.13)
+    np.testing.assert_allclose(pos, 1.3)
+    pos, _ = interp.sample(5.0)     # カメラが止まっても 1.15 秒相当で保持
+    np.testing.assert_allclose(pos, 1.5)
@@ -0,0 +1,72 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from pathlib import Path
+
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.trajectory_log import TrajectoryLog
+# ====
+
+
+def _fill(log: TrajectoryLog, n: int, t0: float = 1000.0) -> None:
+    """連番 n 行を追記する。"""
+    for i in range(n):
+        kps = np.full((17, 2), i, np.int32)
+        scores = np.full(17, i / n, np.float32)
+        log.append(t0 + i * 0.1, i, kps, scores)
+
+
+# --- 事前確保を超えて追記しても全行が保持されるか確認 ---
+def test_append_grows_and_reopens(tmp_path: Path) -> None:
+    """チャンクを跨いだ追記後、読み取り専用で再オープンできることを確認。"""
+    with TrajectoryLog(tmp_path / "cam0", chunk_rows=8) as log:
+        _fill(log, 50)
+        assert len(log) == 50
+
+    log = TrajectoryLog.open(tmp_path / "cam0")
+    assert len(log) == 50
+    assert log.keypoints.shape == (50, 17, 2)
+    assert log.seq[-1] == 49
+    assert np.all(log.keypoints[7] == 7)
+
+
+# --- 読み取り専用の時間範囲クエリがコピーではなくビューを返すか確認 ---
+def test_time_range_returns_views(tmp_path: Path) -> None:
+    """読み取り専用ログの time_range の結果が memmap を共有するビューであることを確認。"""
+    with TrajectoryLog(tmp_path / "cam0") as log:
+        _fill(log, 20)
+
+    log = TrajectoryLog.open(tmp_path / "cam0")
+    rows = log.time_range(1000.5, 1001.0)
+    assert list(rows["seq"]) == [5, 6, 7, 8, 9]
+    assert np.shares_memory(rows["keypoints"], log.keypoints)
+
+
+# --- 書き込み中に渡した配列が拡張後も使えるか確認 ---
+def test_writer_results_survive_grow(tmp_path: Path) -> None:
+    """書き込み中のログが返す列・範囲は列ファイルと共有せず、拡張を跨いでも内容が保たれることを確認。"""
+    log = TrajectoryLog(tmp_path / "cam0", chunk_rows=8)
+    _fill(log, 6)
+    keypoints = log.keypoints
+    rows = log.time_range(1000.0, 1000.35)
+    assert not isinstance(keypoints, np.memmap) and not isinstance(rows["seq"], np.memmap)
+
+    _fill(log, 40, t0=2000.0)                     # 8 行を超えて 2 回拡張
+    keypoints[0] = -1                             # 手元の配列を書き換えてもログは変わらない
+    assert list(rows["seq"]) == [0, 1, 2, 3]
+    assert np.all(keypoints[5] == 5)
+    assert len(log) == 46 and np.all(log.keypoints[0] == 0)
+    log.close()
+
+
+# --- メタ情報が古くても行数を復元できるか確認 ---
+def test_recovers_count_without_close(tmp_path: Path) -> None:
+    """close されずに終了したログの行数を復元できることを確認。"""
+    log = TrajectoryLog(tmp_path / "cam0", chunk_rows=64)
+    _fill(log, 10)
+    for col in log._columns.values():
+        col.flush()
+
+    assert len(TrajectoryLog.open(tmp_path / "cam0")) == 10
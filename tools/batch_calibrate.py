@@ -0,0 +1,170 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# --- 外部ライブラリ ---
+import cv2
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.camera.frame_calibrator import CORNER_FLAGS, SUBPIX_CRITERIA, create_object_points
+# ====
+
+# ===== 定数定義 =====
+IMAGE_SUFFIXES: Tuple[str, ...] = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+# ====
+
+_Detection = Tuple[str, Optional[np.ndarray], Tuple[int, int]]
+
+
+# ===== コーナー検出（プロセスプール内で実行） =====
+def detect_corners(name: str, gray: np.ndarray | None, pattern_size: Tuple[int, int]) -> _Detection:
+    """1 枚分のコーナーを検出・サブピクセル精緻化する。gray が None なら name のファイルを読む。"""
+    if gray is None:
+        gray = cv2.imread(name, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            return name, None, (0, 0)
+    found, corners = cv2.findChessboardCorners(gray, pattern_size, CORNER_FLAGS)
+    if not found:
+        return name, None, gray.shape[::-1]
+    sub = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), SUBPIX_CRITERIA)
+    return name, sub, gray.shape[::-1]
+
+
+def _detect_job(job: Tuple[str, np.ndarray | None, Tuple[int, int]]) -> _Detection:
+    """executor.map 用に引数を展開する。"""
+    return detect_corners(*job)
+
+
+# ===== 入力 =====
+def iter_jobs(source: Path, pattern_size: Tuple[int, int], step: int) -> Iterator[Tuple[str, np.ndarray | None, Tuple[int, int]]]:
+    """画像ディレクトリならファイル名、動画なら step おきのグレー画像を検出ジョブとして返す。"""
+    if source.is_dir():
+        for path in sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES):
+            yield str(path), None, pattern_size
+        return
+
+    cap = cv2.VideoCapture(str(source))
+    if not cap.isOpened():
+        raise FileNotFoundError(f"入力を開けませんでした: {source}")
+    index = 0
+    try:
+        while cap.grab():
+            if index % step == 0:
+                ok, frame = cap.retrieve()
+                if ok:
+                    yield f"{source.name}#{index}", cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), pattern_size
+            index += 1
+    finally:
+        cap.release()
+
+
+# ===== サンプル選択 =====
+def select_views(corners: Sequence[np.ndarray], image_size: Tuple[int, int], count: int) -> List[int]:
+    """ボードの位置・大きさが画面全体に散らばるよう、最遠点サンプリングで count 枚選ぶ。"""
+    if len(corners) <= count:
+        return list(range(len(corners)))
+    w, h = image_size
+    pts = [c.reshape(-1, 2).astype(np.float32) for c in corners]
+    feats = np.array([
+        [p[:, 0].mean() / w, p[:, 1].mean() / h, np.sqrt(cv2.contourArea(cv2.convexHull(p)) / (w * h))]
+        for p in pts
+    ])
+    chosen = [int(np.argmax(feats[:, 2]))]   # 最も大きく写った 1 枚から始める
+    dist = np.linalg.norm(feats - feats[chosen[0]], axis=1)
+    while len(chosen) < count:
+        nxt = int(np.argmax(dist))
+        chosen.append(nxt)
+        dist = np.minimum(dist, np.linalg.norm(feats - feats[nxt], axis=1))
+    return sorted(chosen)
+
+
+# ===== 本体 =====
+def run_batch_calibration(args: argparse.Namespace) -> int:
+    """検出 → 選択 → calibrateCamera → 保存を行う。"""
+    pattern_size = tuple(int(v) for v in args.pattern.lower().split("x"))
+    start = time.perf_counter()
+
+    # --- コーナー検出をプロセスプールで並列化 ---
+    names: List[str] = []
+    found: List[np.ndarray] = []
+    image_size: Tuple[int, int] | None = None
+    total = 0
+    jobs = iter_jobs(args.source, pattern_size, args.step)
+    window = 16 * (args.workers or os.cpu_count() or 1)   # 動画のフレームを一度に抱え込まない
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results: Iterator[_Detection] = (
+            r for batch in iter(lambda: list(islice(jobs, window)), []) for r in pool.map(_detect_job, batch, chunksize=4)
+        )
+        for name, corners, size in results:
+            total += 1
+            if corners is None:
+                continue
+            if image_size is None:
+                image_size = size
+            elif size != image_size:
+                print(f"解像度が異なるためスキップ: {name} {size}", file=sys.stderr)
+                continue
+            names.append(name)
+            found.append(corners)
+    detect_sec = time.perf_counter() - start
+    print(f"検出: {len(found)}/{total} 枚でコーナーを検出（{detect_sec:.1f} 秒, workers={args.workers or os.cpu_count()}）")
+
+    if image_size is None or len(found) < args.min_views:
+        print(f"キャリブレーションに必要な枚数（{args.min_views}）に足りません。", file=sys.stderr)
+        return 1
+
+    # --- 画面全体を覆うようにサンプルを選択 ---
+    selected = select_views(found, image_size, args.samples)
+    img_pts = [found[i] for i in selected]
+    obj_pts = [create_object_points(pattern_size, args.square)] * len(img_pts)
+
+    ret, mtx, dist, rvecs, tvecs, _, _, per_view = cv2.calibrateCameraExtended(
+        obj_pts, img_pts, image_size, None, None
+    )
+    per_view = per_view.ravel()
+
+    # --- GUI と同じ形式で保存（追加で各ビューの誤差と名前） ---
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        args.output,
+        camera_matrix=mtx, dist_coeffs=dist, rvecs=rvecs, tvecs=tvecs, reprojection_error=ret,
+        per_view_errors=per_view, view_names=np.array([names[i] for i in selected]),
+    )
+
+    print(f"{'view':<40}{'error[px]':>10}")
+    for i, err in zip(selected, per_view):
+        print(f"{names[i][-40:]:<40}{err:>10.3f}")
+    print(f"再投影誤差: {ret:.3f} px（{len(selected)} 枚, 合計 {time.perf_counter() - start:.1f} 秒）")
+    print(f"保存完了: '{args.output}'")
+    return 0
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する。"""
+    parser = argparse.ArgumentParser(description="画像フォルダ／動画からオフラインでカメラキャリブレーションを行う")
+    parser.add_argument("source", type=Path, help="画像ディレクトリまたは動画ファイル")
+    parser.add_argument("--pattern", default="9x6", help="内側コーナー数 列x行（FrameCalibrator と同じ 9x6 が既定）")
+    parser.add_argument("--square", type=float, default=20.0, help="1 マスの一辺 [mm]")
+    parser.add_argument("--samples", type=int, default=40, help="calibrateCamera に使う最大枚数")
+    parser.add_argument("--min-views", type=int, default=10, help="必要な最小検出枚数")
+    parser.add_argument("--step", type=int, default=5, help="動画から何フレームおきに取り出すか")
+    parser.add_argument("--workers", type=int, default=None, help="検出プロセス数（既定: CPU 数）")
+    parser.add_argument(
+        "--output", type=Path, default=Path("data/parameters/calib_cam0.npz"),
+        help="出力 .npz（GUI は data/parameters/calib_cam{番号}.npz を読む）",
+    )
+    return parser.parse_args(argv)
+
+
+# ===== エントリポイント =====
+if __name__ == "__main__":
+    sys.exit(run_batch_calibration(parse_args()))
@@ -0,0 +1,99 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from pathlib import Path
+from typing import Tuple
+
+# --- 外部ライブラリ ---
+import numpy as np
+from PIL import Image
+from reportlab.pdfgen import canvas
+from reportlab.lib.units import mm
+
+# --- 自作モジュール ---
+from estivision.camera.frame_calibrator import CHARUCO_DICTIONARY, CHARUCO_MARKER_RATIO, CHARUCO_SQUARES, create_charuco_board
+# ====
+
+
+def mm_to_px(mm: float, dpi: int) -> int:
+    """mm → px 変換（dpi 指定）。四捨五入で整数化。"""
+    return int(round(mm / 25.4 * dpi))
+
+def generate_charuco_a4(
+    *,
+    squares_x: int = CHARUCO_SQUARES[0],          # マス数（横方向）
+    squares_y: int = CHARUCO_SQUARES[1],          # マス数（縦方向）
+    square_size_mm: float = 20.0,                 # 1 マスの一辺 (mm)
+    marker_ratio: float = CHARUCO_MARKER_RATIO,   # マーカー一辺 / マス一辺
+    dictionary: str = CHARUCO_DICTIONARY,         # ArUco 辞書名
+    dpi: int = 300,                               # 印刷解像度
+    portrait: bool = True,                        # True=縦向き, False=横向き
+    out_path: Path = Path("images/charuco_A4_7x10.png"),
+    out_pdf: Path = Path("images/charuco_A4_7x10.pdf"),
+) -> Tuple[int, int]:
+    """A4 サイズぴったりのキャンバス上に ChArUco ボードを描画し PNG＆PDF保存。戻り値は (幅px, 高さpx)。"""
+    # ===== A4 キャンバスサイズ計算 =====
+    a4_w_mm, a4_h_mm = (210.0, 297.0) if portrait else (297.0, 210.0)
+    canvas_w: int = mm_to_px(a4_w_mm, dpi)
+    canvas_h: int = mm_to_px(a4_h_mm, dpi)
+    # ====
+
+    # ===== ボード本体サイズ計算 =====
+    sq_px: int = mm_to_px(square_size_mm, dpi)
+    board_w: int = squares_x * sq_px
+    board_h: int = squares_y * sq_px
+    # ====
+
+    # ===== サイズ検証 =====
+    if board_w > canvas_w or board_h > canvas_h:
+        raise ValueError(
+            f"指定の square_size_mm={square_size_mm} では "
+            f"ChArUco ボード({board_w}×{board_h}px) が A4({canvas_w}×{canvas_h}px) に収まりません。"
+            " マスを小さくするか横向き(A3 等)を検討してください。"
+        )
+    # ====
+
+    # ===== ボード描画（FrameCalibrator と同じ定義を使う） =====
+    board = create_charuco_board(
+        (squares_x, squares_y), square_size_mm, marker_ratio=marker_ratio, dictionary=dictionary,
+    )
+    board_img: np.ndarray = board.generateImage((board_w, board_h), marginSize=0, borderBits=1)
+    # ====
+
+    # ===== 余白 (オフセット) 自動計算・白キャンバスへ配置 =====
+    offset_x: int = (canvas_w - board_w) // 2  # 左余白
+    offset_y: int = (canvas_h - board_h) // 2  # 上余白
+    canvas_img: np.ndarray = np.ones((canvas_h, canvas_w), dtype=np.uint8) * 255
+    canvas_img[offset_y : offset_y + board_h, offset_x : offset_x + board_w] = board_img
+    # ====
+
+    # ===== 保存先ディレクトリ作成 =====
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    # ====
+
+    # ===== PNG保存 =====
+    Image.fromarray(canvas_img, mode="L").save(out_path, format="PNG", compress_level=0, dpi=(dpi, dpi))
+    print(f"保存完了: '{out_path}' ({canvas_w}×{canvas_h}px @{dpi}dpi)")
+    # ====
+
+    # ===== PDF保存 =====
+    # --- PNG を reportlab で A4 に等倍貼り付け（原点は左下） ---
+    c = canvas.Canvas(str(out_pdf), pagesize=(a4_w_mm * mm, a4_h_mm * mm))
+    c.drawImage(
+        str(out_path),
+        0, 0,
+        a4_w_mm * mm,
+        a4_h_mm * mm,
+        preserveAspectRatio=False,
+        mask='auto'
+    )
+    c.showPage()
+    c.save()
+    print(f"保存完了: '{out_pdf}' ({a4_w_mm}mm×{a4_h_mm}mm)")
+    # ====
+
+    return canvas_w, canvas_h
+
+
+# ===== エントリポイント =====
+if __name__ == "__main__":
+    generate_charuco_a4()
@@ -0,0 +1,82 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import argparse
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+# --- 外部ライブラリ ---
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.pose_estimator import PoseEstimator
+# ====
+
+
+def measure(fn: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]], frame: np.ndarray, n: int) -> dict:
+    """fn を n 回呼び、レイテンシ統計 [ms] と呼び出し中の一時確保量の最大 [KiB] を返す。"""
+    for _ in range(10):   # ウォームアップ
+        fn(frame)
+
+    samples: List[float] = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn(frame)
+        samples.append(time.perf_counter() - start)
+
+    # --- 一時確保量は計測オーバーヘッドを避けるため別ループで測る（numpy の確保も tracemalloc に載る） ---
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    for _ in range(n):
+        fn(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = np.array(samples) * 1000
+    return {
+        "mean": float(ms.mean()),
+        "p50": float(np.percentile(ms, 50)),
+        "p99": float(np.percentile(ms, 99)),
+        "std": float(ms.std()),
+        "peak_kib": (peak - base) / 1024,
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する。"""
+    parser = argparse.ArgumentParser(description="session.run と IOBinding（estimate_bound）の推論経路を比較する。")
+    parser.add_argument("-n", "--iterations", type=int, default=300)
+    parser.add_argument("--model", default="lightning", choices=("lightning", "thunder"))
+    parser.add_argument("--providers", nargs="+", default=["CPUExecutionProvider"])
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    return parser.parse_args(argv)
+
+
+def run_benchmark(args: argparse.Namespace) -> int:
+    """両経路を計測して表で表示する。"""
+    estimator = PoseEstimator(model_type=args.model, providers=args.providers)
+    frame = np.random.default_rng(0).integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+
+    # --- 同じ結果になることを先に確認 ---
+    ref_kps, ref_scores = estimator.estimate(frame)
+    kps, scores = estimator.estimate_bound(frame)
+    if not (np.array_equal(ref_kps, kps) and np.allclose(ref_scores, scores)):
+        print("run と IOBinding の結果が一致しません。", file=sys.stderr)
+        return 1
+
+    rows = [
+        ("run", measure(estimator.estimate, frame, args.iterations)),
+        ("iobinding", measure(estimator.estimate_bound, frame, args.iterations)),
+    ]
+    print(f"{'path':<12}{'mean':>9}{'p50':>9}{'p99':>9}{'std':>9}{'alloc KiB':>11}")
+    for name, r in rows:
+        print(f"{name:<12}{r['mean']:>9.2f}{r['p50']:>9.2f}{r['p99']:>9.2f}{r['std']:>9.3f}{r['peak_kib']:>11.1f}")
+    print(f"（{args.model}, {args.width}x{args.height}, n={args.iterations}, 時間は ms, alloc は推論 1 回中の一時確保の最大）")
+    return 0
+
+
+# ===== エントリポイント =====
+if __name__ == "__main__":
+    sys.exit(run_benchmark(parse_args()))
@@ -0,0 +1,173 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+# --- 外部ライブラリ ---
+import numpy as np
+from PySide6.QtCore import QCoreApplication, QTimer, Qt
+from PySide6.QtGui import QImage
+
+# --- 自作モジュール ---
+from estivision.camera.camera_stream import CameraStream
+from estivision.camera.capture_backends import SyntheticBackend, read_embedded_timestamp
+from estivision.pose.pose_worker import PoseWorker
+# ====
+
+
+# ===== 計測ヘルパ =====
+def thread_cpu_seconds(native_id: int) -> float | None:
+    """Linux の /proc からスレッドの CPU 時間 [s] を読む（取得不可なら None）。"""
+    try:
+        with open(f"/proc/self/task/{native_id}/stat", encoding="ascii") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # --- ')' 以降の 12, 13 番目が utime, stime ---
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def qimage_to_array(qimg: QImage) -> np.ndarray:
+    """3 チャンネル 8bit の QImage をコピーせずに (H,W,3) 配列として参照する。"""
+    h, w = qimg.height(), qimg.width()
+    buf = np.frombuffer(qimg.constBits(), np.uint8, count=h * qimg.bytesPerLine())
+    return buf.reshape(h, qimg.bytesPerLine())[:, : w * 3].reshape(h, w, 3)
+
+
+class StreamProbe:
+    """1 系統分の出力フレーム数・遅延・スレッド CPU 時間を集計する。"""
+
+    def __init__(self, index: int) -> None:
+        """集計値を初期化する。"""
+        self.index: int = index
+        self.frames: int = 0
+        self.latencies: List[float] = []
+        self.thread_ids: List[int] = []
+        self._lock = threading.Lock()
+
+    def register_thread(self) -> None:
+        """呼び出し元スレッド（QThread.started から直接呼ばれる）を記録する。"""
+        with self._lock:
+            self.thread_ids.append(threading.get_native_id())
+
+    def on_image(self, qimg: QImage) -> None:
+        """出力画像に埋め込まれた露光時刻から遅延を求める。"""
+        now = time.time()
+        self.frames += 1
+        stamp = read_embedded_timestamp(qimage_to_array(qimg))
+        if stamp is not None:
+            self.latencies.append(now - stamp)
+
+    def cpu_seconds(self) -> float | None:
+        """関連スレッドの CPU 時間合計を返す。"""
+        values = [thread_cpu_seconds(tid) for tid in self.thread_ids]
+        if not values or any(v is None for v in values):
+            return None
+        return float(sum(values))  # type: ignore[arg-type]
+
+
+# ===== 本体 =====
+def run_load_test(args: argparse.Namespace) -> int:
+    """N 本の合成カメラを実際の CameraStream / PoseWorker 経路で動かして計測する。"""
+    app = QCoreApplication(sys.argv[:1])
+    probes: List[StreamProbe] = []
+    streams: List[CameraStream] = []
+    workers: List[PoseWorker] = []
+
+    # --- 各系統の起動 ---
+    for i in range(args.streams):
+        probe = StreamProbe(i)
+        backend = SyntheticBackend(args.width, args.height, args.fps, pattern=args.pattern)
+        stream = CameraStream(backend=backend, fps=args.fps)
+        stream.started.connect(probe.register_thread, Qt.ConnectionType.DirectConnection)
+        if args.no_pose:
+            stream.image_ready.connect(probe.on_image)
+        else:
+            # --- 推論を省略・変形する処理は既定で切り、推論そのもののスループットを測る ---
+            worker = PoseWorker(
+                model_type=args.model, providers=["CPUExecutionProvider"], skip_static=args.skip_static,
+                idle_when_absent=args.idle_when_absent, enhance_low_light=args.enhance_low_light,
+            )
+            worker.failed.connect(lambda msg: (print(msg, file=sys.stderr), app.exit(1)))
+            worker.started.connect(probe.register_thread, Qt.ConnectionType.DirectConnection)
+            worker.image_ready.connect(probe.on_image)
+            stream.frame_ready.connect(worker.enqueue_frame)
+            worker.start()
+            workers.append(worker)
+        stream.start()
+        streams.append(stream)
+        probes.append(probe)
+
+    # --- ウォームアップ後に計測区間を開始 ---
+    marks: Dict[str, float] = {}
+    base_frames: Dict[int, int] = {}
+    base_cpu: Dict[int, float | None] = {}
+
+    def begin() -> None:
+        """計測開始時点の値を記録する。"""
+        marks["wall"] = time.perf_counter()
+        marks["cpu"] = time.process_time()
+        for p in probes:
+            base_frames[p.index] = p.frames
+            base_cpu[p.index] = p.cpu_seconds()
+            p.latencies.clear()
+
+    QTimer.singleShot(int(args.warmup * 1000), begin)
+    QTimer.singleShot(int((args.warmup + args.duration) * 1000), app.quit)
+    if app.exec() != 0 or "wall" not in marks:
+        for stream in streams:
+            stream.stop()
+        for worker in workers:
+            worker.stop()
+        return 1
+
+    wall = time.perf_counter() - marks["wall"]
+    total_cpu = time.process_time() - marks["cpu"]
+
+    # --- 結果表示 ---
+    print(f"streams={args.streams} {args.width}x{args.height}@{args.fps}fps "
+          f"pose={'off' if args.no_pose else args.model} duration={wall:.1f}s")
+    print(f"{'stream':>6} {'fps':>7} {'lat_p50[ms]':>12} {'lat_p95[ms]':>12} {'cpu[%]':>8}")
+    for p in probes:
+        fps = (p.frames - base_frames.get(p.index, 0)) / wall
+        lat = np.asarray(p.latencies) * 1000
+        p50 = f"{np.percentile(lat, 50):.1f}" if lat.size else "-"
+        p95 = f"{np.percentile(lat, 95):.1f}" if lat.size else "-"
+        cpu_now, cpu_base = p.cpu_seconds(), base_cpu.get(p.index)
+        cpu = f"{(cpu_now - cpu_base) / wall * 100:.1f}" if cpu_now is not None and cpu_base is not None else "-"
+        print(f"{p.index:>6} {fps:>7.1f} {p50:>12} {p95:>12} {cpu:>8}")
+    print(f"process cpu: {total_cpu / wall * 100:.1f}% ({os.cpu_count()} cores)")
+
+    # --- 後始末 ---
+    for stream in streams:
+        stream.stop()
+    for worker in workers:
+        worker.stop()
+    return 0
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する。"""
+    parser = argparse.ArgumentParser(description="合成カメラ N 本で取得・推論経路の負荷を計測する。")
+    parser.add_argument("-n", "--streams", type=int, default=8, help="同時に起動する合成カメラ数")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--pattern", choices=SyntheticBackend.PATTERNS, default="figure")
+    parser.add_argument("--model", default="lightning", help="PoseEstimator のモデル種別")
+    parser.add_argument("--no-pose", action="store_true", help="推論を行わず取得経路のみ計測")
+    parser.add_argument("--skip-static", action="store_true", help="静止フレームの推論省略を有効にして計測")
+    parser.add_argument("--idle-when-absent", action="store_true", help="不在時の低頻度推論を有効にして計測")
+    parser.add_argument("--enhance-low-light", action="store_true", help="暗所補正を有効にして計測")
+    parser.add_argument("--warmup", type=float, default=2.0, help="計測前の待機秒数")
+    parser.add_argument("--duration", type=float, default=10.0, help="計測秒数")
+    return parser.parse_args(argv)
+
+
+# ===== エントリポイント =====
+if __name__ == "__main__":
+    sys.exit(run_load_test(parse_args()))
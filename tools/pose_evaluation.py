@@ -0,0 +1,215 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+from __future__ import annotations
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+# --- 外部ライブラリ ---
+import cv2
+import numpy as np
+
+# --- 自作モジュール ---
+from estivision.pose.pose_estimator import PoseEstimator
+from estivision.pose.pose_metrics import pareto_front, person_reference, summarize
+# ====
+
+
+class EvalConfig(NamedTuple):
+    """比較する推論設定（名前・モデル種別・モデルディレクトリ）。"""
+
+    name: str
+    model_type: str
+    model_dir: Path | None
+
+
+class Sample(NamedTuple):
+    """正解付きの人物 1 人分。"""
+
+    image: Path
+    bbox: np.ndarray      # (4,) x, y, w, h
+    keypoints: np.ndarray  # (17,2)
+    visible: np.ndarray   # (17,) bool
+    area: float
+
+
+# ===== 入力 =====
+def parse_config(text: str) -> EvalConfig:
+    """'NAME=MODEL@DIR' 形式（NAME= と @DIR は省略可）を解釈する。"""
+    name, _, rest = text.rpartition("=")
+    model, _, model_dir = (rest or text).partition("@")
+    return EvalConfig(name or text, model, Path(model_dir) if model_dir else None)
+
+
+def load_coco_keypoints(annotations: Path, image_root: Path, min_keypoints: int = 1) -> List[Sample]:
+    """COCO 形式のキーポイント正解を読む（録画セッションも同じ形式で書き出して使う）。"""
+    data = json.loads(annotations.read_text(encoding="utf-8"))
+    files = {img["id"]: image_root / img["file_name"] for img in data["images"]}
+    samples: List[Sample] = []
+    for ann in data["annotations"]:
+        if ann.get("iscrowd", 0) or ann.get("num_keypoints", 0) < min_keypoints:
+            continue
+        kps = np.asarray(ann["keypoints"], np.float64).reshape(17, 3)
+        bbox = np.asarray(ann["bbox"], np.float64)
+        area = float(ann.get("area") or bbox[2] * bbox[3])
+        samples.append(Sample(files[ann["image_id"]], bbox, kps[:, :2], kps[:, 2] > 0, area))
+    return samples
+
+
+def crop_person(image: np.ndarray, bbox: np.ndarray, margin: float) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """bbox を中心に長辺 × margin の正方形で切り出す（画像外は切り詰め）。戻り値は (切り出し, 左上座標)。"""
+    x, y, w, h = bbox
+    side = max(w, h) * margin
+    cx, cy = x + w / 2, y + h / 2
+    x0, y0 = int(max(0, cx - side / 2)), int(max(0, cy - side / 2))
+    x1, y1 = int(min(image.shape[1], cx + side / 2)), int(min(image.shape[0], cy + side / 2))
+    return image[y0:y1, x0:x1], (x0, y0)
+
+
+# ===== 評価 =====
+def evaluate(
+    config: EvalConfig,
+    samples: List[Sample],
+    *,
+    providers: List[str],
+    margin: float,
+    alpha: float,
+    warmup: int = 5,
+) -> Dict[str, object]:
+    """1 設定分の予測を集め、精度（OKS / PCK）と速度（レイテンシ・FPS）を返す。"""
+    estimator = PoseEstimator(config.model_type, model_dir=config.model_dir, providers=providers)
+    preds = np.zeros((len(samples), 17, 2), np.float64)
+    latencies: List[float] = []
+    images: Dict[Path, np.ndarray] = {}
+
+    for i, sample in enumerate(samples):
+        image = images.get(sample.image)
+        if image is None:
+            image = cv2.imread(str(sample.image), cv2.IMREAD_COLOR)
+            if image is None:
+                raise FileNotFoundError(f"画像を読めません: {sample.image}")
+            images = {sample.image: image}   # 同じ画像の人物は連続している前提で 1 枚だけ保持
+        crop, (x0, y0) = crop_person(image, sample.bbox, margin)
+
+        # --- 最初の数回はセッションの初期化分を除くため計測しない ---
+        for _ in range(warmup if i == 0 else 0):
+            estimator.estimate_bound(crop)
+        start = time.perf_counter()
+        kps, _ = estimator.estimate_bound(crop)
+        latencies.append(time.perf_counter() - start)
+        preds[i] = kps + (x0, y0)
+
+    gt = np.stack([s.keypoints for s in samples])
+    visible = np.stack([s.visible for s in samples])
+    _, ref_length = person_reference(np.stack([s.bbox for s in samples]))
+    area = np.array([s.area for s in samples])
+    summary = summarize(preds, gt, visible, area, ref_length, alpha)
+
+    ms = np.array(latencies) * 1000
+    return {
+        "name": config.name,
+        "model": config.model_type,
+        "model_dir": str(config.model_dir) if config.model_dir else None,
+        "samples": len(samples),
+        "oks": summary["oks"],
+        "pck": summary["pck"],
+        "oks_per_joint": summary["oks_per_joint"].tolist(),      # type: ignore[union-attr]
+        "pck_per_joint": summary["pck_per_joint"].tolist(),      # type: ignore[union-attr]
+        "latency_ms": float(ms.mean()),
+        "latency_p95_ms": float(np.percentile(ms, 95)),
+        "fps": float(1000 / ms.mean()),
+        "joints": list(estimator.keypoint_names),
+    }
+
+
+# ===== 出力 =====
+def print_tables(results: List[Dict[str, object]], alpha: float) -> None:
+    """設定ごとの要約表と関節別 OKS 表を表示する。"""
+    print(f"{'config':<16}{'OKS':>8}{f'PCK@{alpha:g}':>10}{'ms':>9}{'p95 ms':>9}{'fps':>8}")
+    for r in results:
+        print(f"{r['name']:<16}{r['oks']:>8.3f}{r['pck']:>10.3f}{r['latency_ms']:>9.2f}"
+              f"{r['latency_p95_ms']:>9.2f}{r['fps']:>8.1f}")
+
+    print()
+    print(f"{'joint (OKS)':<16}" + "".join(f"{str(r['name'])[:10]:>11}" for r in results))
+    for j, joint in enumerate(results[0]["joints"]):  # type: ignore[arg-type]
+        print(f"{joint:<16}" + "".join(f"{r['oks_per_joint'][j]:>11.3f}" for r in results))  # type: ignore[index]
+
+
+def save_pareto_plot(results: List[Dict[str, object]], path: Path) -> None:
+    """レイテンシ × OKS の散布図にパレート前線を重ねて保存する。"""
+    import matplotlib
+    matplotlib.use("Agg")   # 画面なしで保存だけ行う
+    import matplotlib.pyplot as plt
+
+    cost = np.array([r["latency_ms"] for r in results], np.float64)
+    score = np.array([r["oks"] for r in results], np.float64)
+    front = pareto_front(cost, score)
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.scatter(cost, score, color="tab:gray")
+    ax.plot(cost[front], score[front], "o-", color="tab:red", label="Pareto front")
+    for r, x, y in zip(results, cost, score):
+        ax.annotate(str(r["name"]), (x, y), textcoords="offset points", xytext=(4, 4), fontsize=8)
+    ax.set_xlabel("latency [ms / person]")
+    ax.set_ylabel("mean OKS")
+    ax.grid(alpha=0.3)
+    ax.legend(loc="lower right")
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+
+# ===== 本体 =====
+def run_evaluation(args: argparse.Namespace) -> int:
+    """全設定を評価し、表・JSON・パレート図を出力する。"""
+    samples = load_coco_keypoints(args.annotations, args.images, args.min_keypoints)
+    if args.limit:
+        samples = samples[: args.limit]
+    if not samples:
+        print("評価対象の人物がありません。", file=sys.stderr)
+        return 1
+    print(f"{len(samples)} 人分を評価します。")
+
+    results = [
+        evaluate(parse_config(text), samples, providers=args.providers, margin=args.margin, alpha=args.alpha)
+        for text in args.config
+    ]
+    print_tables(results, args.alpha)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    (args.output / "results.json").write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    save_pareto_plot(results, args.output / "pareto.png")
+    print(f"保存完了: '{args.output}'")
+    return 0
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する。"""
+    parser = argparse.ArgumentParser(description="COCO 形式の正解で推論設定ごとの精度と速度を比較する（オフライン）")
+    parser.add_argument("annotations", type=Path, help="COCO keypoints 形式の JSON（person_keypoints_val2017.json 等）")
+    parser.add_argument("images", type=Path, help="file_name の基準ディレクトリ")
+    parser.add_argument(
+        "-c", "--config", action="append", default=None,
+        help="比較する設定 NAME=MODEL@DIR（例: lightning, int8=lightning@data/models_int8）。複数指定可",
+    )
+    parser.add_argument("--providers", nargs="+", default=["CPUExecutionProvider"])
+    parser.add_argument("--margin", type=float, default=1.25, help="人物 bbox 長辺に対する切り出し倍率")
+    parser.add_argument("--alpha", type=float, default=0.2, help="PCK の閾値（bbox 長辺に対する比）")
+    parser.add_argument("--min-keypoints", type=int, default=5, help="正解点がこれ未満の人物は除外")
+    parser.add_argument("--limit", type=int, default=0, help="先頭 N 人だけ評価（0 で全員）")
+    parser.add_argument(
+        "--output", type=Path, default=Path("data/evaluation") / time.strftime("%Y%m%d_%H%M%S"),
+        help="results.json と pareto.png の保存先",
+    )
+    args = parser.parse_args(argv)
+    args.config = args.config or ["lightning", "thunder"]
+    return args
+
+
+# ===== エントリポイント =====
+if __name__ == "__main__":
+    sys.exit(run_evaluation(parse_args()))
@@ -0,0 +1,84 @@
+# ===== インポート =====
+# --- 標準ライブラリ ---
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+# --- 外部ライブラリ ---
+import numpy as np
+# ====
+
+
+# ===== 定数定義 =====
+# --- 起動経路で読み込まれる主なモジュール（上から順に単独で計測） ---
+IMPORT_TARGETS: List[str] = [
+    "numpy",
+    "cv2",
+    "onnxruntime",
+    "PySide6.QtWidgets",
+    "estivision.app",
+    "estivision.gui.main_window",
+]
+# ====
+
+
+def measure_import(module: str, repeat: int) -> float:
+    """新しいプロセスで module を import する時間 [s] の中央値を返す。"""
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - t)"
+    )
+    samples: List[float] = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def measure_inference(model_type: str, providers: List[str]) -> None:
+    """セッション生成・ウォームアップ・初回／定常推論の時間を表示する。"""
+    t0 = time.perf_counter()
+    from estivision.pose.pose_estimator import PoseEstimator
+    t1 = time.perf_counter()
+    estimator = PoseEstimator(model_type=model_type, providers=providers)
+    t2 = time.perf_counter()
+
+    frame = np.zeros((240, 320, 3), np.uint8)
+    estimator.estimate(frame)
+    t3 = time.perf_counter()
+    steady: List[float] = []
+    for _ in range(20):
+        s = time.perf_counter()
+        estimator.estimate(frame)
+        steady.append(time.perf_counter() - s)
+
+    print(f"{'import pose_estimator':<28}{(t1 - t0) * 1000:>10.1f} ms")
+    print(f"{'session create':<28}{(t2 - t1) * 1000:>10.1f} ms")
+    print(f"{'first inference':<28}{(t3 - t2) * 1000:>10.1f} ms")
+    print(f"{'steady inference (median)':<28}{statistics.median(steady) * 1000:>10.1f} ms")
+
+
+def parse_args() -> argparse.Namespace:
+    """コマンドライン引数を解析する。"""
+    parser = argparse.ArgumentParser(description="起動時の import 時間と初回推論時間を計測する。")
+    parser.add_argument("--repeat", type=int, default=3, help="import 計測の繰り返し回数")
+    parser.add_argument("--model", default="lightning")
+    parser.add_argument("--providers", nargs="+", default=["CPUExecutionProvider"])
+    return parser.parse_args()
+
+
+# ===== エントリポイント =====
+if __name__ == "__main__":
+    args = parse_args()
+    print("=== import (cold process, median) ===")
+    for target in IMPORT_TARGETS:
+        try:
+            print(f"{target:<28}{measure_import(target, args.repeat) * 1000:>10.1f} ms")
+        except subprocess.CalledProcessError:
+            print(f"{target:<28}{'failed':>13}")
+    print("=== inference ===")
+    measure_inference(args.model, args.providers)